@@ -1,22 +1,125 @@
+import contextvars
 import json
 import os
-from openai import OpenAI
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Union
+import pandas as pd
+
+from response_cache import ResponseCache, make_cache_key, round_for_key, DEFAULT_CACHE_PATH
+from type_inference import infer_data_type
+from instrumentation import instrumented
 
 # the newest OpenAI model is "gpt-5" which was released August 7, 2025.
 # do not change this unless explicitly requested by the user
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL")
+OPENAI_TIMEOUT = float(os.environ.get("OPENAI_TIMEOUT", "30"))
+OPENAI_CONNECT_TIMEOUT = 5.0
+OPENAI_MAX_RETRIES = 1
+AI_MAX_WORKERS = 4
+AI_CACHE_PATH = os.environ.get("AI_CACHE_PATH", DEFAULT_CACHE_PATH)
+
+_client = None
+_client_lock = threading.Lock()
+_response_cache = None
+_executor = ThreadPoolExecutor(max_workers=AI_MAX_WORKERS, thread_name_prefix="ai_helper")
+
+def configure_openai_client(api_key: str = None, base_url: str = None, timeout: float = None) -> None:
+    """
+    Cambia la configuración del cliente compartido (clave, URL base, tiempo límite) y lo reinicia
+    """
+    global OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_TIMEOUT, _client
+    with _client_lock:
+        if api_key is not None:
+            OPENAI_API_KEY = api_key
+        if base_url is not None:
+            OPENAI_BASE_URL = base_url
+        if timeout is not None:
+            OPENAI_TIMEOUT = timeout
+        if _client is not None:
+            _client.close()
+        _client = None
 
 def get_openai_client():
     """
-    Crea y retorna el cliente de OpenAI
+    Retorna el cliente de OpenAI compartido (conexiones keep-alive y tiempos límite explícitos)
+
+    openai y httpx se importan aquí, en el primer uso, para no cargarlos al iniciar la aplicación.
     """
+    global _client
     if not OPENAI_API_KEY:
         return None
-    return OpenAI(api_key=OPENAI_API_KEY)
+    with _client_lock:
+        if _client is None:
+            import httpx
+            from openai import OpenAI
+
+            _client = OpenAI(
+                api_key=OPENAI_API_KEY,
+                base_url=OPENAI_BASE_URL,
+                timeout=httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT),
+                max_retries=OPENAI_MAX_RETRIES,
+                http_client=httpx.Client(
+                    limits=httpx.Limits(max_connections=AI_MAX_WORKERS * 2, max_keepalive_connections=AI_MAX_WORKERS, keepalive_expiry=60.0)
+                )
+            )
+        return _client
+
+def configure_response_cache(path: str = None, **options) -> None:
+    """
+    Cambia la ruta (cadena vacía para desactivar) u opciones (ttl_seconds, max_entries) de la caché persistente
+    """
+    global AI_CACHE_PATH, _response_cache
+    if path is not None:
+        AI_CACHE_PATH = path
+    _response_cache = ResponseCache(AI_CACHE_PATH, **options) if AI_CACHE_PATH else False
+
+def get_response_cache():
+    """
+    Retorna la caché persistente de respuestas de IA, o None si está desactivada o no se pudo abrir
+    """
+    global _response_cache
+    if _response_cache is None:
+        try:
+            configure_response_cache()
+        except Exception:
+            _response_cache = False
+    return _response_cache if _response_cache is not False else None
+
+def submit_ai_task(func, *args, **kwargs) -> Future:
+    """
+    Ejecuta una llamada de IA en segundo plano y retorna un Future con su resultado
+
+    La tarea corre en una copia del contexto actual, así sus intervalos llegan al Recorder activo.
+    """
+    return _executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
 
-def detect_data_type(data_sample: list, column_name: str = "datos") -> dict:
+def detect_data_type_async(data_sample: Union[list, pd.Series], column_name: str = "datos") -> Future:
+    """
+    Versión no bloqueante de detect_data_type
+    """
+    return submit_ai_task(detect_data_type, data_sample, column_name)
+
+def interpret_statistics_async(stats_data: dict, data_type: str) -> Future:
+    """
+    Versión no bloqueante de interpret_statistics
+    """
+    return submit_ai_task(interpret_statistics, stats_data, data_type)
+
+def answer_question_async(question: str, data_context: dict) -> Future:
+    """
+    Versión no bloqueante de answer_question
+    """
+    return submit_ai_task(answer_question, question, data_context)
+
+@instrumented
+def detect_data_type(data_sample: Union[list, pd.Series], column_name: str = "datos") -> dict:
     """
     Utiliza IA para detectar si los datos son cualitativos o cuantitativos
+    
+    Acepta la serie completa: a la IA solo se envían los primeros 20 valores y el respaldo
+    trabaja sobre una muestra de tamaño fijo, así que no hace falta convertirla a lista.
     """
     client = get_openai_client()
     
@@ -24,7 +127,16 @@ def detect_data_type(data_sample: list, column_name: str = "datos") -> dict:
         return _fallback_detect_data_type(data_sample)
     
     try:
-        sample_str = str(data_sample[:20])
+        if isinstance(data_sample, pd.Series):
+            sample_str = str(data_sample.iloc[:20].tolist())
+        else:
+            sample_str = str(data_sample[:20])
+        
+        cache = get_response_cache()
+        cache_key = make_cache_key('detect_data_type', {'modelo': 'gpt-5', 'muestra': sample_str})
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is not None:
+            return cached
         
         prompt = f"""Analiza la siguiente muestra de datos y determina si son cualitativos o cuantitativos.
 
@@ -46,29 +158,19 @@ Responde en formato JSON con:
         )
         
         result = json.loads(response.choices[0].message.content)
+        if cache is not None:
+            cache.put(cache_key, result)
         return result
     except Exception as e:
         return _fallback_detect_data_type(data_sample)
 
-def _fallback_detect_data_type(data_sample: list) -> dict:
+def _fallback_detect_data_type(data_sample: Union[list, pd.Series]) -> dict:
     """
-    Método de respaldo para detectar tipo de datos sin IA
+    Método de respaldo para detectar tipo de datos sin IA (inferencia vectorizada)
     """
     try:
-        numeric_count = sum(1 for x in data_sample if isinstance(x, (int, float)) or (isinstance(x, str) and x.replace('.', '', 1).replace('-', '', 1).isdigit()))
-        
-        if numeric_count / len(data_sample) > 0.8:
-            return {
-                "tipo": "cuantitativo",
-                "razon": "La mayoría de los valores son numéricos",
-                "subtipo": "continuo"
-            }
-        else:
-            return {
-                "tipo": "cualitativo",
-                "razon": "La mayoría de los valores son categorías o texto",
-                "subtipo": "nominal"
-            }
+        info = infer_data_type(data_sample)
+        return {key: info[key] for key in ('tipo', 'razon', 'subtipo')}
     except:
         return {
             "tipo": "cualitativo",
@@ -76,6 +178,7 @@ def _fallback_detect_data_type(data_sample: list) -> dict:
             "subtipo": "nominal"
         }
 
+@instrumented
 def interpret_statistics(stats_data: dict, data_type: str) -> str:
     """
     Genera una interpretación de las estadísticas usando IA
@@ -86,9 +189,17 @@ def interpret_statistics(stats_data: dict, data_type: str) -> str:
         return _fallback_interpretation(stats_data, data_type)
     
     try:
+        rounded_stats = round_for_key(stats_data)
+        
+        cache = get_response_cache()
+        cache_key = make_cache_key('interpret_statistics', {'modelo': 'gpt-5', 'tipo': data_type, 'estadisticas': rounded_stats})
+        cached = cache.get(cache_key) if cache is not None else None
+        if cached is not None:
+            return cached
+        
         prompt = f"""Como experto en estadística, interpreta los siguientes resultados de un análisis descriptivo de datos {data_type}:
 
-Estadísticas: {json.dumps(stats_data, indent=2)}
+Estadísticas: {json.dumps(rounded_stats, indent=2)}
 
 Proporciona una interpretación clara y concisa en español que incluya:
 1. Qué nos dicen las medidas de tendencia central sobre los datos
@@ -107,7 +218,10 @@ Responde en un párrafo claro y educativo."""
             max_completion_tokens=500
         )
         
-        return response.choices[0].message.content
+        interpretation = response.choices[0].message.content
+        if cache is not None and interpretation:
+            cache.put(cache_key, interpretation)
+        return interpretation
     except Exception as e:
         return _fallback_interpretation(stats_data, data_type)
 
@@ -128,6 +242,7 @@ lo que indica la variabilidad presente en los datos."""
     else:
         return "Los datos cualitativos han sido analizados. Consulta la tabla de frecuencias para ver la distribución de categorías."
 
+@instrumented
 def answer_question(question: str, data_context: dict) -> str:
     """
     Responde preguntas del usuario sobre el análisis de datos
@@ -7,9 +7,20 @@ import base64
 from streamlit_float import *
 
 from stats_utils import calculate_all_statistics, calculate_central_tendency, calculate_dispersion
-from data_processor import load_data_from_text, load_data_from_file, create_frequency_table, validate_data, clean_data
-from visualization import create_multiple_visualizations, create_histogram, create_bar_chart, create_pie_chart, create_box_plot
-from ai_helper import detect_data_type, interpret_statistics, answer_question
+from data_processor import (load_data_from_text, load_data_from_file, preview_file, create_frequency_table, validate_data,
+                            clean_data_context, OUTLIER_METHOD_NAMES)
+from visualization import (create_multiple_visualizations, create_histogram, create_bar_chart, create_pie_chart, create_box_plot,
+                           create_frequency_bar_chart, create_grouped_box_plot, create_grouped_histogram)
+from ai_helper import detect_data_type, interpret_statistics_async, answer_question, get_response_cache
+from result_cache import ResultCache, fingerprint_series
+from column_store import ColumnStore, ColumnHandle
+from categorical import CategoricalSummary
+from type_inference import infer_data_type
+from batch_analysis import profile_dataframe, summary_row, SUMMARY_COLUMNS
+from incremental import IncrementalAnalysis
+from grouped import grouped_statistics, grouped_frequency_table
+from heavy_hitters import frequent_values, DEFAULT_TOP_K
+from instrumentation import Recorder, recording, span, current_recorder
 
 st.set_page_config(
     page_title="Análisis Estadístico Descriptivo",
@@ -141,10 +152,171 @@ def get_example_data():
     }
     return examples
 
+@st.cache_resource
+def get_result_cache():
+    """Caché de resultados compartida entre reruns y sesiones (LRU con límite de memoria)"""
+    return ResultCache()
+
+@st.cache_resource
+def get_column_store():
+    """Almacén en disco de columnas compartido por todas las sesiones (None si no se puede crear)"""
+    try:
+        return ColumnStore()
+    except OSError:
+        return None
+
+def set_session_data(values, source):
+    """Guarda la columna en el almacén en disco y deja en la sesión solo su referencia"""
+    store = get_column_store()
+    if store is not None:
+        st.session_state['data'] = store.put(pd.Series(values), 'valores')
+    else:
+        st.session_state['data'] = pd.DataFrame({'valores': values})
+    st.session_state['data_source'] = source
+
+def get_session_data():
+    """DataFrame con la columna 'valores' de la sesión, mapeada desde el disco si está en el almacén"""
+    data = st.session_state['data']
+    if isinstance(data, ColumnHandle):
+        return pd.DataFrame({'valores': get_column_store().load(data)}, copy=False)
+    return data
+
+def get_incremental_analysis(fingerprint):
+    """Análisis incremental de la sesión si corresponde a los datos actuales"""
+    entry = st.session_state.get('incremental')
+    if entry is not None and entry[0] == fingerprint:
+        return entry[1]
+    return None
+
+def append_session_data(new_values, type_info):
+    """Agrega valores a los datos de la sesión; el análisis incremental solo procesa el lote nuevo"""
+    current = get_session_data()['valores']
+    analysis = get_incremental_analysis(get_data_fingerprint(st.session_state['data']))
+    if analysis is None:
+        analysis = IncrementalAnalysis(type_info.get('tipo') == 'cuantitativo', type_info).append(current)
+    analysis.append(new_values)
+    set_session_data(pd.concat([current, pd.Series(new_values, name=current.name)], ignore_index=True),
+                     st.session_state.get('data_source', 'Desconocida'))
+    st.session_state['incremental'] = (get_data_fingerprint(st.session_state['data']), analysis)
+
+def get_data_fingerprint(df):
+    """Huella del contenido de la columna analizada; se calcula una vez por DataFrame cargado"""
+    if isinstance(df, ColumnHandle):
+        return df.key
+    cached = st.session_state.get('data_fingerprint')
+    if cached is None or cached[0] is not df:
+        cached = (df, fingerprint_series(df['valores']))
+        st.session_state['data_fingerprint'] = cached
+    return cached[1]
+
+def detect_type_info(data_series, show_ai_features):
+    """Detecta el tipo de datos con IA o con inferencia vectorizada sobre una muestra"""
+    if show_ai_features:
+        return detect_data_type(data_series)
+    return infer_data_type(data_series)
+
 def export_to_csv(df, filename="resultados.csv"):
     """Exporta un DataFrame a CSV"""
     return df.to_csv(index=False).encode('utf-8')
 
+def render_chart(fig):
+    """Muestra un gráfico de Plotly midiendo su serialización y envío al navegador"""
+    with span('app.plotly_chart'):
+        st.plotly_chart(fig, use_container_width=True)
+
+def compute_grouped_analysis(values, groups):
+    """Estadísticas (solo si la columna es cuantitativa) y tabla de frecuencias de values por cada grupo"""
+    valid = values.dropna()
+    is_quantitative = len(valid) > 0 and infer_data_type(valid)['tipo'] == 'cuantitativo'
+    return {
+        'estadisticas': grouped_statistics(values, groups) if is_quantitative else None,
+        'tabla': grouped_frequency_table(values, groups, is_quantitative)
+    }
+
+def render_grouped_analysis(result, value_column, group_column):
+    """Muestra las estadísticas por grupo, el diagrama de caja por grupo y la distribución por grupo"""
+    if result['tabla'].empty:
+        st.info("No hay datos válidos para agrupar")
+        return
+    stats = result['estadisticas']
+    if stats is not None:
+        st.dataframe(stats, use_container_width=True)
+        st.download_button(
+            label="📥 Descargar Estadísticas por Grupo (CSV)",
+            data=export_to_csv(stats),
+            file_name="estadisticas_por_grupo.csv",
+            mime="text/csv"
+        )
+        render_chart(create_grouped_box_plot(stats, f"{value_column} por {group_column}"))
+    else:
+        st.dataframe(result['tabla'].rename(columns=str), use_container_width=True)
+    render_chart(create_grouped_histogram(result['tabla'], f"Distribución de {value_column} por {group_column}"))
+
+def compute_weighted_analysis(values, weights):
+    """Resumen, tabla de frecuencias y gráfico de una tabla (valor, conteo) sin expandir las observaciones"""
+    cleaned = values.dropna()
+    weights = weights.loc[cleaned.index]
+    info = infer_data_type(cleaned) if len(cleaned) else {'tipo': 'cualitativo', 'subtipo': 'nominal'}
+    is_quantitative = info['tipo'] == 'cuantitativo'
+    stats = calculate_all_statistics(cleaned, weights=weights) if is_quantitative else None
+    summary = None if is_quantitative else CategoricalSummary.from_data(cleaned, weights=weights)
+    n = stats['n'] if is_quantitative else summary.total
+    row = summary_row(values.name, info, n, len(values) - len(cleaned), stats=stats, summary=summary)
+    table = create_frequency_table(cleaned, is_quantitative, summary=summary, weights=weights) if n else None
+    if table is None:
+        chart = None
+    elif is_quantitative:
+        chart = create_histogram(cleaned, "Histograma de Distribución", weights=weights)
+    else:
+        chart = create_frequency_bar_chart(table, False)
+    return {'resumen': pd.DataFrame([row], columns=SUMMARY_COLUMNS), 'tabla': table, 'grafico': chart}
+
+def render_weighted_analysis(result):
+    """Muestra el resumen ponderado, su tabla de frecuencias y su gráfico"""
+    st.dataframe(result['resumen'], use_container_width=True)
+    if result['tabla'] is None:
+        st.info("No hay datos válidos con frecuencia mayor que cero")
+        return
+    st.dataframe(result['tabla'], use_container_width=True)
+    st.download_button(
+        label="📥 Descargar Tabla Ponderada (CSV)",
+        data=export_to_csv(result['tabla']),
+        file_name="tabla_ponderada.csv",
+        mime="text/csv"
+    )
+    render_chart(result['grafico'])
+
+def render_diagnostics():
+    """Panel con los tiempos, memoria y aciertos de caché de cada etapa del análisis actual"""
+    recorder = current_recorder()
+    if recorder is None:
+        return
+    with st.expander("🩺 Diagnóstico de rendimiento", expanded=False):
+        if not recorder.spans:
+            st.info("No se registraron etapas en esta ejecución")
+            return
+        summary = pd.DataFrame(recorder.summary())
+        summary['ms'] = (summary.pop('segundos') * 1000).round(2)
+        if recorder.track_memory:
+            summary['KB máx.'] = (summary.pop('bytes_max') / 1024).round(1)
+        else:
+            summary = summary.drop(columns='bytes_max')
+        st.dataframe(summary, use_container_width=True)
+        
+        spans = pd.DataFrame(recorder.spans)
+        spans['ms'] = (spans.pop('segundos') * 1000).round(2)
+        spans['inicio'] = (spans['inicio'] * 1000).round(1)
+        st.caption("Intervalos en orden de finalización (inicio en ms desde el comienzo de la ejecución)")
+        st.dataframe(spans, use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("📥 Exportar JSON", data=recorder.to_json(), file_name="diagnostico.json",
+                               mime="application/json", use_container_width=True)
+        with col2:
+            st.download_button("📥 Exportar Prometheus", data=recorder.to_prometheus(), file_name="diagnostico.prom",
+                               mime="text/plain", use_container_width=True)
+
 def render_go_to_results_button():
     """Renderiza un botón flotante para ir a resultados cuando hay datos"""
     if 'data' in st.session_state:
@@ -255,7 +427,22 @@ def main():
         
         st.header("🔧 Configuración")
         show_ai_features = st.checkbox("Activar funciones de IA", value=True, help="Requiere OPENAI_API_KEY configurada")
-        remove_outliers = st.checkbox("Eliminar valores atípicos", value=False, help="Aplica método IQR para eliminar outliers")
+        remove_outliers = st.checkbox("Eliminar valores atípicos", value=False, help="Elimina los valores fuera de los límites del método elegido")
+        outlier_method = 'iqr'
+        if remove_outliers:
+            outlier_method = st.selectbox(
+                "Método para valores atípicos:",
+                list(OUTLIER_METHOD_NAMES),
+                format_func=OUTLIER_METHOD_NAMES.get,
+                key='outlier_method'
+            )
+        compact_mode = st.checkbox("Modo compacto (float32)", value=False, key='compact_mode',
+                                   help="Guarda las columnas numéricas en float32 o en enteros pequeños (la mitad de "
+                                        "memoria o menos); medias y varianzas se siguen acumulando en float64")
+        if st.checkbox("Diagnóstico de rendimiento", value=False, key='show_diagnostics',
+                       help="Muestra el tiempo de cada etapa del análisis y los aciertos de caché"):
+            st.checkbox("Medir memoria asignada", value=False, key='diagnostics_memory',
+                        help="Usa tracemalloc; hace más lento el análisis mientras está activo")
     
     tabs = st.tabs(["🏠 Inicio", "📖 Manual de Usuario"])
     
@@ -281,9 +468,8 @@ def main():
             if st.button("📊 Analizar datos manuales", type="primary", use_container_width=True):
                 if manual_input.strip():
                     try:
-                        df = load_data_from_text(manual_input)
-                        st.session_state['data'] = df
-                        st.session_state['data_source'] = "Manual"
+                        df = load_data_from_text(manual_input, compact=compact_mode)
+                        set_session_data(df['valores'], "Manual")
                         st.success(f"✅ Datos cargados correctamente: {len(df)} valores")
                         st.rerun()
                     except Exception as e:
@@ -304,9 +490,8 @@ def main():
             if selected_example and selected_example != "Selecciona...":
                 if st.button("📥 Cargar ejemplo", use_container_width=True):
                     try:
-                        df = load_data_from_text(examples[selected_example])
-                        st.session_state['data'] = df
-                        st.session_state['data_source'] = f"Ejemplo: {selected_example}"
+                        df = load_data_from_text(examples[selected_example], compact=compact_mode)
+                        set_session_data(df['valores'], f"Ejemplo: {selected_example}")
                         st.success(f"✅ Ejemplo cargado: {len(df)} valores")
                         st.rerun()
                     except Exception as e:
@@ -316,8 +501,8 @@ def main():
             st.subheader("📁 Cargar desde Archivo")
             
             uploaded_file = st.file_uploader(
-                "Sube un archivo CSV, TXT o XLSX:",
-                type=['csv', 'txt', 'xlsx', 'xls'],
+                "Sube un archivo CSV, TXT, XLSX, Parquet, Feather o Arrow:",
+                type=['csv', 'txt', 'xlsx', 'xls', 'parquet', 'feather', 'arrow'],
                 help="El archivo debe contener datos en columnas"
             )
             
@@ -325,26 +510,93 @@ def main():
                 file_type = uploaded_file.name.split('.')[-1].lower()
                 
                 try:
-                    df = load_data_from_file(uploaded_file, file_type)
-                    st.success(f"✅ Archivo cargado: {uploaded_file.name}")
+                    preview_key = (uploaded_file.name, getattr(uploaded_file, 'file_id', None), uploaded_file.size)
+                    cached_preview = st.session_state.get('file_preview')
+                    if cached_preview is None or cached_preview[0] != preview_key:
+                        cached_preview = (preview_key, preview_file(uploaded_file, file_type))
+                        st.session_state['file_preview'] = cached_preview
+                    preview = cached_preview[1]
+                    columns = preview['columnas']
+                    rows_info = f" ({preview['filas']} filas)" if preview['filas'] is not None else ""
+                    st.success(f"✅ Archivo cargado: {uploaded_file.name}{rows_info}")
                     
                     st.write("**Vista previa del archivo:**")
-                    st.dataframe(df.head(10), use_container_width=True)
+                    st.dataframe(preview['vista_previa'], use_container_width=True)
                     
-                    if len(df.columns) > 1:
+                    if len(columns) > 1:
                         selected_column = st.selectbox(
                             "Selecciona la columna a analizar:",
-                            df.columns
+                            columns
                         )
                     else:
-                        selected_column = df.columns[0]
+                        selected_column = columns[0]
                     
                     if st.button("📊 Analizar datos del archivo", type="primary", use_container_width=True):
-                        analysis_df = pd.DataFrame({'valores': df[selected_column]})
-                        st.session_state['data'] = analysis_df
-                        st.session_state['data_source'] = f"Archivo: {uploaded_file.name} (columna: {selected_column})"
-                        st.success(f"✅ Datos listos para analizar: {len(analysis_df)} valores")
+                        uploaded_file.seek(0)
+                        df = load_data_from_file(uploaded_file, file_type, columns=[selected_column], compact=compact_mode)
+                        set_session_data(df[selected_column], f"Archivo: {uploaded_file.name} (columna: {selected_column})")
+                        st.success(f"✅ Datos listos para analizar: {len(df)} valores")
                         st.rerun()
+                    
+                    if len(columns) > 1:
+                        if st.button("📑 Resumen de todas las columnas", use_container_width=True):
+                            with st.spinner("Analizando todas las columnas..."):
+                                uploaded_file.seek(0)
+                                df = load_data_from_file(uploaded_file, file_type, compact=compact_mode)
+                                st.session_state['batch_profile'] = (uploaded_file.name, profile_dataframe(df)['resumen'])
+                        
+                        batch_profile = st.session_state.get('batch_profile')
+                        if batch_profile is not None and batch_profile[0] == uploaded_file.name:
+                            st.dataframe(batch_profile[1], use_container_width=True)
+                            st.download_button(
+                                label="📥 Descargar Resumen (CSV)",
+                                data=export_to_csv(batch_profile[1]),
+                                file_name="resumen_columnas.csv",
+                                mime="text/csv"
+                            )
+                        
+                        group_column = st.selectbox(
+                            "Agrupar la columna seleccionada por:",
+                            [c for c in columns if c != selected_column],
+                            key='group_column'
+                        )
+                        if st.button("👥 Estadísticas por grupo", use_container_width=True):
+                            with st.spinner("Calculando estadísticas por grupo..."):
+                                uploaded_file.seek(0)
+                                df = load_data_from_file(uploaded_file, file_type, columns=[selected_column, group_column],
+                                                         compact=compact_mode)
+                                try:
+                                    st.session_state['grouped_profile'] = (
+                                        (uploaded_file.name, selected_column, group_column),
+                                        compute_grouped_analysis(df[selected_column], df[group_column])
+                                    )
+                                except ValueError as e:
+                                    st.session_state.pop('grouped_profile', None)
+                                    st.error(f"❌ {str(e)}")
+                        
+                        grouped_profile = st.session_state.get('grouped_profile')
+                        if grouped_profile is not None and grouped_profile[0] == (uploaded_file.name, selected_column, group_column):
+                            render_grouped_analysis(grouped_profile[1], selected_column, group_column)
+                        
+                        weight_column = st.selectbox(
+                            "Columna de frecuencias (tabla valor, conteo):",
+                            [c for c in columns if c != selected_column],
+                            key='weight_column',
+                            help="Cada fila cuenta tantas veces como indica esta columna"
+                        )
+                        if st.button("⚖️ Analizar con frecuencias", use_container_width=True):
+                            with st.spinner("Calculando estadísticas ponderadas..."):
+                                uploaded_file.seek(0)
+                                df = load_data_from_file(uploaded_file, file_type, columns=[selected_column, weight_column],
+                                                         compact=compact_mode)
+                                st.session_state['weighted_profile'] = (
+                                    (uploaded_file.name, selected_column, weight_column),
+                                    compute_weighted_analysis(df[selected_column], df[weight_column])
+                                )
+                        
+                        weighted_profile = st.session_state.get('weighted_profile')
+                        if weighted_profile is not None and weighted_profile[0] == (uploaded_file.name, selected_column, weight_column):
+                            render_weighted_analysis(weighted_profile[1])
                         
                 except Exception as e:
                     st.error(f"❌ Error al cargar el archivo: {str(e)}")
@@ -356,7 +608,21 @@ def main():
             st.header("📊 Análisis de Datos")
             
             df = st.session_state['data']
-            data_series = clean_data(df['valores'], remove_outliers=remove_outliers)
+            cache = get_result_cache()
+            clean_key = (get_data_fingerprint(df), remove_outliers and outlier_method)
+            incremental = None if remove_outliers else get_incremental_analysis(clean_key[0])
+            try:
+                with span('app.limpieza'):
+                    cleaning = cache.get_or_compute(
+                        ('clean',) + clean_key,
+                        lambda: clean_data_context(get_session_data()['valores'], remove_outliers=remove_outliers,
+                                                   method=outlier_method)
+                    )
+                    data_series = cleaning.data
+            except ValueError as e:
+                del st.session_state['data']
+                st.error(f"❌ {str(e)}")
+                return
             
             if len(data_series) == 0:
                 st.error("❌ No hay datos válidos para analizar después de la limpieza")
@@ -365,23 +631,17 @@ def main():
             st.success(f"📂 Fuente: {st.session_state.get('data_source', 'Desconocida')}")
             st.info(f"📈 Total de valores: {len(data_series)}")
             
-            if remove_outliers and len(data_series) < len(df):
-                st.warning(f"⚠️ Se eliminaron {len(df) - len(data_series)} valores atípicos")
+            if cleaning.removed:
+                st.warning(f"⚠️ Se eliminaron {cleaning.removed} valores atípicos "
+                           f"({OUTLIER_METHOD_NAMES[cleaning.method]}: entre {cleaning.bounds[0]:.4f} y {cleaning.bounds[1]:.4f})")
             
-            with st.spinner("🔍 Detectando tipo de datos..."):
-                if show_ai_features:
-                    data_type_info = detect_data_type(data_series.tolist())
-                    data_type = data_type_info.get('tipo', 'cualitativo')
-                    st.session_state['data_type_info'] = data_type_info
-                else:
-                    try:
-                        pd.to_numeric(data_series, errors='raise')
-                        data_type = 'cuantitativo'
-                        data_type_info = {'tipo': 'cuantitativo', 'razon': 'Datos numéricos', 'subtipo': 'continuo'}
-                    except:
-                        data_type = 'cualitativo'
-                        data_type_info = {'tipo': 'cualitativo', 'razon': 'Datos categóricos', 'subtipo': 'nominal'}
-                    st.session_state['data_type_info'] = data_type_info
+            with st.spinner("🔍 Detectando tipo de datos..."), span('app.deteccion_tipo'):
+                data_type_info = cache.get_or_compute(
+                    ('tipo',) + clean_key + (show_ai_features,),
+                    lambda: incremental.type_info if incremental else detect_type_info(data_series, show_ai_features)
+                )
+                data_type = data_type_info.get('tipo', 'cualitativo')
+                st.session_state['data_type_info'] = data_type_info
             
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -394,6 +654,28 @@ def main():
             if show_ai_features:
                 st.info(f"💡 **Razón:** {data_type_info.get('razon', 'N/A')}")
             
+            with st.expander("➕ Agregar datos al análisis"):
+                append_input = st.text_area(
+                    "Nuevos valores (mismo formato que el ingreso manual):",
+                    value="",
+                    height=100,
+                    key="append_input_area"
+                )
+                if st.button("➕ Agregar valores", key="append_button"):
+                    if append_input.strip():
+                        try:
+                            append_session_data(load_data_from_text(append_input)['valores'], data_type_info)
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"❌ Error al agregar los datos: {str(e)}")
+                    else:
+                        st.warning("⚠️ Por favor, ingresa algunos datos")
+                if incremental is not None:
+                    st.caption(f"Análisis incremental: {incremental.batches - 1} lote(s) agregado(s); "
+                               "estadísticas y tabla de frecuencias actualizadas solo con los valores nuevos")
+                elif remove_outliers:
+                    st.caption("Con la eliminación de atípicos activa el análisis se recalcula con todos los datos")
+            
             st.divider()
             
             st.subheader("📋 Tabla de Frecuencias")
@@ -404,8 +686,22 @@ def main():
             else:
                 num_bins = None
             
-            freq_table = create_frequency_table(data_series, is_quantitative, bins=num_bins)
+            category_summary = None
+            with span('app.tabla_frecuencias'):
+                if not is_quantitative:
+                    category_summary = cache.get_or_compute(
+                        ('categorias',) + clean_key,
+                        lambda: incremental.categorical_summary() if incremental else CategoricalSummary.from_data(data_series)
+                    )
+                
+                freq_table = cache.get_or_compute(
+                    ('frecuencias',) + clean_key + (data_type, num_bins),
+                    lambda: incremental.frequency_table(num_bins) if incremental
+                    else create_frequency_table(data_series, is_quantitative, bins=num_bins, summary=category_summary)
+                )
             st.dataframe(freq_table, use_container_width=True)
+            if is_quantitative and 'Valor' in freq_table.columns:
+                st.caption("Datos discretos con pocos valores distintos: una fila por valor (el número de intervalos no se aplica)")
             
             csv_freq = export_to_csv(freq_table)
             st.download_button(
@@ -415,14 +711,35 @@ def main():
                 mime="text/csv"
             )
             
+            with st.expander("🔝 Valores más frecuentes"):
+                top_k = st.slider("Cantidad de valores:", min_value=5, max_value=50, value=DEFAULT_TOP_K, key='top_k')
+                with span('app.valores_frecuentes'):
+                    frequent = cache.get_or_compute(('frecuentes',) + clean_key, lambda: frequent_values(data_series))
+                st.dataframe(frequent.top(top_k), use_container_width=True)
+                if frequent.is_exact:
+                    st.caption(f"Conteo exacto (la columna tiene como máximo {frequent.capacity} valores distintos)")
+                else:
+                    st.caption(f"Conteo aproximado en una pasada con {frequent.capacity} contadores: cada frecuencia "
+                               f"real está entre la mínima y la máxima, y ningún valor fuera de la tabla aparece más "
+                               f"de {frequent.error_bound} veces")
+            
             st.divider()
             
             if is_quantitative:
                 st.subheader("📊 Medidas Estadísticas")
                 
-                stats = calculate_all_statistics(data_series)
+                with span('app.estadisticas'):
+                    stats = cache.get_or_compute(
+                        ('estadisticas',) + clean_key,
+                        lambda: incremental.statistics() if incremental else calculate_all_statistics(cleaning)
+                    )
                 st.session_state['statistics'] = stats
                 
+                interpretation_key = ('interpretacion',) + clean_key + (data_type,)
+                interpretation_future = None
+                if show_ai_features and interpretation_key not in cache:
+                    interpretation_future = interpret_statistics_async(stats, data_type)
+                
                 col1, col2 = st.columns(2)
                 
                 with col1:
@@ -439,7 +756,16 @@ def main():
                     with metrics_col3:
                         if central['moda'] is not None:
                             st.metric("Moda", f"{central['moda']:.4f}")
-                            st.caption(f"Frecuencia: {central['frecuencia_moda']}")
+                            if 'error_moda' in central:
+                                st.caption(f"Frecuencia: entre {central['frecuencia_moda']} y "
+                                           f"{central['frecuencia_moda'] + central['error_moda']} (aproximada)")
+                            elif central['frecuencia_moda'] == 1:
+                                st.caption("Frecuencia: 1 (ningún valor se repite)")
+                            else:
+                                st.caption(f"Frecuencia: {central['frecuencia_moda']}")
+                        elif 'error_moda' in central:
+                            st.metric("Moda", "—")
+                            st.caption(f"Ningún valor se repite más de {central['error_moda']} veces")
                 
                 with col2:
                     st.markdown("### 📏 Medidas de Dispersión")
@@ -499,42 +825,55 @@ def main():
             
             st.subheader("📈 Visualizaciones")
             
-            visualizations = create_multiple_visualizations(data_series, data_type, freq_table)
+            with span('app.graficos'):
+                visualizations = dict(cache.get_or_compute(
+                    ('graficos',) + clean_key + (data_type,),
+                    lambda: create_multiple_visualizations(data_series, data_type, summary=category_summary)
+                ))
+                visualizations['freq_chart'] = cache.get_or_compute(
+                    ('grafico_frecuencias',) + clean_key + (data_type, num_bins),
+                    lambda: create_frequency_bar_chart(freq_table, is_quantitative)
+                )
             
             if is_quantitative:
                 viz_col1, viz_col2 = st.columns(2)
                 
                 with viz_col1:
                     if 'histogram' in visualizations:
-                        st.plotly_chart(visualizations['histogram'], use_container_width=True)
+                        render_chart(visualizations['histogram'])
                     if 'freq_chart' in visualizations:
-                        st.plotly_chart(visualizations['freq_chart'], use_container_width=True)
+                        render_chart(visualizations['freq_chart'])
                 
                 with viz_col2:
                     if 'box_plot' in visualizations:
-                        st.plotly_chart(visualizations['box_plot'], use_container_width=True)
+                        render_chart(visualizations['box_plot'])
             else:
                 viz_col1, viz_col2 = st.columns(2)
                 
                 with viz_col1:
                     if 'bar_chart' in visualizations:
-                        st.plotly_chart(visualizations['bar_chart'], use_container_width=True)
+                        render_chart(visualizations['bar_chart'])
                 
                 with viz_col2:
                     if 'pie_chart' in visualizations:
-                        st.plotly_chart(visualizations['pie_chart'], use_container_width=True)
+                        render_chart(visualizations['pie_chart'])
                 
                 if 'freq_chart' in visualizations:
-                    st.plotly_chart(visualizations['freq_chart'], use_container_width=True)
+                    render_chart(visualizations['freq_chart'])
             
             if show_ai_features and is_quantitative:
                 st.divider()
                 st.subheader("🤖 Interpretación con IA")
                 
-                with st.spinner("Generando interpretación..."):
-                    interpretation = interpret_statistics(stats, data_type)
+                with st.spinner("Generando interpretación..."), span('app.interpretacion'):
+                    interpretation = cache.get_or_compute(
+                        interpretation_key,
+                        lambda: (interpretation_future or interpret_statistics_async(stats, data_type)).result()
+                    )
                     st.info(interpretation)
                     st.session_state['interpretation'] = interpretation
+            
+            render_diagnostics()
         else:
             st.info("👆 Por favor, ingresa datos en la sección superior para comenzar el análisis")
             
@@ -576,6 +915,7 @@ def main():
         - Arrastra y suelta tu archivo o haz clic para buscarlo
         - Si el archivo tiene varias columnas, selecciona la que deseas analizar
         - Haz clic en "Analizar datos del archivo"
+        - Con varias columnas, "Resumen de todas las columnas" calcula las estadísticas de cada una en una sola tabla
         
         ### 2️⃣ Análisis de Datos
         
@@ -691,4 +1031,11 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    diagnostics = None
+    if st.session_state.get('show_diagnostics'):
+        diagnostics = Recorder(
+            track_memory=st.session_state.get('diagnostics_memory', False),
+            caches=[get_result_cache(), get_response_cache()]
+        )
+    with recording(diagnostics):
+        main()
@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from stats_utils import calculate_all_statistics, working_dtype
+from data_processor import create_frequency_table
+from categorical import CategoricalSummary
+from type_inference import infer_data_type
+
+PARALLEL_MIN_CELLS = 1_000_000
+
+SUMMARY_COLUMNS = [
+    'Columna', 'Tipo', 'Subtipo', 'N', 'Nulos', 'Media', 'Mediana', 'Moda', 'Frecuencia Moda',
+    'Desv. Estándar', 'Varianza', 'Mínimo', 'Máximo', 'Q1', 'Q3', 'IQR', 'Coef. Variación', 'Categorías'
+]
+
+def summary_row(name, info: Dict, n: int, nulls: int, stats: Dict = None,
+                summary: CategoricalSummary = None) -> Dict:
+    """
+    Fila del resumen combinado a partir de las estadísticas (cuantitativa) o del conteo de categorías (cualitativa)
+    """
+    row = dict.fromkeys(SUMMARY_COLUMNS)
+    row.update({
+        'Columna': name,
+        'Tipo': info['tipo'],
+        'Subtipo': info['subtipo'],
+        'N': n,
+        'Nulos': nulls
+    })
+    if stats is not None:
+        central, dispersion = stats['tendencia_central'], stats['dispersion']
+        row.update({
+            'Media': central['media'],
+            'Mediana': central['mediana'],
+            'Moda': central['moda'],
+            'Frecuencia Moda': central['frecuencia_moda'],
+            'Desv. Estándar': dispersion['desviacion_estandar'],
+            'Varianza': dispersion['varianza'],
+            'Mínimo': dispersion['minimo'],
+            'Máximo': dispersion['maximo'],
+            'Q1': dispersion['q1'],
+            'Q3': dispersion['q3'],
+            'IQR': dispersion['rango_intercuartil'],
+            'Coef. Variación': dispersion['coeficiente_variacion']
+        })
+    elif summary is not None:
+        top = summary.by_frequency()
+        row.update({
+            'Moda': top.index[0] if len(top) else None,
+            'Frecuencia Moda': int(top.iloc[0]) if len(top) else 0,
+            'Categorías': len(summary)
+        })
+    return row
+
+def _quantitative_profile(name, values: pd.Series, info: Dict, bins: Optional[int], with_table: bool) -> tuple:
+    """
+    Fila del resumen y tabla de frecuencias de una columna numérica (los NaN cuentan como nulos)
+    """
+    valid = int(values.notna().sum())
+    row = summary_row(name, info, valid, len(values) - valid, stats=calculate_all_statistics(values))
+    table = create_frequency_table(values.dropna(), True, bins=bins) if with_table and valid > 0 else None
+    return row, table
+
+def _qualitative_profile(name, values: pd.Series, info: Dict, with_table: bool) -> tuple:
+    """
+    Fila del resumen y tabla de frecuencias de una columna categórica
+    """
+    cleaned = values.dropna()
+    summary = CategoricalSummary.from_data(cleaned)
+    row = summary_row(name, info, len(cleaned), len(values) - len(cleaned), summary=summary)
+    table = create_frequency_table(cleaned, False, summary=summary) if with_table and len(cleaned) > 0 else None
+    return row, table
+
+def _profile_shared_column(shm_name: str, shape: tuple, index: int, name, info: Dict,
+                           bins: Optional[int], with_table: bool, dtype: str = 'float64') -> tuple:
+    """
+    Tarea del proceso trabajador: lee la columna directamente del bloque de memoria compartida
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        matrix = np.ndarray(shape, dtype=dtype, buffer=shm.buf, order='F')
+        values = pd.Series(matrix[:, index], copy=False)
+        result = _quantitative_profile(name, values, info, bins, with_table)
+        del values, matrix
+        return result
+    finally:
+        shm.close()
+
+def profile_dataframe(df: pd.DataFrame, max_workers: int = None, bins: int = None,
+                      frequency_tables: bool = True) -> Dict:
+    """
+    Calcula estadísticas descriptivas y tablas de frecuencia de todas las columnas de un DataFrame
+
+    Las columnas numéricas se copian una vez a un bloque de memoria compartida (una columna
+    contigua por variable) que los procesos trabajadores leen sin serializarlo; las categóricas
+    se envían a los trabajadores como series. Si todas las columnas numéricas son compactas (float32 o
+    enteros de hasta 16 bits, ver compact_frame) el bloque es float32 y ocupa la mitad. Con max_workers=1 o datos pequeños todo se
+    ejecuta en el proceso actual.
+
+    Retorna {'resumen': DataFrame con una fila por columna, 'tablas': {columna: tabla de frecuencias}}.
+    """
+    infos = {name: infer_data_type(df[name]) for name in df.columns}
+    numeric_names = [name for name in df.columns if infos[name]['tipo'] == 'cuantitativo']
+    object_names = [name for name in df.columns if infos[name]['tipo'] != 'cuantitativo']
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    parallel = max_workers > 1 and len(df.columns) > 1 and df.size >= PARALLEL_MIN_CELLS
+
+    results = {}
+    if not parallel:
+        for name in numeric_names:
+            values = pd.to_numeric(df[name], errors='coerce')
+            values = values.astype(working_dtype(values.dtype))
+            results[name] = _quantitative_profile(name, values, infos[name], bins, frequency_tables)
+        for name in object_names:
+            results[name] = _qualitative_profile(name, df[name], infos[name], frequency_tables)
+    else:
+        shape = (len(df), len(numeric_names))
+        compact = all(working_dtype(df[name].dtype) == np.float32 for name in numeric_names)
+        dtype = np.dtype(np.float32 if compact else np.float64)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(df) * len(numeric_names) * dtype.itemsize))
+        try:
+            matrix = np.ndarray(shape, dtype=dtype, buffer=shm.buf, order='F')
+            for index, name in enumerate(numeric_names):
+                matrix[:, index] = pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=dtype, na_value=np.nan)
+            del matrix
+
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    name: executor.submit(_profile_shared_column, shm.name, shape, index, name,
+                                          infos[name], bins, frequency_tables, dtype.name)
+                    for index, name in enumerate(numeric_names)
+                }
+                futures.update({
+                    name: executor.submit(_qualitative_profile, name, df[name], infos[name], frequency_tables)
+                    for name in object_names
+                })
+                results = {name: future.result() for name, future in futures.items()}
+        finally:
+            shm.close()
+            shm.unlink()
+
+    ordered = [results[name] for name in df.columns]
+    summary = pd.DataFrame([row for row, _ in ordered], columns=SUMMARY_COLUMNS)
+    tables = {name: results[name][1] for name in df.columns if results[name][1] is not None}
+    return {'resumen': summary, 'tablas': tables}
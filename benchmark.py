@@ -0,0 +1,220 @@
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from stats_utils import calculate_all_statistics
+from data_processor import load_data_from_text, load_data_from_file, create_frequency_table, clean_data
+from categorical import CategoricalSummary
+from visualization import (create_histogram, create_box_plot, create_bar_chart, create_pie_chart,
+                           create_frequency_bar_chart)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_REPEATS = 3
+DEFAULT_TOLERANCE = 1.25
+MAX_TEXT_ROWS = 10_000_000
+MAX_XLSX_ROWS = 100_000
+COLORES = ['Azul', 'Rojo', 'Verde', 'Amarillo', 'Negro', 'Blanco', 'Morado', 'Naranja']
+
+def generate_numeric(n: int, seed: int = 0) -> pd.Series:
+    """
+    Ingresos mensuales sintéticos (continuos, sesgados a la derecha, con algunos atípicos)
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(mean=7.3, sigma=0.25, size=n).round(2)
+    outliers = rng.random(n) < 0.01
+    values[outliers] *= 4
+    return pd.Series(values, name='Ingreso_Mensual')
+
+def generate_discrete(n: int, seed: int = 0) -> pd.Series:
+    """
+    Edades de estudiantes sintéticas (enteros entre 16 y 35)
+    """
+    rng = np.random.default_rng(seed)
+    return pd.Series(np.clip(rng.poisson(20, n), 16, 35), name='Edad')
+
+def generate_categorical(n: int, seed: int = 0) -> pd.Series:
+    """
+    Colores favoritos sintéticos con frecuencias desiguales
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.linspace(2.0, 0.5, len(COLORES))
+    return pd.Series(rng.choice(COLORES, size=n, p=weights / weights.sum()), name='Color')
+
+GENERATORS = {
+    'continuo': generate_numeric,
+    'discreto': generate_discrete,
+    'categorico': generate_categorical
+}
+
+def measure(func: Callable, repeats: int = DEFAULT_REPEATS) -> Dict:
+    """
+    Mejor tiempo de repeats ejecuciones y pico de memoria (tracemalloc) de una ejecución adicional
+
+    tracemalloc ve las asignaciones de Python y numpy, no las del asignador propio de pyarrow.
+    """
+    best = None
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'segundos': best, 'memoria_pico_mb': peak / 1024 / 1024}
+
+def _stages(kind: str, data: pd.Series, work_dir: str, stage_filter: str = None) -> Dict[str, Callable]:
+    """
+    Etapas a medir para un tipo de datos; las que dependen de archivos se preparan aquí fuera del tiempo medido
+    """
+    n = len(data)
+    is_quantitative = kind != 'categorico'
+    stages = {}
+
+    def wanted(stage: str) -> bool:
+        return stage_filter is None or stage_filter in stage
+
+    if n <= MAX_TEXT_ROWS and wanted('load_data_from_text'):
+        text = ', '.join(map(str, data.tolist()))
+        stages['load_data_from_text'] = lambda: load_data_from_text(text)
+
+    if wanted('load_data_from_file[csv]'):
+        csv_path = os.path.join(work_dir, f"{kind}_{n}.csv")
+        data.to_frame().to_csv(csv_path, index=False)
+        stages['load_data_from_file[csv]'] = lambda: load_data_from_file(csv_path, 'csv')
+
+    if n <= MAX_XLSX_ROWS and wanted('load_data_from_file[xlsx]'):
+        xlsx_bytes = io.BytesIO()
+        data.to_frame().to_excel(xlsx_bytes, index=False)
+        stages['load_data_from_file[xlsx]'] = lambda: load_data_from_file(io.BytesIO(xlsx_bytes.getvalue()), 'xlsx')
+
+    if wanted('load_data_from_file[parquet]'):
+        try:
+            parquet_path = os.path.join(work_dir, f"{kind}_{n}.parquet")
+            data.to_frame().to_parquet(parquet_path, index=False)
+            stages['load_data_from_file[parquet]'] = lambda: load_data_from_file(parquet_path, 'parquet')
+        except ImportError:
+            pass
+
+    stages['clean_data'] = lambda: clean_data(data, remove_outliers=is_quantitative)
+    stages['create_frequency_table'] = lambda: create_frequency_table(data, is_quantitative)
+    freq_table = create_frequency_table(data, is_quantitative)
+
+    if is_quantitative:
+        stages['calculate_all_statistics'] = lambda: calculate_all_statistics(data)
+        stages['create_histogram'] = lambda: create_histogram(data).to_json()
+        stages['create_box_plot'] = lambda: create_box_plot(data).to_json()
+    else:
+        stages['CategoricalSummary.from_data'] = lambda: CategoricalSummary.from_data(data)
+        stages['create_bar_chart'] = lambda: create_bar_chart(data).to_json()
+        stages['create_pie_chart'] = lambda: create_pie_chart(data).to_json()
+    stages['create_frequency_bar_chart'] = lambda: create_frequency_bar_chart(freq_table, is_quantitative).to_json()
+    return {stage: func for stage, func in stages.items() if wanted(stage)}
+
+def run_benchmarks(sizes: List[int] = None, kinds: List[str] = None, repeats: int = DEFAULT_REPEATS,
+                   stage_filter: str = None, seed: int = 0, verbose: bool = True) -> List[Dict]:
+    """
+    Ejecuta todas las etapas para cada tamaño y tipo de datos; retorna una fila por medición
+
+    Los gráficos se miden junto con su serialización a JSON, que es lo que Streamlit envía al navegador.
+    """
+    sizes = sizes or DEFAULT_SIZES
+    kinds = kinds or list(GENERATORS)
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for n in sizes:
+            for kind in kinds:
+                data = GENERATORS[kind](n, seed)
+                for stage, func in _stages(kind, data, work_dir, stage_filter).items():
+                    row = {'etapa': stage, 'datos': kind, 'n': n}
+                    row.update(measure(func, repeats))
+                    results.append(row)
+                    if verbose:
+                        print(f"{stage:<34} {kind:<10} {n:>11,} {row['segundos'] * 1000:>11.2f} ms "
+                              f"{row['memoria_pico_mb']:>10.1f} MB", flush=True)
+    return results
+
+def compare_results(results: List[Dict], baseline: List[Dict], tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    """
+    Compara con una ejecución anterior; marca como regresión lo que tarde más de tolerance veces la línea base
+    """
+    previous = {(r['etapa'], r['datos'], r['n']): r for r in baseline}
+    comparison = []
+    for row in results:
+        base = previous.get((row['etapa'], row['datos'], row['n']))
+        if base is None or base['segundos'] <= 0:
+            continue
+        ratio = row['segundos'] / base['segundos']
+        comparison.append({
+            'etapa': row['etapa'],
+            'datos': row['datos'],
+            'n': row['n'],
+            'base_segundos': base['segundos'],
+            'segundos': row['segundos'],
+            'razon': ratio,
+            'regresion': ratio > tolerance
+        })
+    return comparison
+
+def _parse_size(text: str) -> int:
+    return int(float(text))
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Mide carga, limpieza, estadísticas, tablas de frecuencia y gráficos con datos sintéticos"
+    )
+    parser.add_argument('-n', '--tamanos', type=_parse_size, nargs='+', default=DEFAULT_SIZES,
+                        help="Número de filas (admite notación 1e6; hasta 1e8 según la memoria disponible)")
+    parser.add_argument('-t', '--tipos', nargs='+', choices=list(GENERATORS), default=list(GENERATORS))
+    parser.add_argument('-e', '--etapa', default=None, help="Medir solo las etapas que contengan este texto")
+    parser.add_argument('-r', '--repeticiones', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--guardar', help="Guardar los resultados en un archivo JSON")
+    parser.add_argument('--comparar', help="Archivo JSON de una ejecución anterior para comparar")
+    parser.add_argument('--tolerancia', type=float, default=DEFAULT_TOLERANCE,
+                        help="Razón de tiempo a partir de la cual se reporta una regresión (por defecto 1.25)")
+    args = parser.parse_args(argv)
+
+    print(f"Python {platform.python_version()} · numpy {np.__version__} · pandas {pd.__version__} · {platform.machine()}")
+    print(f"{'Etapa':<34} {'Datos':<10} {'Filas':>11} {'Tiempo':>14} {'Memoria':>13}")
+    results = run_benchmarks(args.tamanos, args.tipos, args.repeticiones, args.etapa)
+
+    if args.guardar:
+        with open(args.guardar, 'w', encoding='utf-8') as handle:
+            json.dump({'python': platform.python_version(), 'resultados': results}, handle, indent=2)
+        print(f"\n💾 Resultados guardados en {args.guardar}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as handle:
+            baseline = json.load(handle)['resultados']
+        comparison = compare_results(results, baseline, args.tolerancia)
+        print(f"\n{'Etapa':<34} {'Datos':<10} {'Filas':>11} {'Base':>11} {'Actual':>11} {'Razón':>7}")
+        for row in comparison:
+            flag = " ⚠️" if row['regresion'] else ""
+            print(f"{row['etapa']:<34} {row['datos']:<10} {row['n']:>11,} {row['base_segundos'] * 1000:>9.2f}ms "
+                  f"{row['segundos'] * 1000:>9.2f}ms {row['razon']:>6.2f}x{flag}")
+        regressions = sum(row['regresion'] for row in comparison)
+        if regressions:
+            print(f"\n❌ {regressions} regresión(es) por encima de {args.tolerancia}x")
+            return 1
+        print("\n✅ Sin regresiones respecto a la línea base")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+from typing import Union, List
+
+from stats_utils import weights_array
+
+DEFAULT_TOP_K = 20
+OTHERS_LABEL = 'Otros'
+
+class CategoricalSummary:
+    """
+    Conteo de categorías calculado una sola vez (códigos factorizados + np.bincount)
+
+    Lo comparten la tabla de frecuencias y los gráficos de barras, circular y de frecuencias
+    para no repetir value_counts sobre columnas grandes.
+    """
+
+    def __init__(self, categories: pd.Index, counts: np.ndarray, total: int = None, category_order: bool = False):
+        self.categories = pd.Index(categories)
+        counts = np.asarray(counts)
+        self.counts = counts.astype(np.float64 if counts.dtype.kind == 'f' else np.int64, copy=False)
+        self.total = self.counts.sum().item() if total is None else total
+        self._category_order = category_order
+
+    @classmethod
+    def from_data(cls, data: Union[List, pd.Series], weights: Union[List, pd.Series] = None) -> 'CategoricalSummary':
+        """
+        Factoriza los datos una vez y cuenta cada código; total incluye los valores nulos como len(data)
+
+        Con weights cada fila suma su peso en lugar de 1 (p. ej. una tabla categoría, conteo), las
+        categorías con peso total cero se omiten y total es la suma de todos los pesos.
+        """
+        if isinstance(data, list):
+            data = pd.Series(data)
+
+        if isinstance(data.dtype, pd.CategoricalDtype):
+            codes = data.cat.codes.to_numpy()
+            categories = data.cat.categories
+            category_order = True
+        else:
+            codes, categories = pd.factorize(data, use_na_sentinel=True)
+            category_order = False
+
+        if weights is not None:
+            weights = weights_array(weights, len(data))
+            valid = codes >= 0
+            counts = np.bincount(codes[valid], weights=weights[valid], minlength=len(categories))
+            if weights.dtype.kind != 'f':
+                counts = counts.astype(np.int64)
+            present = counts > 0
+            return cls(categories[present], counts[present], total=weights.sum().item(), category_order=category_order)
+
+        counts = np.bincount(codes[codes >= 0], minlength=len(categories))
+        return cls(categories, counts, total=len(data), category_order=category_order)
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def by_category(self) -> pd.Series:
+        """
+        Conteos ordenados por categoría (como value_counts().sort_index())
+        """
+        counts = pd.Series(self.counts, index=self.categories)
+        if self._category_order:
+            return counts
+        return counts.sort_index()
+
+    def by_frequency(self) -> pd.Series:
+        """
+        Conteos de mayor a menor; los empates conservan el orden de aparición
+        """
+        order = np.argsort(-self.counts, kind='stable')
+        return pd.Series(self.counts[order], index=self.categories[order])
+
+    def top_k(self, k: int = DEFAULT_TOP_K, other_label: str = OTHERS_LABEL) -> pd.Series:
+        """
+        Las k categorías más frecuentes y el resto agrupado en una categoría 'Otros'
+        """
+        counts = self.by_frequency()
+        if k is None or len(counts) <= k:
+            return counts
+        top = counts.iloc[:k]
+        top.index = top.index.astype(str)
+        return pd.concat([top, pd.Series([counts.iloc[k:].sum()], index=[other_label])])
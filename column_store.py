@@ -0,0 +1,154 @@
+import json
+import os
+import shutil
+import threading
+import uuid
+import numpy as np
+import pandas as pd
+
+from result_cache import fingerprint_series
+from instrumentation import instrumented
+
+DEFAULT_STORE_PATH = os.environ.get(
+    "COLUMN_STORE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "estad", "columnas")
+)
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+NUMERIC_KINDS = 'biufmM'
+
+class ColumnHandle:
+    """
+    Referencia ligera a una columna guardada en ColumnStore; es lo único que se guarda en la sesión
+    """
+
+    def __init__(self, key: str, name, length: int):
+        self.key = key
+        self.name = name
+        self.length = length
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ColumnHandle) and (self.key, self.name) == (other.key, other.name)
+
+    def __hash__(self) -> int:
+        return hash((self.key, self.name))
+
+    def __repr__(self) -> str:
+        return f"ColumnHandle({self.key[:12]}, {self.name!r}, {self.length})"
+
+class ColumnStore:
+    """
+    Almacén en disco de columnas cargadas, indexado por la huella de su contenido
+
+    Las columnas numéricas se guardan como .npy y se abren con np.load(mmap_mode='r'), de modo que
+    varias sesiones que suben el mismo archivo comparten las mismas páginas en la caché del sistema
+    operativo. Las columnas de texto se guardan como códigos enteros (.npy) más la lista de categorías.
+    Al superar max_bytes se eliminan las columnas usadas hace más tiempo.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self._path(key), 'meta.json'))
+
+    @instrumented
+    def put(self, data: pd.Series, name=None) -> ColumnHandle:
+        """
+        Guarda la columna (si no estaba ya guardada) y retorna su referencia
+        """
+        key = fingerprint_series(data)
+        name = data.name if name is None else name
+        if key in self:
+            os.utime(os.path.join(self._path(key), 'meta.json'))
+            return ColumnHandle(key, name, len(data))
+
+        staging = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            if isinstance(data.dtype, np.dtype) and data.dtype.kind in NUMERIC_KINDS:
+                np.save(os.path.join(staging, 'valores.npy'), data.to_numpy())
+                meta = {'formato': 'numerico'}
+            else:
+                codes, categories = pd.factorize(data, use_na_sentinel=True)
+                np.save(os.path.join(staging, 'codigos.npy'), codes.astype(np.int32 if len(categories) < 2 ** 31 else np.int64))
+                with open(os.path.join(staging, 'categorias.json'), 'w', encoding='utf-8') as handle:
+                    json.dump([v.item() if isinstance(v, np.generic) else v for v in categories], handle,
+                              ensure_ascii=False, default=str)
+                meta = {'formato': 'categorico'}
+            meta['longitud'] = len(data)
+            with open(os.path.join(staging, 'meta.json'), 'w', encoding='utf-8') as handle:
+                json.dump(meta, handle)
+            try:
+                os.rename(staging, self._path(key))
+            except OSError:
+                shutil.rmtree(staging, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self._evict(keep=key)
+        return ColumnHandle(key, name, len(data))
+
+    @instrumented
+    def load(self, handle: ColumnHandle) -> pd.Series:
+        """
+        Abre la columna: mapeada en memoria (solo lectura) si es numérica, reconstruida desde los códigos si es de texto
+        """
+        path = self._path(handle.key)
+        try:
+            with open(os.path.join(path, 'meta.json'), encoding='utf-8') as meta_file:
+                meta = json.load(meta_file)
+            os.utime(os.path.join(path, 'meta.json'))
+            if meta['formato'] == 'numerico':
+                return pd.Series(np.load(os.path.join(path, 'valores.npy'), mmap_mode='r'), name=handle.name, copy=False)
+            codes = np.load(os.path.join(path, 'codigos.npy'), mmap_mode='r')
+            with open(os.path.join(path, 'categorias.json'), encoding='utf-8') as categories_file:
+                categories = np.array(json.load(categories_file) + [np.nan], dtype=object)
+            return pd.Series(categories[codes], name=handle.name)
+        except FileNotFoundError:
+            raise ValueError("Los datos ya no están disponibles en el almacén; vuelve a cargarlos")
+
+    def _entries(self) -> list:
+        entries = []
+        for key in os.listdir(self.root):
+            path = self._path(key)
+            if key.startswith('.') or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+                entries.append((os.path.getmtime(os.path.join(path, 'meta.json')), key, size))
+            except OSError:
+                continue
+        return sorted(entries)
+
+    def _evict(self, keep: str = None) -> None:
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, _, size in entries)
+            for _, key, size in entries:
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                shutil.rmtree(self._path(key), ignore_errors=True)
+                total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, key, _ in self._entries():
+                shutil.rmtree(self._path(key), ignore_errors=True)
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            'columnas': len(entries),
+            'bytes': sum(size for _, _, size in entries)
+        }
@@ -0,0 +1,112 @@
+import os
+import pandas as pd
+from typing import Dict, Iterator, List
+
+COLUMNAR_TYPES = ('parquet', 'feather', 'arrow')
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ValueError("Se requiere pyarrow para leer archivos Parquet, Feather o Arrow")
+    return pyarrow
+
+def _arrow_source(file):
+    """
+    Rutas: archivo mapeado en memoria (sin copiarlo al proceso). Archivos subidos: búfer sobre sus bytes
+    """
+    pa = _require_pyarrow()
+    if isinstance(file, (str, os.PathLike)):
+        return pa.memory_map(os.fspath(file), 'r')
+    if hasattr(file, 'getbuffer'):
+        return pa.py_buffer(file.getbuffer())
+    return file
+
+def _data_columns(names: List[str]) -> List[str]:
+    return [name for name in names if not name.startswith('__index_level_')]
+
+def _open_ipc(source, columns: List[str] = None):
+    """
+    Abre un archivo Feather v2 / Arrow IPC; con columns solo se leen (y descomprimen) esos campos
+    """
+    import pyarrow.ipc as ipc
+    if columns is None:
+        return ipc.open_file(source)
+    schema = ipc.open_file(source).schema
+    missing = [name for name in columns if schema.get_field_index(name) < 0]
+    if missing:
+        raise ValueError(f"Columnas no encontradas: {', '.join(map(str, missing))}")
+    indices = sorted(schema.get_field_index(name) for name in columns)
+    return ipc.open_file(source, options=ipc.IpcReadOptions(included_fields=indices))
+
+def read_columnar(file, file_type: str, columns: List[str] = None) -> pd.DataFrame:
+    """
+    Lee un archivo Parquet, Feather o Arrow IPC leyendo del disco solo las columnas pedidas
+    """
+    _require_pyarrow()
+    source = _arrow_source(file)
+    if file_type == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(source, columns=columns)
+    elif file_type in ('feather', 'arrow'):
+        table = _open_ipc(source, columns).read_all()
+    else:
+        raise ValueError(f"Tipo de archivo no soportado: {file_type}")
+    return table.to_pandas()
+
+def read_columnar_schema(file, file_type: str, n_rows: int = 10) -> Dict:
+    """
+    Columnas, tipos y número de filas desde los metadatos del archivo, más una vista previa
+    que solo lee el primer bloque de filas
+    """
+    _require_pyarrow()
+    source = _arrow_source(file)
+    if file_type == 'parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(source)
+        schema = parquet_file.schema_arrow
+        num_rows = parquet_file.metadata.num_rows
+        first = next(parquet_file.iter_batches(batch_size=n_rows), None)
+    elif file_type in ('feather', 'arrow'):
+        import pyarrow.ipc as ipc
+        reader = ipc.open_file(source)
+        schema = reader.schema
+        num_rows = reader.count_rows()
+        first = reader.get_batch(0).slice(0, n_rows) if reader.num_record_batches > 0 else None
+    else:
+        raise ValueError(f"Tipo de archivo no soportado: {file_type}")
+
+    columns = _data_columns(schema.names)
+    if first is not None:
+        preview = first.to_pandas()[columns].head(n_rows)
+    else:
+        preview = schema.empty_table().to_pandas()[columns]
+    return {
+        'columnas': columns,
+        'tipos': {name: str(schema.field(name).type) for name in columns},
+        'filas': num_rows,
+        'vista_previa': preview
+    }
+
+def iter_columnar_chunks(file, file_type: str, column=None, chunksize: int = 100_000) -> Iterator[pd.Series]:
+    """
+    Entrega una columna por lotes de registros (grupos de filas en Parquet, lotes en Feather/Arrow)
+    """
+    _require_pyarrow()
+    source = _arrow_source(file)
+    if file_type == 'parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(source)
+        name = column if column is not None else _data_columns(parquet_file.schema_arrow.names)[0]
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=[name]):
+            yield batch.column(0).to_pandas().rename(name)
+    elif file_type in ('feather', 'arrow'):
+        import pyarrow.ipc as ipc
+        name = column if column is not None else _data_columns(ipc.open_file(source).schema.names)[0]
+        reader = _open_ipc(source, [name])
+        for index in range(reader.num_record_batches):
+            values = reader.get_batch(index).column(0)
+            for start in range(0, len(values), chunksize):
+                yield values.slice(start, chunksize).to_pandas().rename(name)
+    else:
+        raise ValueError(f"Tipo de archivo no soportado: {file_type}")
@@ -3,103 +3,364 @@ import numpy as np
 from typing import Union, List, Dict
 import io
 
-def load_data_from_text(text_input: str, delimiter: str = None) -> pd.DataFrame:
+from categorical import CategoricalSummary
+from columnar_io import COLUMNAR_TYPES, read_columnar, read_columnar_schema
+from instrumentation import instrumented
+from stats_utils import to_sorted_array, sorted_quantile, working_dtype, mean_and_m2, aggregate_weights
+from result_cache import estimate_size
+
+FLOAT32_MAX = float(np.finfo(np.float32).max)
+
+def compact_series(data: pd.Series) -> pd.Series:
+    """
+    Versión compacta de una columna numérica: float64 pasa a float32 y los enteros al tipo entero más
+    pequeño que contiene sus valores; las demás columnas no cambian
+
+    Una columna float64 con valores fuera del rango de float32 se deja como está. Cada valor float32
+    tiene un error relativo de a lo sumo 2**-24 (≈6e-8); como las estadísticas se acumulan en float64
+    (ver stats_utils.mean_and_m2), la media difiere de la calculada en float64 en menos de 6e-8·media(|x|)
+    y la desviación estándar en menos de 6e-8·max(|x|). Los enteros reducidos son exactos.
+    """
+    if not isinstance(data.dtype, np.dtype):
+        return data
+    kind = data.dtype.kind
+    if kind == 'i':
+        return pd.to_numeric(data, downcast='integer')
+    if kind == 'u':
+        return pd.to_numeric(data, downcast='unsigned')
+    if kind == 'f' and data.dtype.itemsize > 4:
+        if len(data) and max(abs(data.min()), abs(data.max())) > FLOAT32_MAX:
+            return data
+        return data.astype(np.float32)
+    return data
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica compact_series a cada columna; la memoria de las columnas float64 se reduce a la mitad
+    """
+    return pd.DataFrame({name: compact_series(df[name]) for name in df.columns}, index=df.index)
+
+def _tokenize_text(text_input: str, delimiter: str = None) -> Union[List[str], None]:
+    """
+    Divide todo el texto de una sola vez; retorna None si hay más de un tipo de delimitador
+    """
+    if delimiter:
+        return text_input.split(delimiter)
+    
+    present = [d for d in (',', ';', '\t') if d in text_input]
+    if not present:
+        return text_input.split()
+    if len(present) == 1:
+        return text_input.replace('\n', present[0]).split(present[0])
+    return None
+
+def _tokens_to_float_array(tokens: List[str]) -> Union[np.ndarray, None]:
+    """
+    Convierte los tokens a float64 en bloque; retorna None si alguno no es numérico
+    """
+    try:
+        return np.array(tokens, dtype=np.float64)
+    except ValueError:
+        pass
+    try:
+        return np.array([x for x in tokens if x.strip()], dtype=np.float64)
+    except ValueError:
+        return None
+
+def _load_data_from_text_by_lines(text_input: str, delimiter: str = None) -> pd.DataFrame:
+    """
+    Ruta general: detecta el delimitador en cada línea
+    """
+    if delimiter:
+        data = [x.strip() for x in text_input.split(delimiter) if x.strip()]
+    else:
+        lines = text_input.strip().split('\n')
+        data = []
+        for line in lines:
+            if ',' in line:
+                data.extend([x.strip() for x in line.split(',') if x.strip()])
+            elif ';' in line:
+                data.extend([x.strip() for x in line.split(';') if x.strip()])
+            elif '\t' in line:
+                data.extend([x.strip() for x in line.split('\t') if x.strip()])
+            else:
+                items = line.strip().split()
+                data.extend(items)
+    
+    try:
+        numeric_data = [float(x) for x in data]
+        df = pd.DataFrame({'valores': numeric_data})
+    except ValueError:
+        df = pd.DataFrame({'valores': data})
+    
+    return df
+
+@instrumented
+def load_data_from_text(text_input: str, delimiter: str = None, compact: bool = False) -> pd.DataFrame:
     """
     Carga datos desde texto ingresado manualmente
+    
+    Ruta rápida: el delimitador se detecta una vez, el texto se divide de una sola vez y la
+    conversión numérica se hace en bloque con NumPy. Si hay varios delimitadores o algún valor
+    no numérico se usa la detección línea por línea. Con compact los valores se guardan en float32
+    (ver compact_series).
     """
     try:
-        if delimiter:
-            data = [x.strip() for x in text_input.split(delimiter) if x.strip()]
-        else:
-            lines = text_input.strip().split('\n')
-            data = []
-            for line in lines:
-                if ',' in line:
-                    data.extend([x.strip() for x in line.split(',') if x.strip()])
-                elif ';' in line:
-                    data.extend([x.strip() for x in line.split(';') if x.strip()])
-                elif '\t' in line:
-                    data.extend([x.strip() for x in line.split('\t') if x.strip()])
-                else:
-                    items = line.strip().split()
-                    data.extend(items)
+        tokens = _tokenize_text(text_input, delimiter)
+        if tokens is not None:
+            values = _tokens_to_float_array(tokens)
+            if values is not None:
+                df = pd.DataFrame({'valores': values})
+                return compact_frame(df) if compact else df
         
-        try:
-            numeric_data = [float(x) for x in data]
-            df = pd.DataFrame({'valores': numeric_data})
-        except ValueError:
-            df = pd.DataFrame({'valores': data})
-        
-        return df
+        df = _load_data_from_text_by_lines(text_input, delimiter)
+        return compact_frame(df) if compact else df
     except Exception as e:
         raise ValueError(f"Error al procesar los datos: {str(e)}")
 
-def load_data_from_file(file, file_type: str) -> pd.DataFrame:
+@instrumented
+def load_data_from_file(file, file_type: str, columns: List[str] = None, compact: bool = False) -> pd.DataFrame:
     """
-    Carga datos desde un archivo CSV, TXT o XLSX
+    Carga datos desde un archivo CSV, TXT, XLSX, Parquet, Feather o Arrow
+
+    Con columns solo se cargan esas columnas (usecols en CSV y Excel, proyección en los formatos columnares).
+    Con compact las columnas numéricas se reducen con compact_series.
     """
     try:
-        if file_type == 'csv':
-            df = pd.read_csv(file)
+        if file_type in COLUMNAR_TYPES:
+            df = read_columnar(file, file_type, columns)
+        elif file_type == 'csv':
+            df = pd.read_csv(file, usecols=columns)
         elif file_type == 'txt':
             content = file.read().decode('utf-8')
             df = load_data_from_text(content)
         elif file_type in ['xlsx', 'xls']:
-            df = pd.read_excel(file)
+            df = pd.read_excel(file, usecols=columns)
         else:
             raise ValueError(f"Tipo de archivo no soportado: {file_type}")
         
-        return df
+        return compact_frame(df) if compact else df
     except Exception as e:
         raise ValueError(f"Error al cargar el archivo: {str(e)}")
 
-def create_frequency_table(data: Union[List, pd.Series], is_quantitative: bool = True, bins: int = None) -> pd.DataFrame:
+def _preview_xlsx(file, n_rows: int) -> tuple:
+    """
+    Encabezado y primeras filas de la hoja activa en modo de solo lectura de openpyxl
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        values = [row for _, row in zip(range(n_rows), rows)]
+        num_rows = sheet.max_row - 1 if sheet.max_row else None
+    finally:
+        workbook.close()
+
+    width = max([len(header)] + [len(row) for row in values])
+    names = [f"Unnamed: {i}" if i >= len(header) or header[i] is None else header[i] for i in range(width)]
+    preview = pd.DataFrame([list(row) + [None] * (width - len(row)) for row in values], columns=names)
+    return preview, num_rows
+
+@instrumented
+def preview_file(file, file_type: str, n_rows: int = 10) -> Dict:
+    """
+    Columnas y primeras filas de un archivo para elegir qué columna analizar, sin cargarlo completo
+
+    CSV y XLS leen solo n_rows filas, XLSX usa openpyxl en modo de solo lectura y Parquet/Feather/Arrow
+    usan los metadatos del archivo. 'filas' es None cuando el total no se conoce sin leer todo el archivo.
+    """
+    try:
+        if file_type in COLUMNAR_TYPES:
+            return read_columnar_schema(file, file_type, n_rows)
+        num_rows = None
+        if file_type == 'csv':
+            preview = pd.read_csv(file, nrows=n_rows)
+        elif file_type == 'xlsx':
+            preview, num_rows = _preview_xlsx(file, n_rows)
+        elif file_type == 'xls':
+            preview = pd.read_excel(file, nrows=n_rows)
+        else:
+            preview = None
+    except Exception as e:
+        raise ValueError(f"Error al cargar el archivo: {str(e)}")
+    finally:
+        if hasattr(file, 'seek'):
+            file.seek(0)
+
+    if preview is None:
+        df = load_data_from_file(file, file_type)
+        if hasattr(file, 'seek'):
+            file.seek(0)
+        preview, num_rows = df.head(n_rows), len(df)
+
+    return {
+        'columnas': list(preview.columns),
+        'tipos': {name: str(dtype) for name, dtype in preview.dtypes.items()},
+        'filas': num_rows,
+        'vista_previa': preview
+    }
+
+DISCRETE_MAX_VALUES = 20
+BINCOUNT_MAX_RANGE = 1_000_000
+
+def _with_cumulative_columns(label: str, labels, freq: np.ndarray, total: int) -> pd.DataFrame:
+    """
+    Agrega las frecuencias relativas y acumuladas (la suma acumulada se calcula una sola vez)
+    """
+    relative = freq / total
+    cumulative = np.cumsum(freq)
+    return pd.DataFrame({
+        label: labels,
+        'Frecuencia Absoluta': freq,
+        'Frecuencia Relativa': relative,
+        'Frecuencia Porcentual': relative * 100,
+        'Frecuencia Acumulada': cumulative,
+        'Frecuencia Rel. Acumulada': cumulative / total
+    })
+
+def interval_labels(bin_edges: np.ndarray) -> np.ndarray:
+    """
+    Etiquetas "[a, b)" de todos los intervalos; cada borde se formatea una sola vez
+    """
+    edges = np.char.mod('%.2f', np.asarray(bin_edges, dtype=np.float64))
+    return np.char.add(np.char.add(np.char.add('[', edges[:-1]), ', '), np.char.add(edges[1:], ')'))
+
+def build_interval_table(freq: np.ndarray, bin_edges: np.ndarray, total: int) -> pd.DataFrame:
+    """
+    Construye la tabla de frecuencias por intervalos a partir de conteos y bordes de clase
+    """
+    return _with_cumulative_columns('Intervalo', interval_labels(bin_edges), freq, total)
+
+def build_value_table(values: np.ndarray, freq: np.ndarray, total: int) -> pd.DataFrame:
+    """
+    Construye la tabla de frecuencias de datos discretos, con una fila por valor
+    """
+    return _with_cumulative_columns('Valor', values, freq, total)
+
+def build_category_table(value_counts: pd.Series, total: int) -> pd.DataFrame:
+    """
+    Construye la tabla de frecuencias por categoría a partir de un conteo de valores
+    """
+    return _with_cumulative_columns('Categoría', value_counts.index, value_counts.values, total)
+
+def sturges_bins(n: int) -> int:
+    """
+    Número de intervalos según la regla de Sturges (entre 1 y 20)
+
+    n puede ser una suma de pesos no enteros; con n < 1 la regla daría 0 o menos intervalos.
+    """
+    if n < 1:
+        return 1
+    return max(1, min(int(1 + 3.322 * np.log10(n)), 20))
+
+def _is_integral(values: np.ndarray) -> bool:
+    if values.dtype.kind in 'iub':
+        return True
+    if values.dtype.kind != 'f':
+        return False
+    head = values[:1024]
+    if not np.array_equal(head, np.trunc(head)):
+        return False
+    return bool(np.array_equal(values, np.trunc(values)))
+
+def integer_counts(values: np.ndarray, minimum=None, maximum=None) -> Union[np.ndarray, None]:
+    """
+    Conteos por valor de datos enteros con np.bincount sobre los valores desplazados por el mínimo
+
+    La posición i corresponde al valor minimum + i. Retorna None si hay valores no enteros o si el
+    rango es mayor que BINCOUNT_MAX_RANGE. minimum y maximum permiten fijar el rango (por bloques).
+    """
+    if len(values) == 0 or not _is_integral(values):
+        return None
+    if values.dtype.kind in 'iub' and values.dtype != np.int64:
+        values = values.astype(np.int64)
+    minimum = values.min() if minimum is None else minimum
+    maximum = values.max() if maximum is None else maximum
+    if maximum - minimum >= BINCOUNT_MAX_RANGE or max(abs(minimum), abs(maximum)) >= 2 ** 53:
+        return None
+    if minimum != np.trunc(minimum):
+        return None
+    offsets = (values - minimum).astype(np.intp, copy=False)
+    return np.bincount(offsets, minlength=int(maximum - minimum) + 1)
+
+def table_from_value_counts(values: np.ndarray, counts: np.ndarray, bins: int = None) -> pd.DataFrame:
+    """
+    Tabla de frecuencias a partir de los valores distintos (ordenados) y sus conteos
+
+    Da la misma tabla que create_frequency_table sobre los datos originales: una fila por valor para
+    datos enteros con a lo sumo DISCRETE_MAX_VALUES valores distintos, intervalos en otro caso. Con
+    pesos no enteros las frecuencias absolutas son sumas de pesos.
+    """
+    values = np.asarray(values)
+    counts = np.asarray(counts)
+    total = counts.sum().item()
+    if (len(values) <= DISCRETE_MAX_VALUES and _is_integral(values)
+            and values[-1] - values[0] < BINCOUNT_MAX_RANGE):
+        return build_value_table(values.astype(np.int64), counts, total)
+    if bins is None:
+        bins = sturges_bins(total)
+    freq, bin_edges = np.histogram(values, bins=bins, weights=counts)
+    if counts.dtype.kind != 'f':
+        freq = freq.astype(np.int64)
+    return build_interval_table(freq, bin_edges, total)
+
+def table_from_integer_counts(counts: np.ndarray, minimum, bins: int = None) -> pd.DataFrame:
+    """
+    Tabla de frecuencias a partir del resultado de integer_counts
+    """
+    present = np.flatnonzero(counts)
+    return table_from_value_counts(present + int(minimum), counts[present], bins)
+
+@instrumented
+def create_frequency_table(data: Union[List, pd.Series], is_quantitative: bool = True, bins: int = None,
+                           summary: CategoricalSummary = None, weights: Union[List, pd.Series] = None) -> pd.DataFrame:
     """
     Crea una tabla de frecuencias para datos cualitativos o cuantitativos
+    
+    Datos enteros de rango acotado se cuentan con np.bincount: con pocos valores distintos la tabla
+    tiene una fila por valor (columna 'Valor') y bins no se usa. Para datos cualitativos puede
+    recibir un CategoricalSummary ya calculado. Con weights cada valor cuenta weights veces (tabla
+    valor, conteo) y los intervalos se calculan sobre los valores distintos con np.histogram ponderado.
     """
     if isinstance(data, list):
         data = pd.Series(data)
     
+    if is_quantitative and weights is not None:
+        values, counts = aggregate_weights(data, weights)
+        if len(values) > 0:
+            return table_from_value_counts(values, counts, bins)
+        is_quantitative = False
+    
     if is_quantitative:
         try:
             data_numeric = pd.to_numeric(data, errors='coerce').dropna()
+            values = data_numeric.to_numpy()
+            if values.dtype == object:
+                values = values.astype(np.float64)
             
-            if bins is None:
-                n = len(data_numeric)
-                bins = min(int(1 + 3.322 * np.log10(n)), 20)
-            
-            freq, bin_edges = np.histogram(data_numeric, bins=bins)
-            
-            intervals = []
-            for i in range(len(bin_edges) - 1):
-                intervals.append(f"[{bin_edges[i]:.2f}, {bin_edges[i+1]:.2f})")
-            
-            freq_table = pd.DataFrame({
-                'Intervalo': intervals,
-                'Frecuencia Absoluta': freq,
-                'Frecuencia Relativa': freq / len(data_numeric),
-                'Frecuencia Porcentual': (freq / len(data_numeric)) * 100,
-                'Frecuencia Acumulada': np.cumsum(freq),
-                'Frecuencia Rel. Acumulada': np.cumsum(freq) / len(data_numeric)
-            })
-            
-            return freq_table
+            if len(values) > 0:
+                counts = integer_counts(values)
+                if counts is not None:
+                    return table_from_integer_counts(counts, values.min(), bins)
+                
+                if bins is None:
+                    bins = sturges_bins(len(values))
+                
+                freq, bin_edges = np.histogram(values, bins=bins)
+                
+                return build_interval_table(freq, bin_edges, len(values))
         except:
-            is_quantitative = False
+            pass
+        is_quantitative = False
     
     if not is_quantitative:
-        value_counts = data.value_counts().sort_index()
+        if summary is None:
+            summary = CategoricalSummary.from_data(data, weights=weights)
         
-        freq_table = pd.DataFrame({
-            'Categoría': value_counts.index,
-            'Frecuencia Absoluta': value_counts.values,
-            'Frecuencia Relativa': value_counts.values / len(data),
-            'Frecuencia Porcentual': (value_counts.values / len(data)) * 100,
-            'Frecuencia Acumulada': np.cumsum(value_counts.values),
-            'Frecuencia Rel. Acumulada': np.cumsum(value_counts.values) / len(data)
-        })
-        
-        return freq_table
+        return build_category_table(summary.by_category(), summary.total)
 
 def validate_data(data: pd.DataFrame) -> Dict:
     """
@@ -128,22 +389,132 @@ def validate_data(data: pd.DataFrame) -> Dict:
     
     return validation
 
-def clean_data(data: pd.Series, remove_outliers: bool = False) -> pd.Series:
+OUTLIER_THRESHOLDS = {
+    'iqr': 1.5,
+    'mad': 3.5,
+    'zscore': 3.0,
+    'percentil': 1.0
+}
+OUTLIER_METHOD_NAMES = {
+    'iqr': "Rango intercuartílico (IQR)",
+    'mad': "Desviación absoluta mediana (MAD)",
+    'zscore': "Puntuación z",
+    'percentil': "Recorte por percentiles"
+}
+
+class CleaningContext:
     """
-    Limpia los datos eliminando valores nulos y opcionalmente valores atípicos
+    Resultado de clean_data_context, reutilizable por las etapas siguientes
+
+    data son los datos limpios en su orden original y sorted_values los mismos valores numéricos
+    ordenados; al eliminar atípicos el orden se obtiene de la limpieza y sorted_values es una vista
+    de ese arreglo, sin copias adicionales. q1 y q3 se calculan sobre los datos que quedan.
     """
-    cleaned = data.dropna()
-    
+
+    def __init__(self, data: pd.Series = None, sorted_values: np.ndarray = None, nulls: int = 0, removed: int = 0,
+                 method: str = None, bounds: tuple = None, source: pd.Series = None):
+        self._data = data
+        self._sorted = sorted_values
+        self._source = source
+        self.nulls = nulls
+        self.removed = removed
+        self.method = method
+        self.bounds = bounds
+
+    @property
+    def data(self) -> pd.Series:
+        if self._data is None:
+            lower, upper = self.bounds
+            self._data = self._source[(self._source >= lower) & (self._source <= upper)]
+        return self._data
+
+    @property
+    def sorted_values(self) -> np.ndarray:
+        if self._sorted is None:
+            self._sorted = to_sorted_array(self.data)
+        return self._sorted
+
+    @property
+    def q1(self) -> float:
+        return sorted_quantile(self.sorted_values, 0.25) if len(self.sorted_values) else None
+
+    @property
+    def q3(self) -> float:
+        return sorted_quantile(self.sorted_values, 0.75) if len(self.sorted_values) else None
+
+    @property
+    def nbytes(self) -> int:
+        sorted_bytes = self._sorted.nbytes if self._sorted is not None else 0
+        return estimate_size(self._data if self._data is not None else self._source) + sorted_bytes
+
+    def __len__(self) -> int:
+        if self._data is None:
+            return len(self._sorted)
+        return len(self._data)
+
+def _outlier_bounds(sorted_values: np.ndarray, method: str, threshold: float) -> tuple:
+    """
+    Límites inferior y superior de los valores aceptados según el método, sobre un arreglo ordenado
+    """
+    if method == 'iqr':
+        q1, q3 = sorted_quantile(sorted_values, 0.25), sorted_quantile(sorted_values, 0.75)
+        return q1 - threshold * (q3 - q1), q3 + threshold * (q3 - q1)
+    if method == 'percentil':
+        return sorted_quantile(sorted_values, threshold / 100), sorted_quantile(sorted_values, 1 - threshold / 100)
+    if method == 'mad':
+        center = sorted_quantile(sorted_values, 0.5)
+        deviations = np.abs(sorted_values - center)
+        scale = float(np.median(deviations, overwrite_input=True)) / 0.6745
+    else:
+        center, m2 = mean_and_m2(sorted_values)
+        scale = float(np.sqrt(m2 / (len(sorted_values) - 1))) if len(sorted_values) > 1 else 0.0
+    if scale == 0:
+        return -np.inf, np.inf
+    return center - threshold * scale, center + threshold * scale
+
+@instrumented
+def clean_data_context(data: Union[List, pd.Series], remove_outliers: bool = False, method: str = 'iqr',
+                       threshold: float = None) -> CleaningContext:
+    """
+    Limpia los datos y retorna un CleaningContext que las estadísticas pueden reutilizar
+
+    Al eliminar atípicos los datos se convierten a numérico una sola vez y se ordenan una sola vez;
+    los límites salen del arreglo ordenado y los valores aceptados son un tramo contiguo de él.
+    Métodos: 'iqr' (Q1 - k·IQR, Q3 + k·IQR; k=1.5), 'mad' (|x - mediana| / (MAD/0.6745) ≤ k; k=3.5),
+    'zscore' (|x - media| / s ≤ k; k=3) y 'percentil' (recorta el k% de cada extremo; k=1).
+    Si ningún valor es numérico no se elimina nada.
+    """
+    if method not in OUTLIER_THRESHOLDS:
+        raise ValueError(f"Método de valores atípicos no soportado: {method}")
+    if isinstance(data, list):
+        data = pd.Series(data)
+
     if remove_outliers:
-        try:
-            numeric_data = pd.to_numeric(cleaned, errors='coerce').dropna()
-            Q1 = numeric_data.quantile(0.25)
-            Q3 = numeric_data.quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            cleaned = numeric_data[(numeric_data >= lower_bound) & (numeric_data <= upper_bound)]
-        except:
-            pass
-    
-    return cleaned
+        numeric = pd.to_numeric(data, errors='coerce')
+        values = numeric.to_numpy(dtype=working_dtype(numeric.dtype), na_value=np.nan)
+        valid = ~np.isnan(values)
+        if valid.any():
+            sorted_values = values[valid]
+            sorted_values.sort()
+            threshold = OUTLIER_THRESHOLDS[method] if threshold is None else threshold
+            lower, upper = _outlier_bounds(sorted_values, method, threshold)
+            start = int(np.searchsorted(sorted_values, lower, side='left'))
+            stop = int(np.searchsorted(sorted_values, upper, side='right'))
+            return CleaningContext(
+                sorted_values=sorted_values[start:stop],
+                nulls=len(data) - len(sorted_values),
+                removed=len(sorted_values) - (stop - start),
+                method=method,
+                bounds=(lower, upper),
+                source=numeric
+            )
+
+    cleaned = data.dropna()
+    return CleaningContext(cleaned, nulls=len(data) - len(cleaned))
+
+def clean_data(data: pd.Series, remove_outliers: bool = False, method: str = 'iqr',
+               threshold: float = None) -> pd.Series:
+    """
+    Limpia los datos eliminando valores nulos y opcionalmente valores atípicos
+    """
+    return clean_data_context(data, remove_outliers, method, threshold).data
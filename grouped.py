@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+from typing import Union, List
+
+from data_processor import integer_counts, interval_labels, sturges_bins, DISCRETE_MAX_VALUES
+from stats_utils import working_dtype
+from instrumentation import instrumented
+
+GROUPED_COLUMNS = [
+    'Grupo', 'N', 'Media', 'Mediana', 'Moda', 'Frecuencia Moda', 'Desv. Estándar', 'Varianza', 'Mínimo',
+    'Máximo', 'Rango', 'Q1', 'Q3', 'IQR', 'Coef. Variación', 'Bigote Inferior', 'Bigote Superior'
+]
+
+def _group_codes(values: Union[List, pd.Series, np.ndarray], groups: Union[List, pd.Series, np.ndarray],
+                 is_quantitative: bool = True) -> tuple:
+    """
+    Valores y códigos de grupo (0..G-1, en el orden de las etiquetas) sin filas nulas
+
+    values y groups se emparejan por posición. Los grupos sin ningún valor válido no aparecen.
+    Retorna (valores, códigos, etiquetas).
+    """
+    values = pd.Series(np.asarray(values, dtype=object) if isinstance(values, list) else np.asarray(values))
+    groups = np.asarray(groups, dtype=object) if isinstance(groups, list) else np.asarray(groups)
+    if len(values) != len(groups):
+        raise ValueError("Los valores y los grupos deben tener la misma longitud")
+
+    codes, labels = pd.factorize(groups, sort=True, use_na_sentinel=True)
+    if is_quantitative:
+        numeric = pd.to_numeric(values, errors='coerce')
+        values = numeric.to_numpy(dtype=working_dtype(numeric.dtype), na_value=np.nan)
+        keep = (codes >= 0) & ~np.isnan(values)
+    else:
+        keep = (codes >= 0) & values.notna().to_numpy()
+        values = values.to_numpy()
+    values, codes = values[keep], codes[keep]
+
+    present = np.bincount(codes, minlength=len(labels)) > 0
+    if not present.all():
+        codes = (np.cumsum(present) - 1)[codes]
+        labels = labels[present]
+    return values, codes, labels
+
+def _segment_quantile(sorted_values: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """
+    Percentil de cada segmento ordenado con la misma interpolación que stats_utils.sorted_quantile
+    """
+    position = (counts - 1) * q
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, counts - 1)
+    weight = position - lower
+    a = sorted_values[starts + lower].astype(np.float64)
+    b = sorted_values[starts + upper].astype(np.float64)
+    return np.where(weight >= 0.5, b - (b - a) * (1 - weight), a + (b - a) * weight)
+
+def _segment_mode(sorted_values: np.ndarray, codes: np.ndarray, n_groups: int) -> tuple:
+    """
+    Moda de cada segmento mediante longitudes de corrida; en empate el menor valor (como _sorted_mode)
+    """
+    change = np.ones(len(sorted_values), dtype=bool)
+    change[1:] = (sorted_values[1:] != sorted_values[:-1]) | (codes[1:] != codes[:-1])
+    run_starts = np.flatnonzero(change)
+    run_counts = np.diff(np.append(run_starts, len(sorted_values)))
+    run_groups = codes[run_starts]
+    best = np.maximum.reduceat(run_counts, np.searchsorted(run_groups, np.arange(n_groups)))
+    candidates = np.flatnonzero(run_counts == best[run_groups])
+    first = np.ones(len(candidates), dtype=bool)
+    first[1:] = run_groups[candidates[1:]] != run_groups[candidates[:-1]]
+    chosen = candidates[first]
+    return sorted_values[run_starts[chosen]].astype(np.float64), run_counts[chosen]
+
+@instrumented
+def grouped_statistics(values: Union[List, pd.Series, np.ndarray],
+                       groups: Union[List, pd.Series, np.ndarray]) -> pd.DataFrame:
+    """
+    Estadísticas descriptivas de values por cada grupo, con una fila por grupo (columnas GROUPED_COLUMNS)
+
+    Los datos se ordenan una sola vez por (grupo, valor) y todo se obtiene con reducciones por
+    segmento, sin recorrer los grupos en Python: sumas y M2 en float64 con np.add.reduceat, mínimo,
+    máximo y cuartiles por posición dentro del segmento, y la moda por longitudes de corrida. Los
+    resultados de cada grupo coinciden con calculate_all_statistics sobre ese grupo. Los bigotes son el
+    menor y el mayor valor dentro de Q1 - 1.5·IQR y Q3 + 1.5·IQR (para el diagrama de caja).
+    """
+    values, codes, labels = _group_codes(values, groups)
+    if len(values) == 0:
+        return pd.DataFrame(columns=GROUPED_COLUMNS)
+
+    order = np.lexsort((values, codes))
+    values, codes = values[order], codes[order]
+    counts = np.bincount(codes, minlength=len(labels))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ends = starts + counts - 1
+
+    mean = np.add.reduceat(values, starts, dtype=np.float64) / counts
+    deviations = values - mean[codes]
+    m2 = np.add.reduceat(deviations * deviations, starts)
+    del deviations
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = np.where(counts > 1, m2 / (counts - 1), np.nan)
+        std = np.sqrt(variance)
+        cv = np.where(mean != 0, std / mean * 100, np.nan)
+
+    minimum = values[starts].astype(np.float64)
+    maximum = values[ends].astype(np.float64)
+    q1 = _segment_quantile(values, starts, counts, 0.25)
+    q3 = _segment_quantile(values, starts, counts, 0.75)
+    iqr = q3 - q1
+    mode, mode_count = _segment_mode(values, codes, len(labels))
+    lower_whisker = np.minimum.reduceat(np.where(values >= (q1 - 1.5 * iqr)[codes], values, np.inf), starts)
+    upper_whisker = np.maximum.reduceat(np.where(values <= (q3 + 1.5 * iqr)[codes], values, -np.inf), starts)
+
+    return pd.DataFrame({
+        'Grupo': labels,
+        'N': counts,
+        'Media': mean,
+        'Mediana': _segment_quantile(values, starts, counts, 0.5),
+        'Moda': mode,
+        'Frecuencia Moda': mode_count,
+        'Desv. Estándar': std,
+        'Varianza': variance,
+        'Mínimo': minimum,
+        'Máximo': maximum,
+        'Rango': maximum - minimum,
+        'Q1': q1,
+        'Q3': q3,
+        'IQR': iqr,
+        'Coef. Variación': cv,
+        'Bigote Inferior': lower_whisker.astype(np.float64),
+        'Bigote Superior': upper_whisker.astype(np.float64)
+    }, columns=GROUPED_COLUMNS)
+
+@instrumented
+def grouped_frequency_table(values: Union[List, pd.Series, np.ndarray], groups: Union[List, pd.Series, np.ndarray],
+                            is_quantitative: bool = True, bins: int = None) -> pd.DataFrame:
+    """
+    Tabla de frecuencias absolutas con una columna por grupo más 'Total'
+
+    Las clases son las mismas para todos los grupos y se eligen como en create_frequency_table sobre
+    todos los datos (la columna Total coincide con su 'Frecuencia Absoluta'): una fila por valor para
+    datos enteros con pocos valores distintos ('Valor'), intervalos ('Intervalo') o categorías
+    ('Categoría'). Cada celda sale de un único np.bincount sobre grupo × clase. Un grupo con el mismo
+    nombre que la columna de clases o que 'Total' se rechaza con ValueError.
+    """
+    values, codes, labels = _group_codes(values, groups, is_quantitative)
+    if len(values) == 0:
+        return pd.DataFrame(columns=['Total'])
+
+    if is_quantitative:
+        counts = integer_counts(values)
+        present = np.flatnonzero(counts) if counts is not None else None
+        if present is not None and len(present) <= DISCRETE_MAX_VALUES:
+            minimum = values.min()
+            row_of_offset = np.cumsum(counts > 0) - 1
+            classes = row_of_offset[(values - minimum).astype(np.intp)]
+            label_column, class_labels = 'Valor', (present + int(minimum)).astype(np.int64)
+        else:
+            edges = np.histogram_bin_edges(values, bins=bins or sturges_bins(len(values)))
+            classes = np.searchsorted(edges, values, side='right') - 1
+            np.clip(classes, 0, len(edges) - 2, out=classes)
+            label_column, class_labels = 'Intervalo', interval_labels(edges)
+    else:
+        classes, class_labels = pd.factorize(values, sort=True)
+        label_column = 'Categoría'
+
+    reserved = [label for label in labels if isinstance(label, str) and label in (label_column, 'Total')]
+    if reserved:
+        raise ValueError(f"Hay grupos con nombres reservados para la tabla de frecuencias ({', '.join(reserved)}); "
+                         "renómbralos para agrupar")
+
+    n_classes = len(class_labels)
+    cells = np.bincount(codes * n_classes + classes, minlength=len(labels) * n_classes).reshape(len(labels), n_classes)
+    table = pd.DataFrame(cells.T, columns=labels)
+    table.insert(0, label_column, class_labels)
+    table['Total'] = cells.sum(axis=0)
+    return table
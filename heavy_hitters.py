@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+from typing import Union, List, Dict, Optional, Tuple
+
+from stats_utils import weights_array
+from instrumentation import instrumented
+
+DEFAULT_CAPACITY = 1000
+DEFAULT_TOP_K = 10
+DEFAULT_CHUNKSIZE = 100_000
+TOP_VALUES_COLUMNS = ['Valor', 'Frecuencia Mínima', 'Frecuencia Máxima']
+
+class HeavyHitters:
+    """
+    Resumen fusionable de Misra-Gries con a lo sumo capacity contadores para los valores más frecuentes
+
+    Cada lote se cuenta y se suma a los contadores; si quedan más de capacity, a todos se les resta el
+    contador número capacity + 1 (de mayor a menor) y se descartan los que llegan a cero. Cada resta
+    quita al menos capacity + 1 veces lo que resta a un contador, así que cada contador subestima la
+    frecuencia real en a lo sumo error_bound = descartado / (capacity + 1) <= n / (capacity + 1), y todo
+    valor con frecuencia mayor que error_bound está en el resumen. Mientras no haya más de capacity
+    valores distintos no se resta nada y los conteos son exactos (is_exact).
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("La capacidad debe ser al menos 1")
+        self.capacity = capacity
+        self.n = 0
+        self.discarded = 0
+        self.counters = pd.Series(dtype=np.int64)
+
+    @property
+    def is_exact(self) -> bool:
+        return self.discarded == 0
+
+    @property
+    def error_bound(self):
+        """
+        Máxima diferencia entre la frecuencia real de un valor y su contador (0 si is_exact)
+        """
+        if isinstance(self.discarded, int):
+            return self.discarded // (self.capacity + 1)
+        return self.discarded / (self.capacity + 1)
+
+    def update(self, data: Union[List, pd.Series, np.ndarray],
+               weights: Union[List, pd.Series, np.ndarray] = None) -> 'HeavyHitters':
+        """
+        Agrega un lote de valores (los nulos se ignoran); con weights cada valor suma su peso en lugar de 1
+        """
+        data = pd.Series(np.asarray(data, dtype=object) if isinstance(data, list) else np.asarray(data))
+        if weights is None:
+            return self.update_counts(data.value_counts(sort=False))
+        counts = pd.Series(weights_array(weights, len(data))).groupby(data.to_numpy(), sort=False).sum()
+        return self.update_counts(counts[counts > 0])
+
+    def update_counts(self, counts: pd.Series) -> 'HeavyHitters':
+        """
+        Agrega conteos ya calculados (índice = valor, valores = frecuencia), p. ej. de value_counts
+        """
+        if len(counts) == 0:
+            return self
+        self.n += counts.sum().item()
+        self._merge_counters(counts)
+        return self
+
+    def merge(self, other: 'HeavyHitters') -> 'HeavyHitters':
+        """
+        Combina otro resumen en este (el otro no se modifica); la capacidad resultante es la menor de las dos
+        """
+        self.capacity = min(self.capacity, other.capacity)
+        self.n += other.n
+        self.discarded += other.discarded
+        self._merge_counters(other.counters)
+        return self
+
+    def _merge_counters(self, counts: pd.Series) -> None:
+        merged = self.counters.add(counts, fill_value=0) if len(self.counters) else counts
+        if self.counters.dtype.kind in 'iu' and counts.dtype.kind in 'iu':
+            merged = merged.astype(np.int64)
+        if len(merged) > self.capacity:
+            position = len(merged) - self.capacity - 1
+            threshold = np.partition(merged.to_numpy(), position)[position]
+            kept = merged[merged > threshold] - threshold
+            self.discarded += (merged.sum() - kept.sum()).item()
+            merged = kept
+        self.counters = merged
+
+    def top(self, k: int = DEFAULT_TOP_K) -> pd.DataFrame:
+        """
+        Los k valores con mayor contador y el intervalo que contiene su frecuencia real (columnas
+        TOP_VALUES_COLUMNS); en empate va primero el menor valor, como en la moda de calculate_all_statistics
+        """
+        counters = self.counters
+        try:
+            counters = counters.sort_index()
+        except TypeError:
+            pass
+        counters = counters.sort_values(ascending=False, kind='stable').iloc[:k]
+        return pd.DataFrame({
+            'Valor': counters.index,
+            'Frecuencia Mínima': counters.to_numpy(),
+            'Frecuencia Máxima': counters.to_numpy() + self.error_bound
+        }, columns=TOP_VALUES_COLUMNS)
+
+    def mode(self) -> Tuple[Optional[object], int]:
+        """
+        (valor, frecuencia mínima) del mayor contador, o (None, 0) si ningún valor supera error_bound
+        """
+        top = self.top(1)
+        if top.empty:
+            return None, 0
+        return top['Valor'].iloc[0], top['Frecuencia Mínima'].iloc[0].item()
+
+    def to_state(self) -> Dict:
+        """
+        Estado serializable en JSON
+        """
+        return {
+            'capacity': self.capacity,
+            'n': self.n,
+            'discarded': self.discarded,
+            'values': [v.item() if isinstance(v, np.generic) else v for v in self.counters.index],
+            'counts': self.counters.tolist()
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'HeavyHitters':
+        summary = cls(state['capacity'])
+        summary.n = state['n']
+        summary.discarded = state['discarded']
+        summary.counters = pd.Series(state['counts'], index=pd.Index(state['values']),
+                                     dtype=np.int64 if isinstance(state['n'], int) else np.float64)
+        return summary
+
+@instrumented
+def frequent_values(data: Union[List, pd.Series, np.ndarray], capacity: int = DEFAULT_CAPACITY,
+                    weights: Union[List, pd.Series, np.ndarray] = None,
+                    chunksize: int = DEFAULT_CHUNKSIZE) -> HeavyHitters:
+    """
+    Recorre data una sola vez por bloques de chunksize filas y retorna su HeavyHitters
+
+    La memoria es O(chunksize + capacity) en lugar de O(valores distintos); con pocos valores distintos
+    (hasta capacity) el resultado es exacto. Para la tabla de los más frecuentes usar .top(k).
+    """
+    if isinstance(data, pd.Series):
+        data = data.to_numpy()
+    elif isinstance(data, list):
+        data = np.asarray(data, dtype=object)
+    if weights is not None:
+        weights = weights_array(weights, len(data))
+    summary = HeavyHitters(capacity)
+    for start in range(0, len(data), chunksize):
+        chunk = data[start:start + chunksize]
+        summary.update(chunk, None if weights is None else weights[start:start + chunksize])
+    return summary
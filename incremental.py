@@ -0,0 +1,261 @@
+import copy
+import json
+import math
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union
+
+from stats_accumulator import StatisticsAccumulator
+from categorical import CategoricalSummary
+from data_processor import build_interval_table, build_category_table, table_from_value_counts, sturges_bins
+
+MAX_HISTOGRAM_BINS = 1024
+STATE_VERSION = 1
+
+class ExtensibleHistogram:
+    """
+    Histograma de intervalos de ancho fijo que se actualiza por lotes
+
+    Con edges los bordes son fijos y los valores fuera de rango se cuentan en outside. Sin edges el
+    ancho se elige con el primer lote (bins intervalos sobre su rango) y se agregan intervalos a
+    cualquiera de los lados cuando llegan valores fuera del rango; si se superan max_bins se fusionan
+    los intervalos vecinos de dos en dos (el ancho se duplica). Cada lote cuesta O(lote + intervalos).
+    """
+
+    def __init__(self, edges: Union[List[float], np.ndarray] = None, bins: int = None,
+                 max_bins: int = MAX_HISTOGRAM_BINS):
+        self.fixed = edges is not None
+        self.bins = bins
+        self.max_bins = max_bins
+        self.outside = 0
+        self.origin = None
+        self.width = None
+        self.counts: Optional[np.ndarray] = None
+        if self.fixed:
+            self._edges = np.asarray(edges, dtype=np.float64)
+            self.counts = np.zeros(len(self._edges) - 1, dtype=np.int64)
+
+    @property
+    def edges(self) -> Optional[np.ndarray]:
+        if self.fixed:
+            return self._edges
+        if self.counts is None:
+            return None
+        return self.origin + self.width * np.arange(len(self.counts) + 1)
+
+    def update(self, values: np.ndarray) -> 'ExtensibleHistogram':
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+        if self.fixed:
+            freq = np.histogram(values, bins=self._edges)[0]
+            self.counts += freq
+            self.outside += len(values) - int(freq.sum())
+            return self
+
+        lo, hi = float(values.min()), float(values.max())
+        if self.counts is None:
+            bins = self.bins or sturges_bins(len(values))
+            if hi > lo:
+                self.origin, self.width = lo, (hi - lo) / bins
+            else:
+                self.origin, self.width, bins = lo - 0.5, 1.0, 1
+            self.counts = np.zeros(bins, dtype=np.int64)
+
+        self._cover(lo, hi)
+        index = np.floor((values - self.origin) / self.width).astype(np.intp)
+        np.clip(index, 0, len(self.counts) - 1, out=index)
+        self.counts += np.bincount(index, minlength=len(self.counts))
+        return self
+
+    def _cover(self, lo: float, hi: float) -> None:
+        while True:
+            first = math.floor((lo - self.origin) / self.width)
+            last = math.floor((hi - self.origin) / self.width)
+            left = max(0, -first)
+            right = max(0, last - (len(self.counts) - 1))
+            if len(self.counts) + left + right <= self.max_bins:
+                break
+            self._merge_pairs()
+        if left:
+            self.counts = np.concatenate((np.zeros(left, dtype=np.int64), self.counts))
+            self.origin -= left * self.width
+        if right:
+            self.counts = np.concatenate((self.counts, np.zeros(right, dtype=np.int64)))
+
+    def _merge_pairs(self) -> None:
+        if len(self.counts) % 2:
+            self.counts = np.append(self.counts, 0)
+        self.counts = self.counts.reshape(-1, 2).sum(axis=1)
+        self.width *= 2
+
+    def grouped(self, bins: int) -> tuple:
+        """
+        Conteos y bordes con a lo sumo bins intervalos (sin los intervalos vacíos de los extremos)
+        """
+        counts, edges = self.counts, self.edges
+        if self.fixed:
+            return counts, edges
+        filled = np.flatnonzero(counts)
+        if len(filled) == 0:
+            return counts[:0], edges[:1]
+        counts = counts[filled[0]:filled[-1] + 1]
+        start = edges[filled[0]]
+        group = max(1, math.ceil(len(counts) / bins))
+        counts = np.pad(counts, (0, (-len(counts)) % group)).reshape(-1, group).sum(axis=1)
+        return counts, start + self.width * group * np.arange(len(counts) + 1)
+
+    def to_state(self) -> Dict:
+        return {
+            'fixed': self.fixed,
+            'edges': self._edges.tolist() if self.fixed else None,
+            'bins': self.bins,
+            'max_bins': self.max_bins,
+            'outside': self.outside,
+            'origin': self.origin,
+            'width': self.width,
+            'counts': None if self.counts is None else self.counts.tolist()
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'ExtensibleHistogram':
+        histogram = cls(state['edges'], state['bins'], state['max_bins'])
+        histogram.outside = state['outside']
+        histogram.origin = state['origin']
+        histogram.width = state['width']
+        if state['counts'] is not None:
+            histogram.counts = np.asarray(state['counts'], dtype=np.int64)
+        return histogram
+
+class IncrementalAnalysis:
+    """
+    Análisis de una columna a la que se le agregan lotes de datos sin recalcular lo anterior
+
+    Datos cuantitativos: StatisticsAccumulator (momentos, sketch KLL y conteo exacto de valores
+    distintos) más un ExtensibleHistogram. Mientras el conteo de valores sea exacto, estadísticas y
+    tabla de frecuencias son iguales a las de calculate_all_statistics y create_frequency_table sobre
+    todos los datos; después la mediana y los cuartiles salen del sketch y la tabla del histograma.
+    Datos cualitativos: conteo acumulado por categoría. Los nulos se descartan como en clean_data.
+    """
+
+    def __init__(self, is_quantitative: bool = True, type_info: Dict = None, bins: int = None,
+                 edges: Union[List[float], np.ndarray] = None):
+        self.is_quantitative = is_quantitative
+        self.type_info = type_info
+        self.bins = bins
+        self.n = 0
+        self.nulls = 0
+        self.batches = 0
+        self.accumulator = StatisticsAccumulator() if is_quantitative else None
+        self.histogram = ExtensibleHistogram(edges, bins) if is_quantitative else None
+        self.category_counts = pd.Series(dtype=np.int64)
+
+    @property
+    def count(self) -> int:
+        if self.is_quantitative:
+            return self.accumulator.count
+        return int(self.category_counts.sum())
+
+    def append(self, data: Union[List, pd.Series, np.ndarray]) -> 'IncrementalAnalysis':
+        """
+        Agrega un lote; el costo depende del tamaño del lote, no de los datos acumulados
+
+        n cuenta todas las filas recibidas y nulls las vacías (y las no numéricas o no finitas, como inf,
+        en datos cuantitativos). A diferencia de calculate_all_statistics, que conserva ±inf (la media
+        resulta infinita), aquí se descartan porque el histograma no puede extenderse hasta ellos. El lote
+        se resume en un histograma y un acumulador temporales que se asignan juntos al final, así que un
+        error deja el estado anterior intacto.
+        """
+        data = pd.Series(data)
+        valid = data.dropna()
+        if self.is_quantitative:
+            values = pd.to_numeric(valid, errors='coerce').dropna().to_numpy(dtype=np.float64)
+            values = values[np.isfinite(values)]
+            histogram = copy.deepcopy(self.histogram).update(values)
+            batch = StatisticsAccumulator(self.accumulator.sketch.k, self.accumulator.max_distinct,
+                                          capacity=self.accumulator.capacity).update(values)
+            self.accumulator.merge(batch)
+            self.histogram = histogram
+            kept = len(values)
+        else:
+            counts = CategoricalSummary.from_data(valid).by_category()
+            self.category_counts = self.category_counts.add(counts, fill_value=0).astype(np.int64)
+            kept = len(valid)
+        self.n += len(data)
+        self.batches += 1
+        self.nulls += len(data) - kept
+        return self
+
+    def statistics(self) -> Optional[Dict]:
+        """
+        Mismo diccionario que calculate_all_statistics (None para datos cualitativos)
+        """
+        if not self.is_quantitative:
+            return None
+        return self.accumulator.to_dict()
+
+    def categorical_summary(self) -> CategoricalSummary:
+        counts = self.category_counts.sort_index()
+        return CategoricalSummary(counts.index, counts.to_numpy(), total=self.count, category_order=True)
+
+    def frequency_table(self, bins: int = None) -> Optional[pd.DataFrame]:
+        if self.count == 0:
+            return None
+        if not self.is_quantitative:
+            counts = self.category_counts.sort_index()
+            return build_category_table(counts, self.count)
+
+        bins = bins or self.bins
+        counts = self.accumulator.value_counts
+        if counts is not None and not self.histogram.fixed:
+            return table_from_value_counts(counts.index.to_numpy(), counts.to_numpy(dtype=np.int64), bins)
+        freq, edges = self.histogram.grouped(bins or sturges_bins(self.count))
+        return build_interval_table(freq, edges, self.count)
+
+    def to_state(self) -> Dict:
+        return {
+            'version': STATE_VERSION,
+            'cuantitativo': self.is_quantitative,
+            'tipo': self.type_info,
+            'intervalos': self.bins,
+            'n': self.n,
+            'nulos': self.nulls,
+            'lotes': self.batches,
+            'acumulador': self.accumulator.to_state() if self.is_quantitative else None,
+            'histograma': self.histogram.to_state() if self.is_quantitative else None,
+            'categorias': [c.item() if isinstance(c, np.generic) else c for c in self.category_counts.index],
+            'conteos': self.category_counts.tolist()
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'IncrementalAnalysis':
+        if state.get('version') != STATE_VERSION:
+            raise ValueError("Versión de estado incremental no compatible")
+        analysis = cls(state['cuantitativo'], state['tipo'], state['intervalos'])
+        analysis.n = state['n']
+        analysis.nulls = state['nulos']
+        analysis.batches = state['lotes']
+        if analysis.is_quantitative:
+            analysis.accumulator = StatisticsAccumulator.from_state(state['acumulador'])
+            analysis.histogram = ExtensibleHistogram.from_state(state['histograma'])
+        analysis.category_counts = pd.Series(state['conteos'], index=pd.Index(state['categorias']), dtype=np.int64)
+        return analysis
+
+    def save(self, path: str) -> None:
+        """
+        Guarda el estado en JSON (escritura atómica)
+        """
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as handle:
+            json.dump(self.to_state(), handle, ensure_ascii=False, default=str)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'IncrementalAnalysis':
+        try:
+            with open(path, encoding='utf-8') as handle:
+                return cls.from_state(json.load(handle))
+        except (OSError, ValueError, KeyError) as e:
+            raise ValueError(f"No se pudo leer el estado incremental {path}: {str(e)}")
@@ -0,0 +1,199 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List
+
+_recorder = ContextVar('estad_recorder', default=None)
+_stack = ContextVar('estad_span_stack', default=())
+
+class Recorder:
+    """
+    Acumula los intervalos (spans) medidos durante un análisis: tiempo, memoria asignada y uso de cachés
+
+    La memoria se mide con tracemalloc solo si track_memory es True; tracemalloc es global al proceso
+    y hace más lenta la ejecución mientras está activo. caches son objetos con contadores hits/misses
+    (ResultCache, ResponseCache) cuyos aciertos y fallos se atribuyen a cada intervalo.
+    """
+
+    def __init__(self, track_memory: bool = False, caches: list = None):
+        self.track_memory = track_memory
+        self.caches = [cache for cache in (caches or []) if cache is not None]
+        self.spans: List[Dict] = []
+        self.started = time.perf_counter()
+        self._thread = threading.get_ident()
+        self._lock = threading.Lock()
+
+    def cache_counts(self) -> tuple:
+        return (sum(cache.hits for cache in self.caches), sum(cache.misses for cache in self.caches))
+
+    def add(self, record: Dict) -> None:
+        with self._lock:
+            self.spans.append(record)
+
+    def merge(self, spans: List[Dict]) -> None:
+        """
+        Agrega intervalos medidos en otro proceso o con otro Recorder
+        """
+        with self._lock:
+            self.spans.extend(spans)
+
+    def summary(self) -> List[Dict]:
+        """
+        Totales por etapa: llamadas, segundos, máximo de bytes asignados y aciertos/fallos de caché
+        """
+        totals = {}
+        for span in self.spans:
+            entry = totals.setdefault(span['etapa'], {
+                'etapa': span['etapa'], 'llamadas': 0, 'segundos': 0.0, 'bytes_max': None,
+                'aciertos_cache': 0, 'fallos_cache': 0
+            })
+            entry['llamadas'] += 1
+            entry['segundos'] += span['segundos']
+            entry['aciertos_cache'] += span['aciertos_cache']
+            entry['fallos_cache'] += span['fallos_cache']
+            if span['bytes'] is not None:
+                entry['bytes_max'] = max(entry['bytes_max'] or 0, span['bytes'])
+        return sorted(totals.values(), key=lambda entry: -entry['segundos'])
+
+    def to_json(self) -> str:
+        return json.dumps({'intervalos': self.spans, 'resumen': self.summary()}, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, prefix: str = 'estad') -> str:
+        """
+        Totales por etapa en el formato de texto de Prometheus (p. ej. para el textfile collector de node_exporter)
+        """
+        summary = self.summary()
+        metrics = [
+            ('etapa_segundos', 'summary', "Tiempo de pared por etapa del análisis"),
+            ('etapa_bytes_max', 'gauge', "Máximo de bytes asignados en una llamada a la etapa (tracemalloc)"),
+            ('etapa_cache_aciertos_total', 'counter', "Aciertos de caché durante la etapa"),
+            ('etapa_cache_fallos_total', 'counter', "Fallos de caché durante la etapa")
+        ]
+        lines = []
+        for metric, kind, description in metrics:
+            name = f"{prefix}_{metric}"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for entry in summary:
+                label = '{etapa="%s"}' % _escape_label(entry['etapa'])
+                if metric == 'etapa_segundos':
+                    lines.append(f"{name}_sum{label} {entry['segundos']:.6f}")
+                    lines.append(f"{name}_count{label} {entry['llamadas']}")
+                elif metric == 'etapa_bytes_max':
+                    if entry['bytes_max'] is not None:
+                        lines.append(f"{name}{label} {entry['bytes_max']}")
+                elif metric == 'etapa_cache_aciertos_total':
+                    lines.append(f"{name}{label} {entry['aciertos_cache']}")
+                else:
+                    lines.append(f"{name}{label} {entry['fallos_cache']}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str) -> None:
+        """
+        Guarda en formato Prometheus si la ruta termina en .prom y en JSON en otro caso (escritura atómica)
+        """
+        content = self.to_prometheus() if path.endswith('.prom') else self.to_json()
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as handle:
+            handle.write(content)
+        os.replace(temporary, path)
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def current_recorder():
+    return _recorder.get()
+
+@contextmanager
+def recording(recorder: Recorder = None):
+    """
+    Activa recorder para el código del bloque (con None no se mide nada)
+    """
+    token = _recorder.set(recorder)
+    owns_tracing = recorder is not None and recorder.track_memory and not tracemalloc.is_tracing()
+    if owns_tracing:
+        tracemalloc.start()
+    try:
+        yield recorder
+    finally:
+        if owns_tracing:
+            tracemalloc.stop()
+        _recorder.reset(token)
+
+@contextmanager
+def span(name: str):
+    """
+    Mide un bloque de código si hay un Recorder activo; intervalos anidados registran a su padre
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        yield
+        return
+
+    stack = _stack.get()
+    parent = stack[-1] if stack else None
+    frame = {'etapa': name, 'cur0': None, 'peak': 0}
+    memory = recorder.track_memory and tracemalloc.is_tracing() and threading.get_ident() == recorder._thread
+    if memory:
+        current, peak = tracemalloc.get_traced_memory()
+        if parent is not None and parent['cur0'] is not None:
+            parent['peak'] = max(parent['peak'], peak)
+        tracemalloc.reset_peak()
+        frame['cur0'] = frame['peak'] = current
+
+    hits, misses = recorder.cache_counts()
+    token = _stack.set(stack + (frame,))
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _stack.reset(token)
+        allocated = None
+        if memory and tracemalloc.is_tracing():
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            allocated = peak - frame['cur0']
+            if parent is not None and parent['cur0'] is not None:
+                parent['peak'] = max(parent['peak'], peak)
+        end_hits, end_misses = recorder.cache_counts()
+        recorder.add({
+            'etapa': name,
+            'padre': parent['etapa'] if parent else None,
+            'nivel': len(stack),
+            'inicio': start - recorder.started,
+            'segundos': elapsed,
+            'bytes': allocated,
+            'aciertos_cache': end_hits - hits,
+            'fallos_cache': end_misses - misses
+        })
+
+def instrumented(func):
+    """
+    Decorador: mide cada llamada a func como un intervalo llamado modulo.funcion
+    """
+    module = func.__module__
+    if module == '__main__':
+        module = os.path.splitext(os.path.basename(func.__code__.co_filename))[0]
+    name = f"{module}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _recorder.get() is None:
+            return func(*args, **kwargs)
+        with span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+def call_recorded(func, *args, **kwargs) -> tuple:
+    """
+    Ejecuta func con un Recorder propio (por ejemplo en un proceso trabajador) y retorna (resultado, intervalos)
+    """
+    recorder = Recorder()
+    with recording(recorder):
+        result = func(*args, **kwargs)
+    return result, recorder.spans
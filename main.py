@@ -1,6 +1,705 @@
-def main():
-    print("Hello from repl-nix-workspace!")
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
 
+import numpy as np
+import pandas as pd
+
+from stats_utils import calculate_all_statistics
+from data_processor import (load_data_from_file, create_frequency_table, validate_data, clean_data, clean_data_context,
+                            preview_file, build_category_table, OUTLIER_THRESHOLDS)
+from columnar_io import COLUMNAR_TYPES
+from categorical import CategoricalSummary
+from type_inference import infer_data_type
+from batch_analysis import SUMMARY_COLUMNS, summary_row
+from incremental import IncrementalAnalysis
+from grouped import grouped_statistics, grouped_frequency_table
+from heavy_hitters import frequent_values
+from streaming import analyze_file_streaming, iter_column_chunks, DEFAULT_CHUNKSIZE
+from instrumentation import Recorder, recording, instrumented, current_recorder, call_recorded
+
+SUPPORTED_EXTENSIONS = ('csv', 'txt', 'xlsx', 'xls') + COLUMNAR_TYPES
+OUTPUT_FORMATS = ('json', 'csv', 'parquet')
+
+def collect_files(paths: List[str]) -> List[Path]:
+    """
+    Expande las rutas recibidas: los directorios se recorren recursivamente buscando archivos soportados
+    """
+    files = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            files.extend(sorted(
+                candidate for candidate in path.rglob('*')
+                if candidate.is_file() and candidate.suffix.lower().lstrip('.') in SUPPORTED_EXTENSIONS
+            ))
+        elif path.is_file():
+            files.append(path)
+        else:
+            raise ValueError(f"No existe el archivo o directorio: {raw}")
+    return files
+
+def output_names(files: List[Path]) -> List[str]:
+    """
+    Nombre de la carpeta de salida de cada archivo, único aunque haya archivos homónimos
+
+    Se usa el nombre sin extensión; si se repite se agrega la extensión, si aún se repite (mismo archivo
+    en distintas subcarpetas) se antepone la ruta relativa a la carpeta común, y como último recurso
+    un contador.
+    """
+    stems = [path.stem for path in files]
+    names = [path.stem if stems.count(path.stem) == 1 else f"{path.stem}_{path.suffix.lstrip('.')}" for path in files]
+    if len(set(names)) < len(names):
+        root = os.path.commonpath([str(path.resolve().parent) for path in files])
+        names = [
+            name if names.count(name) == 1
+            else _safe_name('_'.join(path.resolve().parent.relative_to(root).parts + (name,)))
+            for path, name in zip(files, names)
+        ]
+    used = set()
+    unique = []
+    for name in names:
+        candidate, counter = name, 1
+        while candidate in used:
+            counter += 1
+            candidate = f"{name}_{counter}"
+        used.add(candidate)
+        unique.append(candidate)
+    return unique
+
+def _safe_name(name) -> str:
+    return re.sub(r'[^\w.-]+', '_', str(name)).strip('_') or 'columna'
+
+def _detect_type(data: pd.Series, column_name: str, use_ai: bool) -> Dict:
+    if use_ai:
+        from ai_helper import detect_data_type
+        return detect_data_type(data, column_name)
+    return infer_data_type(data)
+
+@instrumented
+def analyze_column(name, values: pd.Series, use_ai: bool = False, remove_outliers: bool = False,
+                   bins: int = None, chart_dir: str = None, outlier_method: str = 'iqr',
+                   weights: pd.Series = None, top: int = None) -> Dict:
+    """
+    Ejecuta la misma secuencia que la aplicación sobre una columna: limpieza, detección de tipo,
+    tabla de frecuencias, estadísticas y (opcionalmente) exportación de gráficos en HTML
+
+    Los valores atípicos solo se eliminan en columnas cuantitativas, para que las categóricas de un
+    archivo con varias columnas no queden vacías. Con weights (alineados por índice con values) cada
+    fila cuenta weights veces, n es la suma de los pesos y no se eliminan atípicos. Con top se agregan
+    los top valores más frecuentes con sus cotas de frecuencia (ver frequent_values).
+    """
+    if weights is not None:
+        return _analyze_weighted_column(name, values, weights, use_ai, bins, chart_dir, top)
+    cleaned = clean_data(values)
+    nulls = len(values) - len(cleaned)
+    result = {
+        'columna': name,
+        'tipo': None,
+        'n': 0,
+        'nulos': nulls,
+        'atipicos_eliminados': 0,
+        'estadisticas': None,
+        'tabla_frecuencias': None,
+        'valores_frecuentes': None,
+        'interpretacion': None,
+        'graficos': [],
+        'fila': None
+    }
+    if len(cleaned) == 0:
+        info = {'tipo': 'cualitativo', 'subtipo': 'nominal', 'razon': "No hay datos válidos después de la limpieza"}
+        result.update({'tipo': info, 'fila': summary_row(name, info, 0, nulls)})
+        return result
+
+    info = _detect_type(cleaned, str(name), use_ai)
+    is_quantitative = info.get('tipo') == 'cuantitativo'
+    summary = None
+    stats = None
+    if is_quantitative:
+        if remove_outliers:
+            context = clean_data_context(cleaned, remove_outliers=True, method=outlier_method)
+        else:
+            context = clean_data_context(pd.to_numeric(cleaned, errors='coerce'))
+        data = context.data
+        nulls += context.nulls
+        result['atipicos_eliminados'] = context.removed
+        stats = calculate_all_statistics(context)
+    else:
+        data = cleaned
+        summary = CategoricalSummary.from_data(data)
+
+    result.update({
+        'tipo': info,
+        'n': len(data),
+        'nulos': nulls,
+        'estadisticas': stats,
+        'fila': summary_row(name, info, len(data), nulls, stats=stats, summary=summary)
+    })
+    if len(data) == 0:
+        return result
+
+    freq_table = create_frequency_table(data, is_quantitative, bins=bins, summary=summary)
+    result['tabla_frecuencias'] = freq_table
+    if top:
+        result['valores_frecuentes'] = frequent_values(data).top(top)
+
+    if use_ai and is_quantitative:
+        from ai_helper import interpret_statistics
+        result['interpretacion'] = interpret_statistics(stats, 'cuantitativo')
+
+    if chart_dir:
+        from visualization import create_multiple_visualizations
+        os.makedirs(chart_dir, exist_ok=True)
+        figures = create_multiple_visualizations(data, info['tipo'], freq_table=freq_table, summary=summary)
+        for kind, figure in figures.items():
+            chart_path = os.path.join(chart_dir, f"{_safe_name(name)}_{kind}.html")
+            figure.write_html(chart_path, include_plotlyjs='cdn')
+            result['graficos'].append(chart_path)
+    return result
+
+def _analyze_weighted_column(name, values: pd.Series, weights: pd.Series, use_ai: bool, bins: int,
+                             chart_dir: str, top: int = None) -> Dict:
+    """
+    analyze_column para una tabla (valor, conteo): todo se calcula sobre los valores distintos
+    """
+    cleaned = clean_data(values)
+    nulls = len(values) - len(cleaned)
+    weights = weights.loc[cleaned.index]
+    result = {
+        'columna': name,
+        'tipo': None,
+        'n': 0,
+        'nulos': nulls,
+        'atipicos_eliminados': 0,
+        'estadisticas': None,
+        'tabla_frecuencias': None,
+        'valores_frecuentes': None,
+        'interpretacion': None,
+        'graficos': [],
+        'fila': None
+    }
+    info = _detect_type(cleaned, str(name), use_ai) if len(cleaned) else {
+        'tipo': 'cualitativo', 'subtipo': 'nominal', 'razon': "No hay datos válidos después de la limpieza"
+    }
+    is_quantitative = info.get('tipo') == 'cuantitativo'
+    stats = calculate_all_statistics(cleaned, weights=weights) if is_quantitative else None
+    summary = None if is_quantitative else CategoricalSummary.from_data(cleaned, weights=weights)
+    n = stats['n'] if is_quantitative else summary.total
+    result.update({
+        'tipo': info,
+        'n': n,
+        'estadisticas': stats,
+        'fila': summary_row(name, info, n, nulls, stats=stats, summary=summary)
+    })
+    if n == 0:
+        return result
+
+    freq_table = create_frequency_table(cleaned, is_quantitative, bins=bins, summary=summary, weights=weights)
+    result['tabla_frecuencias'] = freq_table
+    if top:
+        result['valores_frecuentes'] = frequent_values(cleaned, weights=weights).top(top)
+    if use_ai and is_quantitative:
+        from ai_helper import interpret_statistics
+        result['interpretacion'] = interpret_statistics(stats, 'cuantitativo')
+
+    if chart_dir:
+        from visualization import create_histogram, create_frequency_bar_chart
+        os.makedirs(chart_dir, exist_ok=True)
+        figures = {'freq_chart': create_frequency_bar_chart(freq_table, is_quantitative)}
+        if is_quantitative:
+            figures['histogram'] = create_histogram(cleaned, "Histograma de Distribución", bins=bins, weights=weights)
+        for kind, figure in figures.items():
+            chart_path = os.path.join(chart_dir, f"{_safe_name(name)}_{kind}.html")
+            figure.write_html(chart_path, include_plotlyjs='cdn')
+            result['graficos'].append(chart_path)
+    return result
+
+def _submit(executor: ProcessPoolExecutor, func, task: tuple):
+    if current_recorder() is None:
+        return executor.submit(func, *task)
+    return executor.submit(call_recorded, func, *task)
+
+def _result(future):
+    """
+    Resultado de una tarea enviada con _submit; los intervalos medidos en el trabajador se agregan al Recorder activo
+    """
+    recorder = current_recorder()
+    if recorder is None:
+        return future.result()
+    result, spans = future.result()
+    recorder.merge(spans)
+    return result
+
+def _run_tasks(func, tasks: List[tuple], workers: int) -> List:
+    if workers <= 1 or len(tasks) <= 1:
+        return [func(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        futures = [_submit(executor, func, task) for task in tasks]
+        return [_result(future) for future in futures]
+
+def _json_safe(value):
+    if isinstance(value, dict):
+        return {str(k): _json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, pd.DataFrame):
+        return _json_safe(value.to_dict(orient='records'))
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+def write_table(df: pd.DataFrame, path: str, output_format: str) -> None:
+    """
+    Escribe una tabla en CSV o Parquet (las columnas con tipos mezclados se guardan como texto en Parquet)
+    """
+    if output_format == 'parquet':
+        df = df.copy()
+        for column in df.columns[df.dtypes == object]:
+            df[column] = df[column].map(lambda v: None if v is None or (isinstance(v, float) and math.isnan(v)) else str(v))
+        try:
+            df.to_parquet(path, index=False)
+        except ImportError:
+            raise ValueError("Se requiere pyarrow para exportar en formato Parquet")
+    else:
+        df.to_csv(path, index=False)
+
+def write_results(report: Dict, output_dir: str, output_format: str) -> List[str]:
+    """
+    Guarda el resultado de un archivo: resultados.json, o bien resumen + una tabla de frecuencias por columna
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if output_format == 'json':
+        path = os.path.join(output_dir, 'resultados.json')
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(_json_safe(report), handle, ensure_ascii=False, indent=2)
+        return [path]
+
+    written = []
+    summary_path = os.path.join(output_dir, f"resumen.{output_format}")
+    write_table(report['resumen'], summary_path, output_format)
+    written.append(summary_path)
+
+    tables_dir = os.path.join(output_dir, 'frecuencias')
+    for column in report['columnas']:
+        if column['tabla_frecuencias'] is not None:
+            os.makedirs(tables_dir, exist_ok=True)
+            table_path = os.path.join(tables_dir, f"{_safe_name(column['columna'])}.{output_format}")
+            write_table(column['tabla_frecuencias'], table_path, output_format)
+            written.append(table_path)
+
+    frequent_dir = os.path.join(output_dir, 'frecuentes')
+    for column in report['columnas']:
+        if column.get('valores_frecuentes') is not None:
+            os.makedirs(frequent_dir, exist_ok=True)
+            table_path = os.path.join(frequent_dir, f"{_safe_name(column['columna'])}.{output_format}")
+            write_table(column['valores_frecuentes'], table_path, output_format)
+            written.append(table_path)
+
+    groups_dir = os.path.join(output_dir, 'por_grupo')
+    for name, grouped in report.get('por_grupo', {}).items():
+        os.makedirs(groups_dir, exist_ok=True)
+        for kind, table in (('estadisticas', grouped['estadisticas']), ('frecuencias', grouped['tabla_frecuencias'])):
+            if table is not None:
+                table_path = os.path.join(groups_dir, f"{_safe_name(name)}_{kind}.{output_format}")
+                write_table(table.rename(columns=str), table_path, output_format)
+                written.append(table_path)
+
+    interpretations = {str(c['columna']): c['interpretacion'] for c in report['columnas'] if c['interpretacion']}
+    if interpretations:
+        path = os.path.join(output_dir, 'interpretaciones.json')
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(interpretations, handle, ensure_ascii=False, indent=2)
+        written.append(path)
+    return written
+
+def load_file(path: str, columns: List[str] = None, compact: bool = False) -> tuple:
+    """
+    Carga las columnas indicadas (todas por defecto) de un archivo; retorna (DataFrame, advertencias)
+    """
+    file_type = Path(path).suffix.lower().lstrip('.')
+    if file_type in COLUMNAR_TYPES:
+        df = load_data_from_file(path, file_type, columns, compact)
+    else:
+        with open(path, 'rb') as handle:
+            df = load_data_from_file(handle, file_type, columns if file_type != 'txt' else None, compact)
+
+    validation = validate_data(df)
+    if not validation['valid']:
+        raise ValueError("; ".join(validation['errors']))
+
+    if columns:
+        missing = [c for c in columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"Columnas no encontradas: {', '.join(map(str, missing))}")
+        df = df[columns]
+    return df, validation['warnings']
+
+def analyze_file(path: str, columns: List[str] = None, use_ai: bool = False, remove_outliers: bool = False,
+                 bins: int = None, chart_dir: str = None, workers: int = 1, outlier_method: str = 'iqr',
+                 compact: bool = False, group_by: str = None, weights_column: str = None, top: int = None) -> Dict:
+    """
+    Carga un archivo y analiza las columnas indicadas (todas por defecto), repartiéndolas entre workers procesos
+
+    Con compact las columnas numéricas se cargan en float32 o en enteros pequeños (ver compact_series).
+    Con group_by se agregan, para cada otra columna, sus estadísticas y tabla de frecuencias por grupo
+    (sin eliminar atípicos) en report['por_grupo']. Con weights_column el archivo es una tabla de
+    frecuencias: las demás columnas se analizan ponderadas por esa columna (ver analyze_column). Con top
+    cada columna incluye sus top valores más frecuentes.
+    """
+    extra = [c for c in (group_by, weights_column) if c is not None and columns and c not in columns]
+    df, warnings = load_file(path, columns + extra if extra else columns, compact)
+    for label, column in (("agrupar", group_by), ("pesos", weights_column)):
+        if column is not None and column not in df.columns:
+            raise ValueError(f"Columna de {label} no encontrada: {column}")
+    weights = df[weights_column] if weights_column is not None else None
+    names = [name for name in (columns or list(df.columns)) if name != weights_column]
+    tasks = [(name, df[name], use_ai, remove_outliers, bins, chart_dir, outlier_method, weights, top) for name in names]
+    results = _run_tasks(analyze_column, tasks, workers)
+    report = {
+        'archivo': str(path),
+        'filas': len(df),
+        'advertencias': warnings,
+        'resumen': pd.DataFrame([r.pop('fila') for r in results], columns=SUMMARY_COLUMNS),
+        'columnas': results
+    }
+    if group_by is not None:
+        report['agrupado_por'] = group_by
+        report['por_grupo'] = {
+            result['columna']: grouped_result(df[result['columna']], df[group_by], result['tipo'], bins)
+            for result in results if result['columna'] != group_by
+        }
+    return report
+
+@instrumented
+def analyze_column_chunked(path: str, name, use_ai: bool = False, bins: int = None,
+                           chunksize: int = DEFAULT_CHUNKSIZE) -> Dict:
+    """
+    analyze_column leyendo el archivo por bloques con analyze_file_streaming (memoria proporcional a
+    chunksize): el tipo se detecta con el primer bloque y luego se hacen una o dos pasadas sobre el archivo
+
+    Como en analyze_column, n y las frecuencias relativas se calculan sobre los valores válidos.
+    """
+    file_type = Path(path).suffix.lower().lstrip('.')
+    column = None if file_type == 'txt' else name
+    first = clean_data(next(iter_column_chunks(path, file_type, column, chunksize), pd.Series(dtype=object)))
+    result = {
+        'columna': name,
+        'tipo': None,
+        'n': 0,
+        'nulos': 0,
+        'atipicos_eliminados': 0,
+        'estadisticas': None,
+        'tabla_frecuencias': None,
+        'valores_frecuentes': None,
+        'interpretacion': None,
+        'graficos': [],
+        'fila': None
+    }
+    if len(first) == 0:
+        info = {'tipo': 'cualitativo', 'subtipo': 'nominal', 'razon': "No hay datos válidos en el primer bloque"}
+    else:
+        info = _detect_type(first, str(name), use_ai)
+    is_quantitative = info.get('tipo') == 'cuantitativo'
+    streamed = analyze_file_streaming(path, file_type, column, is_quantitative, bins, chunksize)
+    n, nulls, stats = streamed['validos'], streamed['n'] - streamed['validos'], streamed['statistics']
+    freq_table = streamed['freq_table']
+    summary = None
+    if stats is not None:
+        stats['n'] = n
+    elif freq_table is not None:
+        summary = CategoricalSummary(freq_table['Categoría'], freq_table['Frecuencia Absoluta'].to_numpy(), total=n)
+        freq_table = build_category_table(summary.by_category(), n)
+    result.update({
+        'tipo': info,
+        'n': n,
+        'nulos': nulls,
+        'filas': streamed['n'],
+        'estadisticas': stats,
+        'tabla_frecuencias': freq_table,
+        'fila': summary_row(name, info, n, nulls, stats=stats, summary=summary)
+    })
+    if use_ai and is_quantitative and n:
+        from ai_helper import interpret_statistics
+        result['interpretacion'] = interpret_statistics(stats, 'cuantitativo')
+    return result
+
+def analyze_file_chunked(path: str, columns: List[str] = None, use_ai: bool = False, bins: int = None,
+                         workers: int = 1, chunksize: int = DEFAULT_CHUNKSIZE) -> Dict:
+    """
+    analyze_file sin cargar el archivo completo: cada columna se analiza por bloques de chunksize filas
+
+    Los TXT tienen una sola columna ('valores'). Para el resto las columnas salen del encabezado o de los
+    metadatos del archivo (preview_file).
+    """
+    file_type = Path(path).suffix.lower().lstrip('.')
+    available = ['valores'] if file_type == 'txt' else preview_file(path, file_type, n_rows=1)['columnas']
+    if columns:
+        missing = [c for c in columns if c not in available]
+        if missing:
+            raise ValueError(f"Columnas no encontradas: {', '.join(map(str, missing))}")
+    names = columns or available
+    results = _run_tasks(analyze_column_chunked, [(path, name, use_ai, bins, chunksize) for name in names], workers)
+    return {
+        'archivo': str(path),
+        'filas': results[0].pop('filas') if results else 0,
+        'advertencias': [],
+        'resumen': pd.DataFrame([r.pop('fila') for r in results], columns=SUMMARY_COLUMNS),
+        'columnas': [{key: value for key, value in r.items() if key != 'filas'} for r in results]
+    }
+
+@instrumented
+def grouped_result(values: pd.Series, groups: pd.Series, info: Dict, bins: int = None) -> Dict:
+    """
+    Estadísticas (columnas cuantitativas) y tabla de frecuencias de una columna por cada grupo
+    """
+    is_quantitative = info.get('tipo') == 'cuantitativo'
+    return {
+        'estadisticas': grouped_statistics(values, groups) if is_quantitative else None,
+        'tabla_frecuencias': grouped_frequency_table(values, groups, is_quantitative, bins)
+    }
+
+def _state_path(state_dir: str, name) -> str:
+    return os.path.join(state_dir, f"{_safe_name(name)}.json")
+
+def incremental_result(name, analysis: IncrementalAnalysis, use_ai: bool = False) -> Dict:
+    """
+    Resultado acumulado de una columna con las mismas claves que analyze_column
+    """
+    info = analysis.type_info
+    stats = analysis.statistics()
+    summary = None if analysis.is_quantitative else analysis.categorical_summary()
+    interpretation = None
+    if use_ai and stats is not None and analysis.count > 0:
+        from ai_helper import interpret_statistics
+        interpretation = interpret_statistics(stats, 'cuantitativo')
+    return {
+        'columna': name,
+        'tipo': info,
+        'n': analysis.count,
+        'nulos': analysis.nulls,
+        'lotes': analysis.batches,
+        'atipicos_eliminados': 0,
+        'estadisticas': stats,
+        'tabla_frecuencias': analysis.frequency_table(),
+        'interpretacion': interpretation,
+        'graficos': [],
+        'fila': summary_row(name, info, analysis.count, analysis.nulls, stats=stats, summary=summary)
+    }
+
+@instrumented
+def append_files(paths: List[str], state_dir: str, columns: List[str] = None, use_ai: bool = False,
+                 bins: int = None) -> Dict:
+    """
+    Agrega las filas de los archivos (en orden) a los análisis incrementales guardados en state_dir,
+    uno por columna, y retorna los resultados acumulados
+
+    El tipo de cada columna se detecta solo con su primer lote. Los estados se guardan al final, de
+    modo que si un archivo falla no queda agregada ninguna parte de esta ejecución.
+    """
+    os.makedirs(state_dir, exist_ok=True)
+    analyses = {}
+    rows = 0
+    warnings = []
+    for path in paths:
+        df, file_warnings = load_file(str(path), columns)
+        rows += len(df)
+        warnings.extend(file_warnings)
+        for name in df.columns:
+            analysis = analyses.get(name)
+            if analysis is None and os.path.exists(_state_path(state_dir, name)):
+                analysis = IncrementalAnalysis.load(_state_path(state_dir, name))
+            if analysis is None:
+                cleaned = clean_data(df[name])
+                if len(cleaned) == 0:
+                    continue
+                info = _detect_type(cleaned, str(name), use_ai)
+                analysis = IncrementalAnalysis(info.get('tipo') == 'cuantitativo', info, bins)
+            analyses[name] = analysis.append(df[name])
+
+    for name, analysis in analyses.items():
+        analysis.save(_state_path(state_dir, name))
+    results = [incremental_result(name, analysis, use_ai) for name, analysis in analyses.items()]
+    return {
+        'archivos': [str(path) for path in paths],
+        'filas_agregadas': rows,
+        'advertencias': warnings,
+        'resumen': pd.DataFrame([r.pop('fila') for r in results], columns=SUMMARY_COLUMNS),
+        'columnas': results
+    }
+
+@instrumented
+def process_file(path: str, output_dir: str, output_format: str, columns: List[str] = None, use_ai: bool = False,
+                 remove_outliers: bool = False, bins: int = None, charts: bool = False, workers: int = 1,
+                 outlier_method: str = 'iqr', compact: bool = False, group_by: str = None,
+                 weights_column: str = None, top: int = None, chunksize: int = None) -> Dict:
+    """
+    Analiza un archivo y escribe sus resultados en output_dir; retorna el resumen y las rutas escritas
+
+    Con chunksize el archivo se lee por bloques (analyze_file_chunked) en lugar de cargarse completo.
+    """
+    chart_dir = os.path.join(output_dir, 'graficos') if charts else None
+    if chunksize:
+        report = analyze_file_chunked(path, columns, use_ai, bins, workers, chunksize)
+    else:
+        report = analyze_file(path, columns, use_ai, remove_outliers, bins, chart_dir, workers, outlier_method,
+                              compact, group_by, weights_column, top)
+    written = write_results(report, output_dir, output_format)
+    return {'archivo': str(path), 'resumen': report['resumen'], 'archivos': written}
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='estad',
+        description="Análisis descriptivo sin interfaz: carga, limpieza, detección de tipo, tabla de "
+                    "frecuencias, estadísticas y gráficos para archivos CSV, TXT, Excel, Parquet, Feather o Arrow."
+    )
+    parser.add_argument('rutas', nargs='+', help="Archivos o directorios a analizar")
+    parser.add_argument('-c', '--columna', action='append', dest='columnas',
+                        help="Columna a analizar (repetible; por defecto todas)")
+    parser.add_argument('-o', '--salida', default='resultados', help="Directorio de salida (por defecto: resultados)")
+    parser.add_argument('-f', '--formato', choices=OUTPUT_FORMATS, default='json', help="Formato de salida")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="Procesos en paralelo (por archivos si hay varios, por columnas si hay uno)")
+    parser.add_argument('--intervalos', type=int, default=None,
+                        help="Número de intervalos para datos cuantitativos (por defecto regla de Sturges)")
+    parser.add_argument('--quitar-atipicos', action='store_true', help="Eliminar valores atípicos")
+    parser.add_argument('--metodo-atipicos', choices=list(OUTLIER_THRESHOLDS), default='iqr',
+                        help="Criterio para los valores atípicos: iqr (por defecto), mad, zscore o percentil")
+    parser.add_argument('--graficos', action='store_true', help="Exportar los gráficos en HTML")
+    parser.add_argument('--agrupar', default=None, metavar='COLUMNA',
+                        help="Además, estadísticas y tablas de frecuencias de cada columna por los grupos de COLUMNA")
+    parser.add_argument('--pesos', default=None, metavar='COLUMNA',
+                        help="Tabla de frecuencias: cada fila cuenta tantas veces como indica COLUMNA (valor, conteo)")
+    parser.add_argument('--frecuentes', type=int, default=None, metavar='K',
+                        help="Además, los K valores más frecuentes de cada columna (exactos con pocos valores "
+                             "distintos; si no, aproximados con cota de error)")
+    parser.add_argument('--bloques', type=int, nargs='?', const=DEFAULT_CHUNKSIZE, default=None, metavar='FILAS',
+                        help=f"Leer cada archivo por bloques de FILAS filas (por defecto {DEFAULT_CHUNKSIZE}) sin "
+                             "cargarlo completo, para archivos más grandes que la memoria")
+    parser.add_argument('--compacto', action='store_true',
+                        help="Cargar las columnas numéricas en float32 o enteros pequeños (la mitad de memoria o menos)")
+    parser.add_argument('--no-ai', action='store_true',
+                        help="No usar OpenAI: detección de tipo por reglas y sin interpretaciones")
+    parser.add_argument('--estado', default=None,
+                        help="Modo incremental: agrega las filas a los análisis guardados en este directorio "
+                             "(uno por columna) y escribe los resultados acumulados")
+    parser.add_argument('--metricas', default=None,
+                        help="Guardar el tiempo de cada etapa en JSON, o en formato Prometheus si termina en .prom")
+    return parser
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    recorder = Recorder() if args.metricas else None
+    with recording(recorder):
+        code = run(args)
+    if recorder is not None:
+        recorder.write(args.metricas)
+        print(f"🩺 Métricas por etapa: {args.metricas}")
+    return code
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Analiza todos los archivos indicados en args y escribe los resultados; retorna el código de salida
+    """
+    use_ai = not args.no_ai and bool(os.environ.get("OPENAI_API_KEY"))
+
+    try:
+        files = collect_files(args.rutas)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    if not files:
+        print("❌ No se encontraron archivos CSV, TXT, Excel, Parquet, Feather o Arrow", file=sys.stderr)
+        return 1
+
+    if args.pesos and (args.quitar_atipicos or args.agrupar):
+        print("❌ --pesos no admite --quitar-atipicos ni --agrupar", file=sys.stderr)
+        return 1
+    if args.frecuentes is not None and args.frecuentes < 1:
+        print("❌ --frecuentes debe ser al menos 1", file=sys.stderr)
+        return 1
+    if args.bloques is not None:
+        if args.bloques < 1:
+            print("❌ --bloques debe ser al menos 1", file=sys.stderr)
+            return 1
+        if (args.quitar_atipicos or args.graficos or args.agrupar or args.pesos or args.frecuentes
+                or args.compacto or args.estado):
+            print("❌ La lectura por bloques (--bloques) no admite --quitar-atipicos, --graficos, --agrupar, "
+                  "--pesos, --frecuentes, --compacto ni --estado", file=sys.stderr)
+            return 1
+    if args.estado:
+        return run_incremental(args, files, use_ai)
+
+    multiple = len(files) > 1
+    file_workers = args.workers if multiple else 1
+    column_workers = 1 if multiple else args.workers
+    tasks = []
+    for path, name in zip(files, output_names(files)):
+        output_dir = os.path.join(args.salida, name) if multiple else args.salida
+        tasks.append((str(path), output_dir, args.formato, args.columnas, use_ai,
+                      args.quitar_atipicos, args.intervalos, args.graficos, column_workers, args.metodo_atipicos,
+                      args.compacto, args.agrupar, args.pesos, args.frecuentes, args.bloques))
+
+    failures = 0
+    summaries = []
+    if file_workers <= 1 or not multiple:
+        outcomes = []
+        for task in tasks:
+            try:
+                outcomes.append(process_file(*task))
+            except Exception as e:
+                outcomes.append(e)
+    else:
+        with ProcessPoolExecutor(max_workers=min(file_workers, len(tasks))) as executor:
+            futures = [_submit(executor, process_file, task) for task in tasks]
+            outcomes = []
+            for future in futures:
+                try:
+                    outcomes.append(_result(future))
+                except Exception as e:
+                    outcomes.append(e)
+
+    for task, outcome in zip(tasks, outcomes):
+        if isinstance(outcome, Exception):
+            failures += 1
+            print(f"❌ {task[0]}: {outcome}", file=sys.stderr)
+            continue
+        print(f"✓ {outcome['archivo']}: {len(outcome['resumen'])} columnas → {task[1]}")
+        summaries.append(outcome['resumen'].assign(Archivo=outcome['archivo']))
+
+    if multiple and summaries:
+        combined = pd.concat(summaries, ignore_index=True)
+        combined = combined[['Archivo'] + SUMMARY_COLUMNS]
+        extension = 'csv' if args.formato == 'json' else args.formato
+        combined_path = os.path.join(args.salida, f"resumen_general.{extension}")
+        write_table(combined, combined_path, extension)
+        print(f"📑 Resumen general: {combined_path}")
+
+    return 1 if failures else 0
+
+def run_incremental(args: argparse.Namespace, files: List[Path], use_ai: bool) -> int:
+    if args.quitar_atipicos or args.graficos or args.agrupar or args.pesos or args.frecuentes:
+        print("❌ El modo incremental (--estado) no admite --quitar-atipicos, --graficos, --agrupar, --pesos "
+              "ni --frecuentes", file=sys.stderr)
+        return 1
+    try:
+        report = append_files(files, args.estado, args.columnas, use_ai, args.intervalos)
+        written = write_results(report, args.salida, args.formato)
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print(f"➕ {report['filas_agregadas']} filas agregadas a {len(report['columnas'])} columnas ({args.estado})")
+    for column in report['columnas']:
+        print(f"   {column['columna']}: {column['n']} valores en {column['lotes']} lotes")
+    print(f"✓ Resultados acumulados → {args.salida} ({len(written)} archivos)")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
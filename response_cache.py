@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "estad", "ai_responses.sqlite")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+def make_cache_key(kind: str, payload: Any) -> str:
+    """
+    Clave estable a partir del tipo de consulta y sus datos de entrada
+    """
+    serialized = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{kind}|{serialized}".encode('utf-8')).hexdigest()
+
+def round_for_key(value: Any, digits: int = 4) -> Any:
+    """
+    Redondea recursivamente los números de un diccionario de estadísticas
+    """
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {k: round_for_key(v, digits) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [round_for_key(v, digits) for v in value]
+    return value
+
+class ResponseCache:
+    """
+    Caché persistente en SQLite para respuestas de IA, con caducidad (TTL), límite de
+    entradas (se eliminan las de acceso más antiguo) y contadores de aciertos y fallos
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS respuestas ("
+                "clave TEXT PRIMARY KEY, valor TEXT NOT NULL, creado REAL NOT NULL, accedido REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT valor, creado FROM respuestas WHERE clave = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    conn.execute("DELETE FROM respuestas WHERE clave = ?", (key,))
+                self.misses += 1
+                return None
+            conn.execute("UPDATE respuestas SET accedido = ? WHERE clave = ?", (now, key))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO respuestas (clave, valor, creado, accedido) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            conn.execute("DELETE FROM respuestas WHERE creado < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM respuestas WHERE clave IN ("
+                "SELECT clave FROM respuestas ORDER BY accedido DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM respuestas")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM respuestas").fetchone()[0]
+
+    def stats(self) -> dict:
+        return {
+            'entradas': len(self),
+            'aciertos': self.hits,
+            'fallos': self.misses
+        }
@@ -0,0 +1,112 @@
+import hashlib
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 512
+
+def fingerprint_series(data: pd.Series) -> str:
+    """
+    Huella del contenido de una serie (valores, tipo y longitud), independiente del índice
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f"{data.dtype}|{len(data)}".encode('utf-8'))
+    hasher.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return hasher.hexdigest()
+
+def estimate_size(value: Any) -> int:
+    """
+    Estima la memoria ocupada por un resultado en bytes
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, np.ndarray) or hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values()) + sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value) + sys.getsizeof(value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+class ResultCache:
+    """
+    Caché LRU en memoria para resultados del análisis con límite de entradas y de bytes
+
+    Las claves deben incluir la huella de los datos y los parámetros que afectan al resultado.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any, size: int = None) -> None:
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Retorna el resultado guardado o lo calcula con compute() y lo guarda
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            'entradas': len(self._entries),
+            'bytes': self.current_bytes,
+            'aciertos': self.hits,
+            'fallos': self.misses
+        }
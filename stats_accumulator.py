@@ -0,0 +1,245 @@
+import numpy as np
+import pandas as pd
+from typing import Union, List, Dict, Optional
+
+from stats_utils import summarize_moments, summarize_counts, quantile_from_counts
+from heavy_hitters import HeavyHitters, DEFAULT_CAPACITY
+
+MAX_DISTINCT_VALUES = 100_000
+DEFAULT_SKETCH_SIZE = 200
+
+class KLLSketch:
+    """
+    Sketch de cuantiles KLL fusionable
+
+    Cada nivel h guarda elementos con peso 2**h; al superar su capacidad se ordena y se
+    promueve la mitad de los elementos (posiciones pares o impares al azar) al nivel siguiente.
+    El error de rango es O(1/k) con memoria O(k).
+    """
+
+    def __init__(self, k: int = DEFAULT_SKETCH_SIZE, seed: Optional[int] = None):
+        self.k = k
+        self.count = 0
+        self.levels: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                items = np.sort(items)
+                keep = items[len(items) - len(items) % 2:]
+                pairs = items[:len(items) - len(items) % 2]
+                promoted = pairs[int(self._rng.integers(2))::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+            level += 1
+
+    def update(self, values: np.ndarray) -> 'KLLSketch':
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return self
+        self.count += len(values)
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self._compress()
+        return self
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], items))
+        self.count += other.count
+        self._compress()
+        return self
+
+    def to_state(self) -> Dict:
+        """
+        Estado serializable en JSON (los niveles del sketch como listas)
+        """
+        return {'k': self.k, 'count': self.count, 'levels': [level.tolist() for level in self.levels]}
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'KLLSketch':
+        sketch = cls(state['k'])
+        sketch.count = state['count']
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in state['levels']]
+        return sketch
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Percentil aproximado con interpolación lineal; exacto mientras no haya habido compactación
+        """
+        if self.count == 0:
+            return None
+        if len(self.levels) == 1:
+            return quantile_from_counts(np.sort(self.levels[0]), np.arange(1, self.count + 1), q)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype=np.int64) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return quantile_from_counts(items[order], np.cumsum(weights[order]), q)
+
+class StatisticsAccumulator:
+    """
+    Acumulador fusionable de estadísticas suficientes que recibe datos por lotes
+
+    Usa momentos de Welford/Chan para media y varianza, mínimo y máximo exactos, un sketch KLL
+    para mediana y cuartiles y un conteo exacto de valores distintos mientras no supere
+    max_distinct (en ese caso mediana, cuartiles y moda son exactos). Al superarlo los conteos pasan
+    a un HeavyHitters de capacity contadores: la moda es la del resumen y to_dict agrega su cota de
+    error en 'error_moda'. Dos acumuladores se combinan con merge(), lo que permite procesar
+    particiones en paralelo.
+    """
+
+    def __init__(self, sketch_size: int = DEFAULT_SKETCH_SIZE, max_distinct: int = MAX_DISTINCT_VALUES,
+                 seed: Optional[int] = None, capacity: int = DEFAULT_CAPACITY):
+        self.n = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.max_distinct = max_distinct
+        self.value_counts: Optional[pd.Series] = pd.Series(dtype=np.int64)
+        self.capacity = capacity
+        self.heavy_hitters: Optional[HeavyHitters] = None
+        self.sketch = KLLSketch(sketch_size, seed)
+
+    @property
+    def is_exact(self) -> bool:
+        return self.value_counts is not None
+
+    def update(self, data: Union[List, pd.Series, np.ndarray]) -> 'StatisticsAccumulator':
+        """
+        Agrega un lote de valores; los no numéricos se cuentan en n pero se ignoran en los cálculos
+        """
+        if isinstance(data, list):
+            data = pd.Series(data)
+        self.n += len(data)
+        values = pd.to_numeric(pd.Series(data), errors='coerce').dropna().to_numpy(dtype=np.float64)
+        if len(values) == 0:
+            return self
+
+        batch_mean = float(np.mean(values))
+        deviations = values - batch_mean
+        self._merge_moments(len(values), batch_mean, float(np.dot(deviations, deviations)),
+                            float(np.min(values)), float(np.max(values)))
+        self.sketch.update(values)
+        self._merge_counts(pd.Series(values).value_counts(sort=False))
+        return self
+
+    def merge(self, other: 'StatisticsAccumulator') -> 'StatisticsAccumulator':
+        """
+        Combina otro acumulador en este (el otro no se modifica)
+        """
+        self.n += other.n
+        if other.count == 0:
+            return self
+        self._merge_moments(other.count, other.mean, other.m2, other.minimum, other.maximum)
+        self.sketch.merge(other.sketch)
+        if other.value_counts is not None:
+            self._merge_counts(other.value_counts)
+        else:
+            if self.value_counts is not None:
+                self._start_heavy_hitters(self.value_counts)
+            self.heavy_hitters.merge(other.heavy_hitters)
+        return self
+
+    def _merge_moments(self, count: int, mean: float, m2: float, minimum: float, maximum: float) -> None:
+        if self.count == 0:
+            self.mean, self.m2 = mean, m2
+        else:
+            total = self.count + count
+            delta = mean - self.mean
+            self.mean += delta * count / total
+            self.m2 += m2 + delta * delta * self.count * count / total
+        self.count += count
+        self.minimum = min(self.minimum, minimum)
+        self.maximum = max(self.maximum, maximum)
+
+    def _merge_counts(self, counts: pd.Series) -> None:
+        if self.value_counts is None:
+            self.heavy_hitters.update_counts(counts)
+            return
+        merged = self.value_counts.add(counts, fill_value=0).astype(np.int64)
+        if len(merged) <= self.max_distinct:
+            self.value_counts = merged
+        else:
+            self._start_heavy_hitters(merged)
+
+    def _start_heavy_hitters(self, counts: pd.Series) -> None:
+        self.value_counts = None
+        self.heavy_hitters = HeavyHitters(self.capacity).update_counts(counts)
+
+    def to_state(self) -> Dict:
+        """
+        Estado serializable en JSON, para continuar la acumulación en otra ejecución con from_state()
+        """
+        exact = self.value_counts is not None
+        return {
+            'n': self.n,
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'minimum': self.minimum,
+            'maximum': self.maximum,
+            'max_distinct': self.max_distinct,
+            'capacity': self.capacity,
+            'values': self.value_counts.index.tolist() if exact else None,
+            'counts': self.value_counts.astype(np.int64).tolist() if exact else None,
+            'heavy_hitters': None if exact else self.heavy_hitters.to_state(),
+            'sketch': self.sketch.to_state()
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'StatisticsAccumulator':
+        accumulator = cls(state['sketch']['k'], state['max_distinct'], capacity=state.get('capacity', DEFAULT_CAPACITY))
+        accumulator.n = state['n']
+        accumulator.count = state['count']
+        accumulator.mean = state['mean']
+        accumulator.m2 = state['m2']
+        accumulator.minimum = state['minimum']
+        accumulator.maximum = state['maximum']
+        if state['values'] is None:
+            accumulator.value_counts = None
+            if state.get('heavy_hitters') is not None:
+                accumulator.heavy_hitters = HeavyHitters.from_state(state['heavy_hitters'])
+            else:
+                accumulator.heavy_hitters = HeavyHitters(accumulator.capacity)
+                accumulator.heavy_hitters.n = accumulator.heavy_hitters.discarded = accumulator.count
+        else:
+            accumulator.value_counts = pd.Series(state['counts'], index=np.asarray(state['values'], dtype=np.float64),
+                                                 dtype=np.int64)
+        accumulator.sketch = KLLSketch.from_state(state['sketch'])
+        return accumulator
+
+    def to_dict(self) -> Dict:
+        """
+        Retorna el mismo diccionario que calculate_all_statistics
+        """
+        if self.value_counts is not None and self.count > 0:
+            central, dispersion = summarize_counts(self.value_counts.index.to_numpy(), self.value_counts.to_numpy())
+        else:
+            central, dispersion = summarize_moments(self.count, self.mean, self.m2, self.minimum, self.maximum)
+            if self.count > 0:
+                central['mediana'] = self.sketch.quantile(0.5)
+                dispersion['q1'] = self.sketch.quantile(0.25)
+                dispersion['q3'] = self.sketch.quantile(0.75)
+                dispersion['rango_intercuartil'] = dispersion['q3'] - dispersion['q1']
+                mode, frequency = self.heavy_hitters.mode()
+                central['moda'] = None if mode is None else float(mode)
+                central['frecuencia_moda'] = frequency
+                central['error_moda'] = self.heavy_hitters.error_bound
+
+        return {
+            'tendencia_central': central,
+            'dispersion': dispersion,
+            'n': self.n
+        }
@@ -1,89 +1,287 @@
 import numpy as np
 import pandas as pd
-from scipy import stats
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Tuple
 
-def calculate_central_tendency(data: Union[List, pd.Series]) -> Dict:
+from instrumentation import instrumented
+
+EMPTY_CENTRAL = {
+    'media': None,
+    'mediana': None,
+    'moda': None,
+    'frecuencia_moda': 0
+}
+
+EMPTY_DISPERSION = {
+    'rango': None,
+    'varianza': None,
+    'desviacion_estandar': None,
+    'minimo': None,
+    'maximo': None,
+    'q1': None,
+    'q3': None,
+    'rango_intercuartil': None,
+    'coeficiente_variacion': None
+}
+
+MOMENT_BLOCK = 1 << 16
+
+def working_dtype(dtype) -> np.dtype:
     """
-    Calcula las medidas de tendencia central: media, mediana y moda
+    Tipo con el que se ordenan los valores: float32 se conserva (modo compacto) y los enteros de hasta
+    16 bits pasan a float32 sin pérdida; todo lo demás se convierte a float64
+    """
+    if isinstance(dtype, np.dtype) and (dtype == np.float32 or (dtype.kind in 'iub' and dtype.itemsize <= 2)):
+        return np.dtype(np.float32)
+    return np.dtype(np.float64)
+
+def mean_and_m2(values: np.ndarray) -> Tuple[float, float]:
+    """
+    Media y suma de cuadrados de las desviaciones (M2), siempre acumuladas en float64
+
+    Con float64 es una sola pasada vectorizada. Con arreglos compactos (float32) la media usa un
+    acumulador float64 y M2 se recorre por bloques de MOMENT_BLOCK valores convertidos a float64,
+    de modo que nunca se crea una copia float64 del arreglo completo.
+    """
+    if values.dtype == np.float64:
+        mean = float(np.mean(values))
+        deviations = values - mean
+        return mean, float(np.dot(deviations, deviations))
+
+    mean = float(np.mean(values, dtype=np.float64))
+    m2 = 0.0
+    for start in range(0, len(values), MOMENT_BLOCK):
+        deviations = values[start:start + MOMENT_BLOCK].astype(np.float64)
+        deviations -= mean
+        m2 += float(np.dot(deviations, deviations))
+    return mean, m2
+
+def to_sorted_array(data: Union[List, pd.Series]) -> np.ndarray:
     """
+    Convierte los datos a numérico una sola vez y retorna un arreglo ordenado sin nulos
+
+    Con un CleaningContext (o cualquier objeto con sorted_values) reutiliza su arreglo ya ordenado.
+    Los datos compactos (float32) se ordenan sin convertirlos a float64; ver working_dtype.
+    """
+    if hasattr(data, 'sorted_values'):
+        return data.sorted_values
     if isinstance(data, list):
         data = pd.Series(data)
-    
+
     try:
         data_numeric = pd.to_numeric(data, errors='coerce').dropna()
     except:
         data_numeric = data
+
+    return np.sort(np.asarray(data_numeric, dtype=working_dtype(getattr(data_numeric, 'dtype', np.float64))))
+
+def _lerp(a: float, b: float, weight: float) -> float:
+    """
+    Interpolación lineal con la misma fórmula que np.percentile
+    """
+    if weight >= 0.5:
+        return float(b - (b - a) * (1 - weight))
+    return float(a + (b - a) * weight)
+
+def sorted_quantile(sorted_values: np.ndarray, q: float) -> float:
+    """
+    Percentil con interpolación lineal (igual que np.percentile) sobre un arreglo ya ordenado
+    """
+    position = (len(sorted_values) - 1) * q
+    lower = int(np.floor(position))
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return _lerp(float(sorted_values[lower]), float(sorted_values[upper]), position - lower)
+
+def _sorted_mode(sorted_values: np.ndarray) -> Tuple[float, int]:
+    """
+    Moda de un arreglo ordenado mediante longitudes de corrida; en empate retorna el menor valor
+    """
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_values)) + 1))
+    counts = np.diff(np.append(starts, len(sorted_values)))
+    best = int(np.argmax(counts))
+    return float(sorted_values[starts[best]]), int(counts[best])
+
+def summarize_moments(n: int, mean: float, m2: float, minimum: float, maximum: float) -> Tuple[Dict, Dict]:
+    """
+    Construye los diccionarios de resultados a partir de momentos (n, media, M2, mínimo, máximo)
     
-    result = {}
-    
-    if len(data_numeric) > 0:
-        result['media'] = float(np.mean(data_numeric))
-        result['mediana'] = float(np.median(data_numeric))
-        
-        mode_result = stats.mode(data_numeric, keepdims=True)
-        if len(mode_result.mode) > 0:
-            result['moda'] = float(mode_result.mode[0])
-            result['frecuencia_moda'] = int(mode_result.count[0])
-        else:
-            result['moda'] = None
-            result['frecuencia_moda'] = 0
+    Mediana, cuartiles y moda quedan en None para que el llamador los complete.
+    """
+    if n == 0:
+        return dict(EMPTY_CENTRAL), dict(EMPTY_DISPERSION)
+
+    variance = m2 / (n - 1) if n > 1 else float('nan')
+    std = float(np.sqrt(variance))
+
+    central = dict(EMPTY_CENTRAL)
+    central['media'] = float(mean)
+
+    dispersion = dict(EMPTY_DISPERSION)
+    dispersion.update({
+        'rango': float(maximum - minimum),
+        'varianza': float(variance),
+        'desviacion_estandar': std,
+        'minimo': float(minimum),
+        'maximo': float(maximum),
+        'coeficiente_variacion': (std / mean * 100) if mean != 0 else None
+    })
+    return central, dispersion
+
+def _fill_quantiles(central: Dict, dispersion: Dict, median: float, q1: float, q3: float) -> None:
+    central['mediana'] = median
+    dispersion['q1'] = q1
+    dispersion['q3'] = q3
+    dispersion['rango_intercuartil'] = q3 - q1
+
+def summarize_sorted(sorted_values: np.ndarray) -> Tuple[Dict, Dict]:
+    """
+    Calcula tendencia central y dispersión a partir de un arreglo ordenado con una sola pasada de momentos
+    """
+    n = len(sorted_values)
+    if n == 0:
+        return dict(EMPTY_CENTRAL), dict(EMPTY_DISPERSION)
+
+    mean, m2 = mean_and_m2(sorted_values)
+
+    central, dispersion = summarize_moments(n, mean, m2, float(sorted_values[0]), float(sorted_values[-1]))
+    _fill_quantiles(
+        central, dispersion,
+        sorted_quantile(sorted_values, 0.5),
+        sorted_quantile(sorted_values, 0.25),
+        sorted_quantile(sorted_values, 0.75)
+    )
+    central['moda'], central['frecuencia_moda'] = _sorted_mode(sorted_values)
+    return central, dispersion
+
+def quantile_from_counts(values: np.ndarray, cumulative: np.ndarray, q: float) -> float:
+    """
+    Percentil con interpolación lineal sobre valores distintos ordenados y sus conteos acumulados
+
+    Los conteos pueden ser pesos de frecuencia no enteros: n es la suma de los pesos.
+    """
+    n = cumulative[-1]
+    position = (n - 1) * q
+    lower = int(np.floor(position))
+    upper = min(lower + 1, int(np.ceil(n)) - 1)
+    indices = np.searchsorted(cumulative, [lower, upper], side='right')
+    np.minimum(indices, len(values) - 1, out=indices)
+    return _lerp(float(values[indices[0]]), float(values[indices[1]]), position - lower)
+
+def weights_array(weights: Union[List, pd.Series, np.ndarray], length: int) -> np.ndarray:
+    """
+    Convierte los pesos (frecuencias) a un arreglo: int64 si todos son enteros, float64 si no
+
+    Los pesos nulos o no numéricos cuentan como 0. Un peso negativo o una longitud distinta de la de
+    los datos es un error.
+    """
+    weights = pd.to_numeric(pd.Series(np.asarray(weights)), errors='coerce')
+    if len(weights) != length:
+        raise ValueError("Los datos y los pesos deben tener la misma longitud")
+    if weights.dtype.kind in 'iub':
+        weights = weights.to_numpy(dtype=np.int64)
     else:
-        result = {
-            'media': None,
-            'mediana': None,
-            'moda': None,
-            'frecuencia_moda': 0
-        }
+        weights = np.nan_to_num(weights.to_numpy(dtype=np.float64, na_value=np.nan), nan=0.0)
+        if np.array_equal(weights, np.trunc(weights)) and (len(weights) == 0 or np.abs(weights).max() < 2 ** 53):
+            weights = weights.astype(np.int64)
+    if (weights < 0).any():
+        raise ValueError("Los pesos no pueden ser negativos")
+    return weights
+
+def aggregate_weights(data: Union[List, pd.Series, np.ndarray],
+                      weights: Union[List, pd.Series, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Valores distintos ordenados y la suma de sus pesos a partir de pares (valor, peso)
+
+    Se descartan los valores nulos o no numéricos y los pesos nulos o cero. Una tabla de frecuencias
+    (valor, conteo) queda en O(valores distintos) sin expandir las observaciones; los conteos enteros se
+    suman en int64, exactos aun con miles de millones de observaciones.
+    """
+    numeric = pd.to_numeric(pd.Series(np.asarray(data, dtype=object) if isinstance(data, list) else np.asarray(data)),
+                            errors='coerce')
+    values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+    weights = weights_array(weights, len(values))
+    keep = ~np.isnan(values) & (weights > 0)
+    values, weights = values[keep], weights[keep]
+    order = np.argsort(values, kind='stable')
+    values, weights = values[order], weights[order]
+    if len(values) == 0:
+        return values, weights
+    starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+    return values[starts], np.add.reduceat(weights, starts)
+
+def summarize_counts(values: np.ndarray, counts: np.ndarray) -> Tuple[Dict, Dict]:
+    """
+    Calcula las estadísticas exactas a partir de valores y su frecuencia (o peso de frecuencia)
     
-    return result
+    Equivale a summarize_sorted sobre los datos expandidos, pero en O(valores distintos). Los valores
+    repetidos se suman en una sola entrada. Con pesos no enteros n es la suma de los pesos.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    counts = np.asarray(counts)
+    counts = counts.astype(np.float64 if counts.dtype.kind == 'f' else np.int64, copy=False)
+    keep = counts > 0
+    values, counts = values[keep], counts[keep]
+    if len(values) == 0:
+        return dict(EMPTY_CENTRAL), dict(EMPTY_DISPERSION)
+
+    order = np.argsort(values, kind='stable')
+    values, counts = values[order], counts[order]
+    starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+    if len(starts) < len(values):
+        values, counts = values[starts], np.add.reduceat(counts, starts)
+    n = counts.sum().item()
+    mean = float(np.dot(values, counts) / n)
+    deviations = values - mean
+    m2 = float(np.dot(deviations * deviations, counts))
+
+    central, dispersion = summarize_moments(n, mean, m2, values[0], values[-1])
+    cumulative = np.cumsum(counts)
+    _fill_quantiles(
+        central, dispersion,
+        quantile_from_counts(values, cumulative, 0.5),
+        quantile_from_counts(values, cumulative, 0.25),
+        quantile_from_counts(values, cumulative, 0.75)
+    )
+    best = int(np.argmax(counts))
+    central['moda'] = float(values[best])
+    central['frecuencia_moda'] = counts[best].item()
+    return central, dispersion
 
-def calculate_dispersion(data: Union[List, pd.Series]) -> Dict:
+def calculate_central_tendency(data: Union[List, pd.Series], weights: Union[List, pd.Series] = None) -> Dict:
+    """
+    Calcula las medidas de tendencia central: media, mediana y moda
+    """
+    if weights is not None:
+        return summarize_counts(*aggregate_weights(data, weights))[0]
+    return summarize_sorted(to_sorted_array(data))[0]
+
+def calculate_dispersion(data: Union[List, pd.Series], weights: Union[List, pd.Series] = None) -> Dict:
     """
     Calcula las medidas de dispersión: rango, desviación estándar y varianza
     """
-    if isinstance(data, list):
-        data = pd.Series(data)
-    
-    try:
-        data_numeric = pd.to_numeric(data, errors='coerce').dropna()
-    except:
-        data_numeric = data
-    
-    result = {}
-    
-    if len(data_numeric) > 0:
-        result['rango'] = float(np.max(data_numeric) - np.min(data_numeric))
-        result['varianza'] = float(np.var(data_numeric, ddof=1))
-        result['desviacion_estandar'] = float(np.std(data_numeric, ddof=1))
-        result['minimo'] = float(np.min(data_numeric))
-        result['maximo'] = float(np.max(data_numeric))
-        result['q1'] = float(np.percentile(data_numeric, 25))
-        result['q3'] = float(np.percentile(data_numeric, 75))
-        result['rango_intercuartil'] = result['q3'] - result['q1']
-        result['coeficiente_variacion'] = (result['desviacion_estandar'] / calculate_central_tendency(data_numeric)['media'] * 100) if calculate_central_tendency(data_numeric)['media'] != 0 else None
-    else:
-        result = {
-            'rango': None,
-            'varianza': None,
-            'desviacion_estandar': None,
-            'minimo': None,
-            'maximo': None,
-            'q1': None,
-            'q3': None,
-            'rango_intercuartil': None,
-            'coeficiente_variacion': None
-        }
-    
-    return result
+    if weights is not None:
+        return summarize_counts(*aggregate_weights(data, weights))[1]
+    return summarize_sorted(to_sorted_array(data))[1]
 
-def calculate_all_statistics(data: Union[List, pd.Series]) -> Dict:
+@instrumented
+def calculate_all_statistics(data: Union[List, pd.Series], weights: Union[List, pd.Series] = None) -> Dict:
     """
-    Calcula todas las estadísticas descriptivas
+    Calcula todas las estadísticas descriptivas (conversión y ordenamiento una sola vez)
+
+    Con el CleaningContext de clean_data_context no se vuelve a convertir ni a ordenar. Con weights
+    cada valor de data cuenta weights veces (p. ej. una tabla valor, conteo): las estadísticas salen
+    de summarize_counts en O(valores distintos) y n es la suma de los pesos.
     """
-    central = calculate_central_tendency(data)
-    dispersion = calculate_dispersion(data)
-    
+    if weights is not None:
+        values, counts = aggregate_weights(data, weights)
+        central, dispersion = summarize_counts(values, counts)
+        return {
+            'tendencia_central': central,
+            'dispersion': dispersion,
+            'n': counts.sum().item()
+        }
+
+    central, dispersion = summarize_sorted(to_sorted_array(data))
+
     return {
         'tendencia_central': central,
         'dispersion': dispersion,
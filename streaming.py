@@ -0,0 +1,173 @@
+import io
+import os
+import numpy as np
+import pandas as pd
+from typing import Iterator, Dict
+
+from data_processor import (load_data_from_text, build_interval_table, build_category_table, sturges_bins,
+                            integer_counts, table_from_integer_counts)
+from stats_accumulator import StatisticsAccumulator
+from columnar_io import COLUMNAR_TYPES, iter_columnar_chunks
+
+DEFAULT_CHUNKSIZE = 100_000
+TEXT_CHARS_PER_VALUE = 8
+
+def iter_column_chunks(file, file_type: str, column=None, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.Series]:
+    """
+    Lee un archivo por bloques y entrega solo la columna seleccionada de cada bloque
+
+    Si no se indica columna se usa la primera. La memoria usada es proporcional a chunksize, salvo en
+    .xls: el formato antiguo de Excel no se puede leer por partes y el archivo se carga completo en un
+    solo bloque. Los .txt se leen en bloques de chunksize * TEXT_CHARS_PER_VALUE caracteres (ver
+    _iter_text_chunks), de modo que un archivo de una sola línea también se divide.
+    """
+    try:
+        if file_type == 'csv':
+            usecols = [column] if column is not None else [0]
+            for chunk in pd.read_csv(file, usecols=usecols, chunksize=chunksize):
+                yield chunk.iloc[:, 0]
+        elif file_type == 'txt':
+            is_path = isinstance(file, (str, os.PathLike))
+            text = open(file, encoding='utf-8') if is_path else io.TextIOWrapper(file, encoding='utf-8')
+            try:
+                yield from _iter_text_chunks(text, chunksize * TEXT_CHARS_PER_VALUE)
+            finally:
+                text.close() if is_path else text.detach()
+        elif file_type == 'xlsx':
+            yield from _iter_xlsx_chunks(file, column, chunksize)
+        elif file_type in COLUMNAR_TYPES:
+            yield from iter_columnar_chunks(file, file_type, column, chunksize)
+        elif file_type == 'xls':
+            usecols = [column] if column is not None else [0]
+            yield pd.read_excel(file, usecols=usecols).iloc[:, 0]
+        else:
+            raise ValueError(f"Tipo de archivo no soportado: {file_type}")
+    except Exception as e:
+        raise ValueError(f"Error al cargar el archivo: {str(e)}")
+
+def _iter_text_chunks(text, block_chars: int) -> Iterator[pd.Series]:
+    """
+    Lee el texto en bloques de block_chars caracteres y corta cada uno en el último separador
+
+    Se corta preferentemente en el último salto de línea y, si no hay, en la última coma, punto y coma o
+    tabulación; los espacios solo separan valores (y sirven de corte) mientras no haya aparecido
+    ninguno de esos delimitadores, como en load_data_from_text. Lo que sigue al corte pasa al bloque
+    siguiente para no partir un valor.
+    """
+    pending = ''
+    delimited = False
+    while True:
+        block = text.read(block_chars)
+        pending += block
+        if not block:
+            break
+        delimited = delimited or any(delimiter in block for delimiter in (',', ';', '\t'))
+        cut = -1
+        for separators in (('\n',), (',', ';', '\t') if delimited else (' ',)):
+            cut = max(pending.rfind(separator) for separator in separators)
+            if cut >= 0:
+                break
+        if cut < 0:
+            continue
+        head, pending = pending[:cut + 1], pending[cut + 1:]
+        if head.strip():
+            yield load_data_from_text(head)['valores']
+    if pending.strip():
+        yield load_data_from_text(pending)['valores']
+
+def _iter_xlsx_chunks(file, column, chunksize: int) -> Iterator[pd.Series]:
+    """
+    Recorre una hoja de Excel en modo de solo lectura de openpyxl, fila por fila
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        index = 0 if column is None else list(header).index(column)
+        name = header[index]
+        values = []
+        for row in rows:
+            values.append(row[index] if index < len(row) else None)
+            if len(values) >= chunksize:
+                yield pd.Series(values, name=name)
+                values = []
+        if values:
+            yield pd.Series(values, name=name)
+    finally:
+        workbook.close()
+
+def _numeric_chunk(chunk: pd.Series) -> np.ndarray:
+    return pd.to_numeric(chunk, errors='coerce').dropna().to_numpy(dtype=np.float64)
+
+def analyze_file_streaming(file, file_type: str, column=None, is_quantitative: bool = True,
+                           bins: int = None, chunksize: int = DEFAULT_CHUNKSIZE) -> Dict:
+    """
+    Calcula estadísticas y tabla de frecuencias de una columna leyendo el archivo por bloques
+
+    Datos cuantitativos: una pasada con StatisticsAccumulator y otra (con bordes fijos) para el
+    histograma, por lo que el archivo debe permitir seek(0). Mientras los bloques sean enteros de rango
+    acotado la segunda pasada usa np.bincount, como create_frequency_table. Datos cualitativos: una sola
+    pasada de conteos; como en create_frequency_table, las frecuencias relativas se calculan sobre todas
+    las filas (incluidos los nulos). 'n' cuenta todas las filas y 'validos' las que entran en la tabla.
+    """
+    if not is_quantitative:
+        total_rows = 0
+        counts = pd.Series(dtype=np.int64)
+        for chunk in iter_column_chunks(file, file_type, column, chunksize):
+            total_rows += len(chunk)
+            counts = counts.add(chunk.dropna().value_counts(), fill_value=0)
+        counts = counts.astype(np.int64).sort_index()
+        return {
+            'freq_table': build_category_table(counts, total_rows),
+            'statistics': None,
+            'n': total_rows,
+            'validos': int(counts.sum())
+        }
+
+    accumulator = StatisticsAccumulator()
+    for chunk in iter_column_chunks(file, file_type, column, chunksize):
+        accumulator.update(chunk)
+
+    statistics = accumulator.to_dict()
+
+    if accumulator.count == 0:
+        return {'freq_table': None, 'statistics': statistics, 'n': accumulator.n, 'validos': 0}
+
+    if bins is None:
+        bins = sturges_bins(accumulator.count)
+    bin_edges = np.histogram_bin_edges([accumulator.minimum, accumulator.maximum], bins=bins)
+    freq = np.zeros(bins, dtype=np.int64)
+    counts = None
+    discrete = True
+
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    for chunk in iter_column_chunks(file, file_type, column, chunksize):
+        values = _numeric_chunk(chunk)
+        if discrete:
+            chunk_counts = integer_counts(values, accumulator.minimum, accumulator.maximum)
+            if chunk_counts is not None or len(values) == 0:
+                if chunk_counts is not None:
+                    counts = chunk_counts if counts is None else counts + chunk_counts
+                continue
+            discrete = False
+            if counts is not None:
+                present = np.flatnonzero(counts)
+                freq += np.histogram(present + accumulator.minimum, bins=bin_edges, weights=counts[present])[0].astype(np.int64)
+        freq += np.histogram(values, bins=bin_edges)[0]
+
+    if discrete and counts is not None:
+        freq_table = table_from_integer_counts(counts, accumulator.minimum, bins)
+    else:
+        freq_table = build_interval_table(freq, bin_edges, accumulator.count)
+
+    return {
+        'freq_table': freq_table,
+        'statistics': statistics,
+        'n': accumulator.n,
+        'validos': accumulator.count
+    }
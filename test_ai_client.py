@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.pop('OPENAI_API_KEY', None)
+
+import ai_helper
+from ai_helper import configure_openai_client, configure_response_cache, get_response_cache, get_openai_client, detect_data_type, interpret_statistics_async
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DEL CLIENTE DE IA CONTRA UN SERVIDOR LOCAL SIMULADO")
+print("=" * 60)
+
+STUB_CONTENT = json.dumps({"tipo": "cuantitativo", "razon": "Respuesta simulada", "subtipo": "discreto"})
+stub_state = {'delay': 0.0, 'ports': set(), 'requests': 0}
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        stub_state['requests'] += 1
+        stub_state['ports'].add(self.client_address[1])
+        time.sleep(stub_state['delay'])
+        body = json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": "gpt-5",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": STUB_CONTENT}}]
+        }).encode('utf-8')
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+configure_openai_client(api_key='sk-test', base_url=f"http://127.0.0.1:{server.server_address[1]}/v1", timeout=5)
+cache_dir = tempfile.mkdtemp()
+configure_response_cache(os.path.join(cache_dir, 'respuestas.sqlite'))
+
+result = detect_data_type([1, 2, 3, 4])
+check("detect_data_type usa la respuesta del servidor", result.get('razon') == "Respuesta simulada")
+check("El cliente se reutiliza entre llamadas", get_openai_client() is get_openai_client())
+
+future = interpret_statistics_async({'tendencia_central': {'media': 1.0}, 'dispersion': {}, 'n': 1}, 'cuantitativo')
+check("interpret_statistics_async retorna un Future", not isinstance(future, str))
+check("El Future entrega la interpretación", future.result(timeout=10) == STUB_CONTENT)
+
+detect_data_type([5, 6, 7])
+check("Conexión keep-alive reutilizada", len(stub_state['ports']) == 1)
+
+print("\n💾 Probando caché persistente de respuestas...")
+requests_before = stub_state['requests']
+start = time.time()
+cached = detect_data_type([1, 2, 3, 4])
+check(f"Muestra repetida servida desde caché sin red ({(time.time() - start) * 1000:.1f} ms)",
+      cached == result and stub_state['requests'] == requests_before)
+configure_response_cache(os.path.join(cache_dir, 'respuestas.sqlite'))
+interpret_statistics_async({'tendencia_central': {'media': 1.00000001}, 'dispersion': {}, 'n': 1}, 'cuantitativo').result(timeout=10)
+check("La caché persiste al reabrirla y usa estadísticas redondeadas",
+      stub_state['requests'] == requests_before and get_response_cache().hits == 1)
+
+print("\n⏱️ Probando tiempo límite con un servidor lento...")
+configure_openai_client(timeout=0.5)
+stub_state['delay'] = 3.0
+stats = {'tendencia_central': {'media': 10.0}, 'dispersion': {'desviacion_estandar': 2.0}, 'n': 5}
+start = time.time()
+interpretation = interpret_statistics_async(stats, 'cuantitativo').result(timeout=15)
+elapsed = time.time() - start
+check(f"Respaldo sin IA tras el tiempo límite ({elapsed:.1f}s)", elapsed < 5 and interpretation == ai_helper._fallback_interpretation(stats, 'cuantitativo'))
+
+server.shutdown()
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DEL CLIENTE DE IA PASARON EXITOSAMENTE")
+print("=" * 60)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import batch_analysis
+from batch_analysis import profile_dataframe
+from stats_utils import calculate_all_statistics
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DE ANÁLISIS DE TODAS LAS COLUMNAS")
+print("=" * 60)
+
+rng = np.random.default_rng(7)
+df = pd.DataFrame({
+    'Edad': rng.integers(18, 60, 20_000),
+    'Altura': rng.normal(170, 8, 20_000),
+    'Color': rng.choice(['Azul', 'Rojo', 'Verde'], 20_000)
+})
+df.loc[::10, 'Altura'] = np.nan
+
+serial = profile_dataframe(df, max_workers=1)
+summary = serial['resumen'].set_index('Columna')
+expected = calculate_all_statistics(df['Altura'].dropna())
+check("Una fila por columna", list(serial['resumen']['Columna']) == list(df.columns))
+check("Media de Altura igual a calculate_all_statistics", abs(summary.loc['Altura', 'Media'] - expected['tendencia_central']['media']) < 1e-9)
+check("Nulos contados por separado", summary.loc['Altura', 'Nulos'] == 2000 and summary.loc['Altura', 'N'] == 18_000)
+check("Columna cualitativa con número de categorías", summary.loc['Color', 'Categorías'] == 3)
+
+print("\n⚙️ Probando ejecución con procesos y memoria compartida...")
+batch_analysis.PARALLEL_MIN_CELLS = 0
+parallel = profile_dataframe(df, max_workers=2)
+check("Mismo resumen que la ejecución en serie", parallel['resumen'].equals(serial['resumen']))
+check("Mismas tablas de frecuencia", all(parallel['tablas'][name].equals(table) for name, table in serial['tablas'].items()))
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE ANÁLISIS POR COLUMNAS PASARON EXITOSAMENTE")
+print("=" * 60)
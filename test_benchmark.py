@@ -0,0 +1,31 @@
+from benchmark import run_benchmarks, compare_results, GENERATORS
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DEL BANCO DE PRUEBAS DE RENDIMIENTO")
+print("=" * 60)
+
+print("\n🎲 Generadores sintéticos...")
+for kind, generator in GENERATORS.items():
+    check(f"{kind}: reproducible con la misma semilla", generator(1000, 4).equals(generator(1000, 4)))
+
+print("\n⏱️ Ejecución mínima de todas las etapas...")
+results = run_benchmarks([500], repeats=1, verbose=False)
+stages = {row['etapa'] for row in results}
+expected = {'load_data_from_text', 'load_data_from_file[csv]', 'clean_data', 'create_frequency_table',
+            'calculate_all_statistics', 'create_histogram', 'create_box_plot', 'create_bar_chart',
+            'create_pie_chart', 'create_frequency_bar_chart'}
+check("Se miden carga, limpieza, tablas, estadísticas y gráficos", expected <= stages)
+check("Tiempos y memoria registrados", all(row['segundos'] > 0 and row['memoria_pico_mb'] >= 0 for row in results))
+
+print("\n📉 Comparación con una línea base...")
+slower = [dict(row, segundos=row['segundos'] * 2) for row in results]
+comparison = compare_results(slower, results, tolerance=1.25)
+check("Una etapa dos veces más lenta se marca como regresión", all(row['regresion'] for row in comparison))
+check("Sin cambios no hay regresiones", not any(row['regresion'] for row in compare_results(results, results)))
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DEL BANCO DE PRUEBAS PASARON EXITOSAMENTE")
+print("=" * 60)
@@ -33,6 +33,12 @@ print(f"   Media esperada: {expected_mean:.2f} | Calculada: {stats['tendencia_ce
 print(f"   Mediana esperada: {expected_median:.2f} | Calculada: {stats['tendencia_central']['mediana']:.2f} | ✓" if abs(expected_median - stats['tendencia_central']['mediana']) < 0.01 else " ✗")
 print(f"   Desv. Est. esperada: {expected_std:.2f} | Calculada: {stats['dispersion']['desviacion_estandar']:.2f} | ✓" if abs(expected_std - stats['dispersion']['desviacion_estandar']) < 0.01 else " ✗")
 
+expected_q1 = np.percentile(test_data_quantitative, 25)
+expected_q3 = np.percentile(test_data_quantitative, 75)
+print(f"   Q1 esperado: {expected_q1:.2f} | Calculado: {stats['dispersion']['q1']:.2f} | ✓" if abs(expected_q1 - stats['dispersion']['q1']) < 0.01 else " ✗")
+print(f"   Q3 esperado: {expected_q3:.2f} | Calculado: {stats['dispersion']['q3']:.2f} | ✓" if abs(expected_q3 - stats['dispersion']['q3']) < 0.01 else " ✗")
+print(f"   Moda esperada: 20.00 (frecuencia 3) | Calculada: {stats['tendencia_central']['moda']:.2f} (frecuencia {stats['tendencia_central']['frecuencia_moda']}) | ✓" if stats['tendencia_central']['moda'] == 20 and stats['tendencia_central']['frecuencia_moda'] == 3 else " ✗")
+
 print("\n" + "=" * 60)
 print("PRUEBA DE TABLA DE FRECUENCIAS")
 print("=" * 60)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from data_processor import clean_data, clean_data_context, CleaningContext, OUTLIER_THRESHOLDS
+from stats_utils import calculate_all_statistics
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DE LIMPIEZA Y VALORES ATÍPICOS")
+print("=" * 60)
+
+def reference_iqr(data: pd.Series) -> pd.Series:
+    numeric = pd.to_numeric(data.dropna(), errors='coerce').dropna()
+    q1, q3 = numeric.quantile(0.25), numeric.quantile(0.75)
+    iqr = q3 - q1
+    return numeric[(numeric >= q1 - 1.5 * iqr) & (numeric <= q3 + 1.5 * iqr)]
+
+rng = np.random.default_rng(5)
+data = pd.Series(np.concatenate([rng.normal(100, 10, 20_000), [400, -200, 350], [np.nan] * 5]))
+data.iloc[::1000] = np.nan
+
+print("\n📦 Método IQR...")
+context = clean_data_context(data, remove_outliers=True)
+expected = reference_iqr(data)
+check("Mismos datos (y orden) que con dos quantile y una máscara", clean_data(data, remove_outliers=True).equals(expected))
+check("Conteo de atípicos eliminados", context.removed == data.notna().sum() - len(expected))
+check("Conteo de nulos", context.nulls == int(data.isna().sum()))
+check("El arreglo ordenado es una vista, sin copia adicional", context.sorted_values.base is not None)
+check("Estadísticas iguales reutilizando el contexto",
+      calculate_all_statistics(context) == calculate_all_statistics(expected))
+check("Cuartiles del contexto", np.isclose(context.q1, expected.quantile(0.25)) and np.isclose(context.q3, expected.quantile(0.75)))
+
+print("\n🛡️ Métodos robustos alternativos...")
+values = pd.Series([10, 11, 12, 11, 10, 12, 13, 11, 95, 10.5, 11.5, 12.5])
+for method in ['mad', 'zscore', 'percentil']:
+    cleaned = clean_data(values, remove_outliers=True, method=method)
+    check(f"{method}: elimina el valor 95", 95 not in cleaned.values and len(cleaned) == len(values) - 1)
+mad = clean_data_context(data, remove_outliers=True, method='mad')
+median = np.nanmedian(data)
+scale = np.nanmedian(np.abs(data - median)) / 0.6745
+check("MAD: límites mediana ± 3.5·MAD/0.6745", np.allclose(mad.bounds, (median - 3.5 * scale, median + 3.5 * scale)))
+zscore = clean_data_context(data, remove_outliers=True, method='zscore', threshold=2)
+check("z: umbral configurable", np.allclose(zscore.bounds, (np.nanmean(data) - 2 * np.nanstd(data, ddof=1),
+                                                            np.nanmean(data) + 2 * np.nanstd(data, ddof=1))))
+trimmed = clean_data_context(data, remove_outliers=True, method='percentil', threshold=5)
+check("Percentil: recorta cerca del 5% por extremo", abs(trimmed.removed / data.notna().sum() - 0.10) < 0.001)
+constant = clean_data_context(pd.Series([5.0] * 10 + [6.0]), remove_outliers=True, method='mad')
+check("Escala cero: no se elimina nada", constant.removed == 0)
+check("Umbrales por defecto documentados", OUTLIER_THRESHOLDS == {'iqr': 1.5, 'mad': 3.5, 'zscore': 3.0, 'percentil': 1.0})
+
+print("\n🧹 Sin eliminar atípicos y datos no numéricos...")
+plain = clean_data_context(data)
+check("Solo quita nulos", isinstance(plain, CleaningContext) and plain.data.equals(data.dropna()) and plain.removed == 0)
+check("Estadísticas iguales con el contexto", calculate_all_statistics(plain) == calculate_all_statistics(data.dropna()))
+colors = pd.Series(['Rojo', None, 'Azul', 'Rojo'])
+check("Categóricos: no se vacían al pedir atípicos", list(clean_data(colors, remove_outliers=True)) == ['Rojo', 'Azul', 'Rojo'])
+try:
+    clean_data(data, remove_outliers=True, method='desconocido')
+    check("Método desconocido rechazado", False)
+except ValueError:
+    check("Método desconocido rechazado", True)
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE LIMPIEZA PASARON EXITOSAMENTE")
+print("=" * 60)
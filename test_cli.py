@@ -0,0 +1,143 @@
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from main import main
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DE LA LÍNEA DE COMANDOS (SIN INTERFAZ)")
+print("=" * 60)
+
+work_dir = tempfile.mkdtemp()
+input_dir = os.path.join(work_dir, 'datos')
+os.makedirs(input_dir)
+rng = np.random.default_rng(3)
+pd.DataFrame({
+    'Edad': rng.integers(18, 30, 400),
+    'Color': rng.choice(['Azul', 'Rojo'], 400)
+}).to_csv(os.path.join(input_dir, 'encuesta.csv'), index=False)
+pd.DataFrame({'Altura': rng.normal(170, 5, 300)}).to_csv(os.path.join(input_dir, 'alturas.csv'), index=False)
+
+print("\n📄 Un archivo en JSON con gráficos...")
+out_json = os.path.join(work_dir, 'json')
+code = main([os.path.join(input_dir, 'encuesta.csv'), '-o', out_json, '--no-ai', '--graficos', '-w', '2'])
+with open(os.path.join(out_json, 'resultados.json'), encoding='utf-8') as handle:
+    report = json.load(handle)
+columns = {c['columna']: c for c in report['columnas']}
+check("Código de salida 0", code == 0)
+check("Edad detectada como cuantitativa", columns['Edad']['tipo']['tipo'] == 'cuantitativo')
+check("Color detectada como cualitativa", columns['Color']['tipo']['tipo'] == 'cualitativo')
+check("Tabla de frecuencias de Color suma 400",
+      sum(row['Frecuencia Absoluta'] for row in columns['Color']['tabla_frecuencias']) == 400)
+check("Gráficos HTML exportados", all(os.path.exists(p) for p in columns['Edad']['graficos']) and columns['Edad']['graficos'])
+
+print("\n📁 Directorio completo en CSV con varios procesos...")
+out_csv = os.path.join(work_dir, 'csv')
+code = main([input_dir, '-o', out_csv, '-f', 'csv', '--no-ai', '-w', '2'])
+combined = pd.read_csv(os.path.join(out_csv, 'resumen_general.csv'))
+check("Código de salida 0", code == 0)
+check("Resumen general con las tres columnas", sorted(combined['Columna']) == ['Altura', 'Color', 'Edad'])
+check("Tabla de frecuencias por columna", os.path.exists(os.path.join(out_csv, 'encuesta', 'frecuencias', 'Edad.csv')))
+
+print("\n🗂️ Archivos homónimos en subcarpetas...")
+months_dir = os.path.join(work_dir, 'meses')
+for month, mean in (('enero', 10), ('febrero', 50)):
+    os.makedirs(os.path.join(months_dir, month))
+    pd.DataFrame({'Ventas': rng.normal(mean, 1, 50)}).to_csv(os.path.join(months_dir, month, 'ventas.csv'), index=False)
+out_months = os.path.join(work_dir, 'meses_salida')
+code = main([months_dir, '-o', out_months, '--no-ai', '-w', '1'])
+month_means = {}
+for month in ('enero', 'febrero'):
+    path = os.path.join(out_months, f"{month}_ventas_csv", 'resultados.json')
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as handle:
+            month_means[month] = json.load(handle)['columnas'][0]['estadisticas']['tendencia_central']['media']
+check("Código de salida 0", code == 0)
+check("Una carpeta de salida por archivo, sin sobrescribir", len(month_means) == 2 and
+      month_means['enero'] < 20 < month_means['febrero'])
+
+print("\n🧱 Lectura por bloques...")
+chunked_input = os.path.join(work_dir, 'con_nulos.csv')
+with_nulls = pd.DataFrame({'Edad': rng.integers(18, 60, 3000).astype(float), 'Color': rng.choice(['Azul', 'Rojo'], 3000)})
+with_nulls.loc[::40, 'Edad'] = np.nan
+with_nulls.loc[::70, 'Color'] = None
+with_nulls.to_csv(chunked_input, index=False)
+reports = {}
+for mode, extra in (('memoria', []), ('bloques', ['--bloques', '700'])):
+    main([chunked_input, '-o', os.path.join(work_dir, mode), '--no-ai', '-w', '1'] + extra)
+    with open(os.path.join(work_dir, mode, 'resultados.json'), encoding='utf-8') as handle:
+        reports[mode] = {c['columna']: c for c in json.load(handle)['columnas']}
+in_memory, chunked = reports['memoria'], reports['bloques']
+check("Mismos N y nulos que en memoria", all(in_memory[c]['n'] == chunked[c]['n'] and
+                                           in_memory[c]['nulos'] == chunked[c]['nulos'] for c in in_memory))
+check("Mismas tablas de frecuencias", all(in_memory[c]['tabla_frecuencias'] == chunked[c]['tabla_frecuencias']
+                                         for c in in_memory))
+check("Misma media", np.isclose(in_memory['Edad']['estadisticas']['tendencia_central']['media'],
+                                chunked['Edad']['estadisticas']['tendencia_central']['media'], rtol=1e-12))
+check("--bloques con --agrupar rechazado",
+      main([chunked_input, '-o', os.path.join(work_dir, 'bloques'), '--no-ai', '--bloques', '--agrupar', 'Color']) == 1)
+
+print("\n🛡️ Valores atípicos...")
+out_outliers = os.path.join(work_dir, 'atipicos')
+code = main([os.path.join(input_dir, 'alturas.csv'), '-o', out_outliers, '--no-ai', '--quitar-atipicos',
+             '--metodo-atipicos', 'percentil'])
+with open(os.path.join(out_outliers, 'resultados.json'), encoding='utf-8') as handle:
+    altura = json.load(handle)['columnas'][0]
+check("Percentil 1%: se recortan los extremos", code == 0 and altura['atipicos_eliminados'] == 6)
+check("N descuenta los eliminados", altura['n'] == 300 - altura['atipicos_eliminados'])
+
+print("\n🗜️ Modo compacto...")
+out_compact = os.path.join(work_dir, 'compacto')
+code = main([os.path.join(input_dir, 'alturas.csv'), '-o', out_compact, '--no-ai', '--compacto'])
+with open(os.path.join(out_compact, 'resultados.json'), encoding='utf-8') as handle:
+    compact_stats = json.load(handle)['columnas'][0]['estadisticas']
+reference = pd.read_csv(os.path.join(input_dir, 'alturas.csv'))['Altura']
+check("Código de salida 0", code == 0)
+check("Media y desviación como en float64",
+      np.isclose(compact_stats['tendencia_central']['media'], reference.mean(), rtol=1e-7)
+      and np.isclose(compact_stats['dispersion']['desviacion_estandar'], reference.std(), rtol=1e-6))
+
+print("\n👥 Agrupado por una columna...")
+out_groups = os.path.join(work_dir, 'grupos')
+code = main([os.path.join(input_dir, 'encuesta.csv'), '-o', out_groups, '-f', 'csv', '--no-ai', '--agrupar', 'Color'])
+by_color = pd.read_csv(os.path.join(out_groups, 'por_grupo', 'Edad_estadisticas.csv'))
+survey = pd.read_csv(os.path.join(input_dir, 'encuesta.csv'))
+check("Código de salida 0", code == 0)
+check("Una fila por color con su media", list(by_color['Grupo']) == ['Azul', 'Rojo'] and
+      np.allclose(by_color['Media'], survey.groupby('Color')['Edad'].mean().to_numpy()))
+
+print("\n⚖️ Tabla de frecuencias (valor, conteo)...")
+counts_table = survey.groupby('Edad').size().reset_index(name='Conteo')
+counts_table.to_csv(os.path.join(work_dir, 'conteos.csv'), index=False)
+out_weighted = os.path.join(work_dir, 'ponderado')
+code = main([os.path.join(work_dir, 'conteos.csv'), '-o', out_weighted, '--no-ai', '--pesos', 'Conteo'])
+with open(os.path.join(out_weighted, 'resultados.json'), encoding='utf-8') as handle:
+    weighted = json.load(handle)['columnas']
+check("Código de salida 0 y solo la columna de valores", code == 0 and [c['columna'] for c in weighted] == ['Edad'])
+check("N y media como los datos originales", weighted[0]['n'] == 400 and
+      np.isclose(weighted[0]['estadisticas']['tendencia_central']['media'], survey['Edad'].mean()))
+check("--pesos con --agrupar rechazado",
+      main([os.path.join(work_dir, 'conteos.csv'), '-o', out_weighted, '--no-ai', '--pesos', 'Conteo', '--agrupar', 'Edad']) == 1)
+
+print("\n🔝 Valores más frecuentes...")
+out_top = os.path.join(work_dir, 'frecuentes')
+code = main([os.path.join(input_dir, 'encuesta.csv'), '-o', out_top, '-f', 'csv', '--no-ai', '--frecuentes', '3'])
+top_colors = pd.read_csv(os.path.join(out_top, 'frecuentes', 'Color.csv'))
+expected = survey['Color'].value_counts()
+check("Código de salida 0", code == 0)
+check("Conteo exacto con pocos valores distintos", list(top_colors['Valor']) == list(expected.index) and
+      (top_colors['Frecuencia Mínima'] == top_colors['Frecuencia Máxima']).all() and
+      list(top_colors['Frecuencia Mínima']) == list(expected))
+check("Tres filas para Edad", len(pd.read_csv(os.path.join(out_top, 'frecuentes', 'Edad.csv'))) == 3)
+
+print("\n🚫 Errores...")
+check("Columna inexistente retorna código 1",
+      main([os.path.join(input_dir, 'alturas.csv'), '-o', out_csv, '-c', 'Peso', '--no-ai']) == 1)
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE LA LÍNEA DE COMANDOS PASARON EXITOSAMENTE")
+print("=" * 60)
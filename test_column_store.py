@@ -0,0 +1,51 @@
+import tempfile
+import numpy as np
+import pandas as pd
+from column_store import ColumnStore, ColumnHandle
+from stats_utils import calculate_all_statistics
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DEL ALMACÉN DE COLUMNAS EN DISCO")
+print("=" * 60)
+
+store = ColumnStore(tempfile.mkdtemp(), max_bytes=2_000_000)
+rng = np.random.default_rng(2)
+numbers = pd.Series(rng.normal(50, 10, 100_000))
+
+print("\n🔢 Columna numérica...")
+handle = store.put(numbers, 'valores')
+loaded = store.load(handle)
+check("La sesión guarda solo una referencia", isinstance(handle, ColumnHandle) and len(handle) == len(numbers))
+check("Valores idénticos al recuperarla", np.array_equal(loaded.to_numpy(), numbers.to_numpy()))
+check("Mapeada en memoria y de solo lectura", isinstance(loaded.values.base, np.memmap) and not loaded.values.flags.writeable)
+check("Estadísticas iguales sobre los datos mapeados",
+      calculate_all_statistics(loaded) == calculate_all_statistics(numbers))
+
+print("\n👥 Misma columna subida por otra sesión...")
+other = store.put(numbers.copy(), 'valores')
+check("Misma clave de contenido", other.key == handle.key)
+check("Un solo archivo en disco", store.stats()['columnas'] == 1)
+check("Ambas sesiones mapean el mismo archivo",
+      store.load(other).values.base.filename == loaded.values.base.filename)
+
+print("\n🔤 Columna de texto con nulos...")
+colors = pd.Series(['Azul', 'Rojo', None, 'Azul', 7])
+text_handle = store.put(colors, 'valores')
+restored = store.load(text_handle)
+check("Categorías y nulos conservados", restored.iloc[[0, 1, 3, 4]].tolist() == ['Azul', 'Rojo', 'Azul', 7] and pd.isna(restored.iloc[2]))
+
+print("\n🧹 Límite de espacio en disco...")
+store.put(pd.Series(rng.normal(0, 1, 200_000)), 'valores')
+check("Se eliminan las columnas usadas hace más tiempo", handle.key not in store and store.stats()['bytes'] <= 2_000_000)
+try:
+    store.load(handle)
+    check("Referencia eliminada genera ValueError", False)
+except ValueError:
+    check("Referencia eliminada genera ValueError", True)
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DEL ALMACÉN DE COLUMNAS PASARON EXITOSAMENTE")
+print("=" * 60)
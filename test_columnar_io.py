@@ -0,0 +1,64 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+from data_processor import load_data_from_file, preview_file
+from streaming import analyze_file_streaming
+from stats_utils import calculate_all_statistics
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DE LECTURA DE PARQUET, FEATHER Y ARROW")
+print("=" * 60)
+
+rng = np.random.default_rng(5)
+df = pd.DataFrame({
+    'Edad': rng.integers(18, 60, 50_000),
+    'Ingreso': rng.normal(2500, 400, 50_000),
+    'Ciudad': rng.choice(['Lima', 'Quito', 'Bogotá'], 50_000)
+})
+work_dir = tempfile.mkdtemp()
+paths = {
+    'parquet': os.path.join(work_dir, 'datos.parquet'),
+    'feather': os.path.join(work_dir, 'datos.feather'),
+    'arrow': os.path.join(work_dir, 'datos.arrow')
+}
+df.to_parquet(paths['parquet'], index=False, row_group_size=10_000)
+feather.write_feather(df, paths['feather'], chunksize=10_000)
+table = pa.Table.from_pandas(df, preserve_index=False)
+with ipc.new_file(paths['arrow'], table.schema) as writer:
+    writer.write_table(table, max_chunksize=10_000)
+
+expected = calculate_all_statistics(df['Ingreso'])
+for file_type, path in paths.items():
+    print(f"\n📦 Formato {file_type}...")
+    schema = preview_file(path, file_type, n_rows=5)
+    check("Columnas y filas desde los metadatos", schema['columnas'] == list(df.columns) and schema['filas'] == len(df))
+    check("Vista previa con las primeras filas", schema['vista_previa'].equals(df.head(5)))
+
+    projected = load_data_from_file(path, file_type, columns=['Ingreso'])
+    check("Solo se lee la columna seleccionada", list(projected.columns) == ['Ingreso'])
+    check("Valores idénticos", np.array_equal(projected['Ingreso'].to_numpy(), df['Ingreso'].to_numpy()))
+
+    with open(path, 'rb') as handle:
+        uploaded = load_data_from_file(handle, file_type, columns=['Ciudad'])
+    check("Lectura desde un archivo abierto", uploaded['Ciudad'].equals(df['Ciudad']))
+
+    result = analyze_file_streaming(path, file_type, column='Ingreso', chunksize=7_000)
+    check("Estadísticas por bloques iguales a las de memoria",
+          abs(result['statistics']['tendencia_central']['media'] - expected['tendencia_central']['media']) < 1e-9)
+
+try:
+    load_data_from_file(paths['parquet'], 'parquet', columns=['Peso'])
+    check("Columna inexistente genera error", False)
+except ValueError:
+    check("Columna inexistente genera error", True)
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE FORMATOS COLUMNARES PASARON EXITOSAMENTE")
+print("=" * 60)
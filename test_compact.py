@@ -0,0 +1,70 @@
+import io
+import numpy as np
+import pandas as pd
+from data_processor import (compact_series, compact_frame, load_data_from_text, load_data_from_file,
+                            create_frequency_table, clean_data_context)
+from stats_utils import calculate_all_statistics, mean_and_m2, MOMENT_BLOCK
+from batch_analysis import profile_dataframe
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DEL MODO COMPACTO (FLOAT32)")
+print("=" * 60)
+
+EPS32 = 2.0 ** -24
+
+rng = np.random.default_rng(22)
+
+print("\n🗜️ Reducción de tipos...")
+data = pd.Series(rng.normal(1000, 2, 500_000))
+compact = compact_series(data)
+check("float64 → float32", compact.dtype == np.float32)
+check("La memoria se reduce a la mitad", compact.to_numpy().nbytes * 2 == data.to_numpy().nbytes)
+check("Enteros al tipo más pequeño", compact_series(pd.Series([-5, 0, 120])).dtype == np.int8)
+check("Enteros sin signo", compact_series(pd.Series([0, 300], dtype=np.uint64)).dtype == np.uint16)
+check("Fuera del rango de float32 se conserva float64", compact_series(pd.Series([1.0, 1e300])).dtype == np.float64)
+text = pd.Series(['a', 'b'])
+check("Texto sin cambios", compact_series(text).dtype == text.dtype)
+frame = compact_frame(pd.DataFrame({'x': [1.5, 2.5], 'n': [1, 2], 'c': text}))
+check("compact_frame por columna", list(frame.dtypes) == [np.float32, np.int8, text.dtype])
+
+print("\n🎯 Exactitud de media y varianza...")
+for mu, sigma in [(20, 5), (1000, 2), (1e6, 300)]:
+    original = pd.Series(rng.normal(mu, sigma, 300_000))
+    reduced = compact_series(original)
+    exact = calculate_all_statistics(original)
+    approx = calculate_all_statistics(reduced)
+    mean_error = abs(approx['tendencia_central']['media'] - exact['tendencia_central']['media'])
+    std_error = abs(approx['dispersion']['desviacion_estandar'] - exact['dispersion']['desviacion_estandar'])
+    check(f"Media N({mu:g}, {sigma:g}) dentro de 2**-24·media(|x|)", mean_error <= EPS32 * original.abs().mean())
+    check(f"Desviación N({mu:g}, {sigma:g}) dentro de 2**-24·max(|x|)", std_error <= EPS32 * original.abs().max())
+
+values = compact_series(pd.Series(rng.normal(1e4, 1, 3 * MOMENT_BLOCK + 17))).to_numpy()
+mean, m2 = mean_and_m2(values)
+reference = values.astype(np.float64)
+check("Momentos por bloques iguales a los de float64",
+      np.isclose(mean, reference.mean(), rtol=1e-15) and np.isclose(m2, ((reference - reference.mean()) ** 2).sum(), rtol=1e-12))
+
+print("\n🔗 Etapas sobre datos compactos...")
+context = clean_data_context(compact, remove_outliers=True, method='zscore')
+check("La limpieza conserva float32", context.sorted_values.dtype == np.float32)
+check("Mismos atípicos que en float64", context.removed == clean_data_context(data, True, 'zscore').removed)
+small = compact_series(pd.Series(rng.integers(-100, 100, 2000)))
+table = create_frequency_table(small)
+check("Enteros int8 sin desbordar en la tabla", table['Frecuencia Absoluta'].sum() == 2000)
+check("Rango de int8 sin desbordar", calculate_all_statistics(small)['dispersion']['rango'] == float(small.max()) - float(small.min()))
+
+print("\n📥 Carga en modo compacto...")
+check("Texto manual", load_data_from_text("1.5, 2.5, 3.5", compact=True)['valores'].dtype == np.float32)
+csv = io.BytesIO(b"a,b\n1.25,3\n2.5,4\n")
+loaded = load_data_from_file(csv, 'csv', compact=True)
+check("CSV", loaded['a'].dtype == np.float32 and loaded['b'].dtype == np.int8)
+profile = profile_dataframe(compact_frame(pd.DataFrame({'x': data[:1000], 'y': data[1000:2000].to_numpy()})),
+                            max_workers=1)['resumen']
+check("Resumen por columnas sobre datos compactos", np.isclose(profile['Media'][0], data[:1000].mean(), rtol=1e-6))
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DEL MODO COMPACTO PASARON EXITOSAMENTE")
+print("=" * 60)
@@ -0,0 +1,45 @@
+import io
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from data_processor import load_data_from_file, preview_file
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DE VISTA PREVIA SIN CARGA COMPLETA")
+print("=" * 60)
+
+rng = np.random.default_rng(11)
+df = pd.DataFrame({
+    'Edad': rng.integers(18, 60, 3000),
+    'Nota': rng.normal(15, 2, 3000).round(2),
+    'Color': rng.choice(['Azul', 'Rojo'], 3000)
+})
+
+print("\n📄 CSV...")
+csv_bytes = df.to_csv(index=False).encode('utf-8')
+broken = csv_bytes + b"1,2,3,4,5,6\n"
+upload = io.BytesIO(broken)
+preview = preview_file(upload, 'csv', n_rows=10)
+check("Columnas desde el encabezado", preview['columnas'] == list(df.columns))
+check("Solo se leen las primeras filas (una fila inválida al final no afecta)", preview['vista_previa'].equals(df.head(10)))
+check("El archivo queda listo para la carga completa", upload.tell() == 0)
+column = load_data_from_file(io.BytesIO(csv_bytes), 'csv', columns=['Nota'])
+check("Carga completa solo de la columna elegida (usecols)", list(column.columns) == ['Nota'] and column['Nota'].equals(df['Nota']))
+
+print("\n📊 Excel (openpyxl en modo de solo lectura)...")
+path = os.path.join(tempfile.mkdtemp(), 'datos.xlsx')
+df.to_excel(path, index=False)
+preview = preview_file(path, 'xlsx', n_rows=10)
+check("Columnas desde el encabezado", preview['columnas'] == list(df.columns))
+check("Primeras filas iguales a read_excel", preview['vista_previa'].equals(pd.read_excel(path, nrows=10)))
+check("Número de filas desde las dimensiones de la hoja", preview['filas'] == len(df))
+column = load_data_from_file(path, 'xlsx', columns=['Color'])
+check("Carga completa solo de la columna elegida (usecols)", list(column.columns) == ['Color'] and column['Color'].equals(df['Color']))
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE VISTA PREVIA PASARON EXITOSAMENTE")
+print("=" * 60)
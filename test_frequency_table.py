@@ -0,0 +1,77 @@
+import io
+import warnings
+import numpy as np
+import pandas as pd
+from data_processor import create_frequency_table, interval_labels, integer_counts
+from streaming import analyze_file_streaming
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DE TABLAS DE FRECUENCIAS DISCRETAS Y POR INTERVALOS")
+print("=" * 60)
+
+def reference_interval_table(values: np.ndarray, bins: int) -> pd.DataFrame:
+    freq, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({
+        'Intervalo': [f"[{edges[i]:.2f}, {edges[i+1]:.2f})" for i in range(len(edges) - 1)],
+        'Frecuencia Absoluta': freq,
+        'Frecuencia Acumulada': np.cumsum(freq)
+    })
+
+rng = np.random.default_rng(7)
+
+print("\n🔢 Enteros con pocos valores distintos...")
+ages = pd.Series(rng.integers(16, 36, 200_000))
+table = create_frequency_table(ages)
+expected = ages.value_counts().sort_index()
+check("Una fila por valor", list(table['Valor']) == list(expected.index))
+check("Conteos exactos", np.array_equal(table['Frecuencia Absoluta'], expected.values))
+check("Acumuladas correctas", table['Frecuencia Acumulada'].iloc[-1] == len(ages)
+      and np.isclose(table['Frecuencia Rel. Acumulada'].iloc[-1], 1.0))
+check("El número de intervalos no cambia la tabla", create_frequency_table(ages, bins=5).equals(table))
+floats = create_frequency_table(pd.Series(ages.astype(float).tolist() + [np.nan]))
+check("Enteros guardados como float (con nulos) dan la misma tabla", floats.equals(table))
+check("Valores mostrados como enteros", floats['Valor'].dtype.kind == 'i')
+
+print("\n📏 Enteros con muchos valores distintos...")
+incomes = rng.integers(0, 5_000, 100_000)
+for bins in [None, 7, 20]:
+    table = create_frequency_table(pd.Series(incomes), bins=bins)
+    reference = reference_interval_table(incomes, bins or 17)
+    check(f"Igual a np.histogram (bins={bins})",
+          table[['Intervalo', 'Frecuencia Absoluta', 'Frecuencia Acumulada']].equals(reference))
+check("Rango amplio: sin bincount", integer_counts(np.array([0, 10 ** 9])) is None)
+wide = create_frequency_table(pd.Series([0, 10 ** 9, 5, 7]), bins=3)
+check("Rango amplio: tabla por intervalos", list(wide['Frecuencia Absoluta']) == [3, 0, 1])
+
+print("\n🌊 Datos continuos...")
+heights = rng.normal(170, 8, 50_000)
+table = create_frequency_table(pd.Series(heights), bins=12)
+check("Igual a np.histogram", table[['Intervalo', 'Frecuencia Absoluta', 'Frecuencia Acumulada']]
+      .equals(reference_interval_table(heights, 12)))
+edges = np.array([-1.005, 0.0, 2.5, 1234.5678])
+check("Etiquetas vectorizadas iguales a las de f-string",
+      list(interval_labels(edges)) == [f"[{edges[i]:.2f}, {edges[i+1]:.2f})" for i in range(3)])
+
+print("\n🏷️ Sin valores numéricos...")
+with warnings.catch_warnings():
+    warnings.simplefilter('error')
+    text_table = create_frequency_table(pd.Series(['a', 'b', 'a']), True)
+    empty_table = create_frequency_table(pd.Series([], dtype=float), True)
+check("Texto marcado como cuantitativo: tabla por categoría",
+      list(text_table['Categoría']) == ['a', 'b'] and list(text_table['Frecuencia Absoluta']) == [2, 1])
+check("Serie vacía: tabla vacía sin advertencias", empty_table.empty and 'Categoría' in empty_table.columns)
+
+print("\n📂 Lectura por bloques...")
+df = pd.DataFrame({'Hijos': rng.integers(0, 6, 3000), 'Puntaje': rng.integers(0, 400, 3000),
+                   'Mixta': np.r_[rng.integers(0, 6, 2000), rng.normal(3, 1, 1000)]})
+csv_bytes = df.to_csv(index=False).encode('utf-8')
+for column in df.columns:
+    result = analyze_file_streaming(io.BytesIO(csv_bytes), 'csv', column, chunksize=500)
+    check(f"Columna {column} igual a la tabla en memoria", result['freq_table'].equals(create_frequency_table(df[column])))
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE TABLAS DE FRECUENCIAS PASARON EXITOSAMENTE")
+print("=" * 60)
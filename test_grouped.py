@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+from grouped import grouped_statistics, grouped_frequency_table, GROUPED_COLUMNS
+from stats_utils import calculate_all_statistics
+from data_processor import create_frequency_table
+from visualization import create_grouped_box_plot, create_grouped_histogram
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DE ESTADÍSTICAS POR GRUPO")
+print("=" * 60)
+
+rng = np.random.default_rng(23)
+n = 60_000
+groups = rng.choice(['Norte', 'Sur', 'Este', 'Oeste', 'Centro'], n).astype(object)
+values = np.round(rng.normal(50, 12, n), 1)
+values[::101] = np.nan
+groups[::257] = None
+frame = pd.DataFrame({'valor': values, 'region': groups})
+
+print("\n📐 Estadísticas por grupo...")
+stats = grouped_statistics(frame['valor'], frame['region'])
+check("Columnas del resultado", list(stats.columns) == GROUPED_COLUMNS)
+check("Un grupo por región (sin nulos)", list(stats['Grupo']) == ['Centro', 'Este', 'Norte', 'Oeste', 'Sur'])
+matches = True
+for row, (name, group) in zip(stats.itertuples(index=False), frame.dropna().groupby('region')['valor']):
+    expected = calculate_all_statistics(group)
+    central, dispersion = expected['tendencia_central'], expected['dispersion']
+    matches &= row[1] == expected['n']
+    matches &= bool(np.allclose(
+        [row[2], row[3], row[4], row[5], row[6], row[8], row[9], row[11], row[12], row[14]],
+        [central['media'], central['mediana'], central['moda'], central['frecuencia_moda'],
+         dispersion['desviacion_estandar'], dispersion['minimo'], dispersion['maximo'],
+         dispersion['q1'], dispersion['q3'], dispersion['coeficiente_variacion']], rtol=1e-12))
+check("Cada grupo igual a calculate_all_statistics", matches)
+inside = frame.dropna().groupby('region')['valor'].apply(
+    lambda g: g[(g >= g.quantile(0.25) - 1.5 * (g.quantile(0.75) - g.quantile(0.25)))].min())
+check("Bigote inferior dentro de Q1 - 1.5·IQR", np.allclose(stats['Bigote Inferior'], inside.to_numpy()))
+
+single = grouped_statistics([1, 2, 2, 'x', 9], ['a', 'a', 'a', 'b', 'c'])
+check("Grupos sin valores numéricos se omiten", list(single['Grupo']) == ['a', 'c'])
+check("Grupo de un valor: varianza NaN", np.isnan(single['Varianza'].iloc[1]))
+check("Empates en la moda: el menor valor", grouped_statistics([3, 1, 3, 1], ['g'] * 4)['Moda'].iloc[0] == 1)
+check("Sin datos: tabla vacía", grouped_statistics([], []).empty)
+try:
+    grouped_statistics([1, 2], ['a'])
+    check("Longitudes distintas rechazadas", False)
+except ValueError:
+    check("Longitudes distintas rechazadas", True)
+
+print("\n📋 Tablas de frecuencias por grupo...")
+table = grouped_frequency_table(frame['valor'], frame['region'])
+check("Total igual a create_frequency_table", (table['Total'].to_numpy() ==
+      create_frequency_table(frame['valor'][frame['region'].notna()].dropna())['Frecuencia Absoluta'].to_numpy()).all())
+check("Columnas por grupo suman N de cada grupo",
+      (table[stats['Grupo']].sum().to_numpy() == stats['N'].to_numpy()).all())
+discrete = grouped_frequency_table(rng.integers(1, 6, 1000), rng.choice(['a', 'b'], 1000))
+check("Datos discretos: una fila por valor", list(discrete['Valor']) == [1, 2, 3, 4, 5])
+colors = grouped_frequency_table(['Rojo', 'Azul', 'Rojo', None], [1, 1, 2, 2], is_quantitative=False)
+check("Datos cualitativos por categoría", colors.to_dict('list') == {'Categoría': ['Azul', 'Rojo'], 1: [1, 1], 2: [0, 1], 'Total': [1, 2]})
+for clashing, values_, description in ((['Total', 'x', 'x', 'Total'], [1, 2, 2, 3], "Grupo 'Total' rechazado"),
+                                       (['Valor', 'x'], [1, 2], "Grupo con el nombre de la columna de clases rechazado")):
+    try:
+        grouped_frequency_table(values_, clashing)
+        check(description, False)
+    except ValueError:
+        check(description, True)
+check("'Valor' se admite si las clases son intervalos",
+      'Valor' in grouped_frequency_table(rng.normal(size=100), ['Valor', 'x'] * 50).columns)
+
+print("\n📊 Gráficos por grupo...")
+box = create_grouped_box_plot(stats)
+check("Una caja por grupo en una sola traza", len(box.data) == 1 and list(box.data[0].x) == list(stats['Grupo']))
+many = grouped_statistics(rng.normal(size=5000), rng.integers(0, 100, 5000))
+check("Se limita a los grupos con más datos", len(create_grouped_box_plot(many, max_groups=10).data[0].x) == 10)
+check("Barras agrupadas: una serie por grupo", len(create_grouped_histogram(table).data) == 5)
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE ESTADÍSTICAS POR GRUPO PASARON EXITOSAMENTE")
+print("=" * 60)
@@ -0,0 +1,87 @@
+import json
+import numpy as np
+import pandas as pd
+from heavy_hitters import HeavyHitters, frequent_values, TOP_VALUES_COLUMNS
+from stats_accumulator import StatisticsAccumulator
+from stats_utils import calculate_all_statistics
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DE VALORES MÁS FRECUENTES (MISRA-GRIES)")
+print("=" * 60)
+
+def within_bounds(summary: HeavyHitters, data) -> bool:
+    """
+    Cada contador subestima su frecuencia real en a lo sumo error_bound y ningún valor con
+    frecuencia mayor que error_bound falta en el resumen
+    """
+    true = pd.Series(data).value_counts()
+    difference = true.reindex(summary.counters.index) - summary.counters
+    missing = true[true > summary.error_bound].index.difference(summary.counters.index)
+    return bool((difference >= 0).all() and (difference <= summary.error_bound).all() and len(missing) == 0)
+
+rng = np.random.default_rng(25)
+
+print("\n🎯 Conteo exacto con pocos valores distintos...")
+ages = rng.integers(18, 60, 50_000)
+summary = frequent_values(ages, capacity=100)
+expected = pd.Series(ages).value_counts()
+top = summary.top(5)
+check("Columnas del resultado", list(top.columns) == TOP_VALUES_COLUMNS)
+check("Exacto y sin cota de error", summary.is_exact and summary.error_bound == 0)
+check("Frecuencias iguales a value_counts", list(top['Frecuencia Mínima']) == list(expected.iloc[:5]) and
+      top['Frecuencia Mínima'].equals(top['Frecuencia Máxima']))
+stats = calculate_all_statistics(ages)['tendencia_central']
+check("Moda igual a calculate_all_statistics", summary.mode() == (stats['moda'], stats['frecuencia_moda']))
+check("Empate: primero el menor valor", frequent_values([3, 1, 3, 1, 2]).mode() == (1, 2))
+check("Texto y nulos", frequent_values(['Rojo', None, 'Azul', 'Rojo', np.nan]).top().to_dict('list') ==
+      {'Valor': ['Rojo', 'Azul'], 'Frecuencia Mínima': [2, 1], 'Frecuencia Máxima': [2, 1]})
+
+print("\n📉 Alta cardinalidad con memoria acotada...")
+zipf = rng.zipf(1.3, 1_000_000)
+summary = frequent_values(zipf, capacity=200, chunksize=50_000)
+check("A lo sumo capacity contadores", len(summary.counters) <= 200 and not summary.is_exact)
+check("Cota de error <= n / (capacity + 1)", 0 < summary.error_bound <= len(zipf) // 201)
+check("Cada frecuencia real dentro de [mínima, máxima]", within_bounds(summary, zipf))
+check("Los 5 más frecuentes correctos", list(summary.top(5)['Valor']) == list(pd.Series(zipf).value_counts().index[:5]))
+continuous = frequent_values(rng.normal(size=200_000))
+check("Datos continuos: ningún valor supera la cota (sin moda)", continuous.mode() == (None, 0))
+
+print("\n🔗 Fusión, pesos y estado...")
+halves = [frequent_values(part, capacity=200) for part in np.array_split(zipf, 2)]
+merged = halves[0].merge(halves[1])
+check("merge() conserva las cotas", merged.n == len(zipf) and within_bounds(merged, zipf))
+values, counts = [5, 7, 5, 9], [10, 3, 2, 0]
+check("Con pesos cada valor suma su peso", frequent_values(values, weights=counts).top().to_dict('list') ==
+      {'Valor': [5, 7], 'Frecuencia Mínima': [12, 3], 'Frecuencia Máxima': [12, 3]})
+restored = HeavyHitters.from_state(json.loads(json.dumps(summary.to_state())))
+check("to_state/from_state", restored.top(20).equals(summary.top(20)) and restored.error_bound == summary.error_bound)
+try:
+    HeavyHitters(0)
+    check("Capacidad 0 rechazada", False)
+except ValueError:
+    check("Capacidad 0 rechazada", True)
+
+print("\n🧮 StatisticsAccumulator al superar max_distinct...")
+data = np.concatenate([rng.integers(0, 10 ** 6, 300_000), np.full(4000, 42)])
+rng.shuffle(data)
+accumulator = StatisticsAccumulator(max_distinct=1000, capacity=500)
+for chunk in np.array_split(data, 12):
+    accumulator.update(chunk)
+central = accumulator.to_dict()['tendencia_central']
+check("Pasa a HeavyHitters", not accumulator.is_exact and accumulator.heavy_hitters is not None)
+check("Moda aproximada con su cota", central['moda'] == 42.0 and
+      central['frecuencia_moda'] <= 4000 <= central['frecuencia_moda'] + central['error_moda'])
+parts = [StatisticsAccumulator(max_distinct=1000, capacity=500).update(part) for part in np.array_split(data, 3)]
+parts[0].merge(parts[1]).merge(parts[2])
+check("merge() de acumuladores aproximados", parts[0].to_dict()['tendencia_central']['moda'] == 42.0)
+state = json.loads(json.dumps(accumulator.to_state()))
+check("Estado JSON con el resumen", StatisticsAccumulator.from_state(state).to_dict()['tendencia_central'] == central)
+exact = StatisticsAccumulator().update(ages).to_dict()['tendencia_central']
+check("Exacto sin error_moda", 'error_moda' not in exact and exact['moda'] == stats['moda'])
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE VALORES MÁS FRECUENTES PASARON EXITOSAMENTE")
+print("=" * 60)
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DEL TIEMPO DE IMPORTACIÓN")
+print("=" * 60)
+
+APP_MODULES = [
+    'stats_utils', 'data_processor', 'visualization', 'ai_helper', 'result_cache', 'column_store',
+    'categorical', 'type_inference', 'batch_analysis', 'streaming', 'columnar_io', 'main'
+]
+LAZY_MODULES = ['openai', 'httpx', 'scipy', 'plotly.express']
+BUDGET_SECONDS = 0.25
+RUNS = 3
+
+def import_seconds(modules: list) -> float:
+    """
+    Tiempo de importación en un intérprete nuevo (mínimo de varias ejecuciones), según python -X importtime
+    """
+    best = None
+    for _ in range(RUNS):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {', '.join(modules)}"],
+                                capture_output=True, text=True, check=True)
+        total = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            if not name.startswith('  '):
+                total += int(cumulative)
+        best = total if best is None else min(best, total)
+    return best / 1e6
+
+baseline = import_seconds(['numpy', 'pandas'])
+app_total = import_seconds(['numpy', 'pandas'] + APP_MODULES)
+print(f"\n⏱️ numpy + pandas: {baseline:.3f}s")
+print(f"⏱️ numpy + pandas + módulos de la aplicación: {app_total:.3f}s")
+check(f"Costo propio de la aplicación {app_total - baseline:.3f}s ≤ {BUDGET_SECONDS}s", app_total - baseline <= BUDGET_SECONDS)
+
+print("\n💤 Dependencias que se cargan solo al usarlas...")
+loaded = subprocess.run(
+    [sys.executable, '-c', f"import sys, {', '.join(APP_MODULES)}; print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"],
+    capture_output=True, text=True, check=True
+).stdout.split()
+for module in LAZY_MODULES:
+    check(f"{module} no se importa al iniciar", module not in loaded)
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE TIEMPO DE IMPORTACIÓN PASARON EXITOSAMENTE")
+print("=" * 60)
@@ -0,0 +1,135 @@
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from incremental import IncrementalAnalysis, ExtensibleHistogram
+from stats_utils import calculate_all_statistics
+from stats_accumulator import StatisticsAccumulator
+from data_processor import create_frequency_table
+from main import main
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DEL ANÁLISIS INCREMENTAL (AGREGAR LOTES)")
+print("=" * 60)
+
+def same_stats(a: dict, b: dict) -> bool:
+    for group in ['tendencia_central', 'dispersion']:
+        for key, expected in a[group].items():
+            value = b[group][key]
+            if expected is None or value is None:
+                if expected is not value:
+                    return False
+            elif abs(expected - value) > 1e-9 * max(1.0, abs(expected)):
+                return False
+    return a['n'] == b['n']
+
+rng = np.random.default_rng(11)
+
+print("\n🔢 Datos cuantitativos por lotes...")
+for label, batches in [
+    ("discretos", [rng.integers(18, 30, 500).astype(float) for _ in range(6)]),
+    ("continuos", [rng.normal(50 + 5 * i, 4, 800) for i in range(6)])
+]:
+    analysis = IncrementalAnalysis()
+    for batch in batches:
+        analysis.append(np.append(batch, np.nan))
+    data = pd.Series(np.concatenate(batches))
+    check(f"Estadísticas iguales a las de todos los datos ({label})",
+          same_stats(calculate_all_statistics(data), analysis.statistics()))
+    check(f"Tabla de frecuencias igual ({label})", analysis.frequency_table().equals(create_frequency_table(data)))
+    check(f"Con 8 intervalos ({label})", analysis.frequency_table(8).equals(create_frequency_table(data, bins=8)))
+    check(f"Nulos contados ({label})", analysis.nulls == 6 and analysis.n == len(data) + 6)
+
+print("\n🏷️ Datos cualitativos por lotes...")
+colors = [rng.choice(['Azul', 'Rojo', 'Verde'], 300) for _ in range(3)] + [np.array(['Negro', None], dtype=object)]
+analysis = IncrementalAnalysis(is_quantitative=False)
+for batch in colors:
+    analysis.append(batch)
+data = pd.Series(np.concatenate(colors)).dropna()
+check("Tabla por categoría igual", analysis.frequency_table().equals(create_frequency_table(data, is_quantitative=False)))
+check("Resumen categórico", analysis.categorical_summary().by_frequency().iloc[0] == data.value_counts().iloc[0])
+
+print("\n📏 Histograma con bordes que se extienden...")
+histogram = ExtensibleHistogram(bins=10, max_bins=64)
+chunks = [rng.uniform(0, 1, 1000), rng.uniform(-5, 0, 1000), rng.uniform(100, 200, 1000)]
+for chunk in chunks:
+    histogram.update(chunk)
+all_values = np.concatenate(chunks)
+edges = histogram.edges
+check("Se conservan todos los valores", histogram.counts.sum() == len(all_values))
+check("Los bordes cubren el rango", edges[0] <= all_values.min() and edges[-1] >= all_values.max())
+check("Sin superar el máximo de intervalos", len(histogram.counts) <= 64)
+check("Conteos iguales a np.histogram con esos bordes",
+      np.array_equal(histogram.counts, np.histogram(all_values, bins=edges)[0]))
+freq, grouped_edges = histogram.grouped(12)
+check("Agrupado para mostrar", len(freq) <= 12 and freq.sum() == len(all_values))
+fixed = ExtensibleHistogram(edges=[0, 10, 20]).update(np.array([-1, 5, 15, 20, 25]))
+check("Bordes fijos: fuera de rango aparte", list(fixed.counts) == [1, 2] and fixed.outside == 2)
+infinite = IncrementalAnalysis().append([1, 2, 3]).append([4, np.inf, -np.inf])
+infinite_stats = infinite.statistics()
+check("inf y -inf se cuentan como nulos", infinite.n == 6 and infinite.nulls == 2 and infinite.count == 4)
+check("Estadísticas y tabla solo con valores finitos", infinite_stats['tendencia_central']['media'] == 2.5
+      and infinite.frequency_table()['Frecuencia Absoluta'].sum() == 4)
+check("Histograma ignora valores no finitos", ExtensibleHistogram(bins=4).update([1.0, np.inf, 2.0]).counts.sum() == 2)
+with np.errstate(invalid='ignore'):
+    full = calculate_all_statistics([1, 2, 3, 4, np.inf, -np.inf])
+check("Diferencia documentada: el recálculo completo conserva inf", full['n'] == 6 and
+      not np.isfinite(full['tendencia_central']['media']))
+failing = IncrementalAnalysis().append([1.0, 2.0, 3.0])
+before = (failing.histogram.to_state(), failing.accumulator.to_state(), failing.n, failing.nulls)
+original_update = StatisticsAccumulator.update
+StatisticsAccumulator.update = lambda self, data: 1 / 0
+try:
+    failing.append([-50.0, 100.0])
+except ZeroDivisionError:
+    pass
+finally:
+    StatisticsAccumulator.update = original_update
+check("Un lote con error no modifica el histograma ni el acumulador",
+      (failing.histogram.to_state(), failing.accumulator.to_state(), failing.n, failing.nulls) == before)
+
+print("\n💾 Estado persistente...")
+analysis = IncrementalAnalysis(type_info={'tipo': 'cuantitativo', 'subtipo': 'continuo'})
+analysis.append(rng.normal(0, 1, 2000))
+path = os.path.join(tempfile.mkdtemp(), 'estado.json')
+analysis.save(path)
+restored = IncrementalAnalysis.load(path)
+extra = rng.normal(0, 1, 500)
+analysis.append(extra)
+restored.append(extra)
+check("El estado guardado continúa igual", restored.statistics() == analysis.statistics()
+      and restored.frequency_table().equals(analysis.frequency_table()))
+check("Conserva el tipo detectado", restored.type_info == analysis.type_info)
+try:
+    IncrementalAnalysis.from_state({'version': 0})
+    check("Rechaza versiones desconocidas", False)
+except ValueError:
+    check("Rechaza versiones desconocidas", True)
+
+print("\n⌨️ Línea de comandos con --estado...")
+work = tempfile.mkdtemp()
+frames = [pd.DataFrame({'Edad': rng.integers(18, 40, 400), 'Color': rng.choice(['a', 'b'], 400)}) for _ in range(3)]
+for i, frame in enumerate(frames):
+    frame.to_csv(os.path.join(work, f"lote{i}.csv"), index=False)
+state_dir = os.path.join(work, 'estado')
+output = os.path.join(work, 'salida')
+code = main([os.path.join(work, 'lote0.csv'), '--estado', state_dir, '-o', output, '--no-ai'])
+code += main([os.path.join(work, 'lote1.csv'), os.path.join(work, 'lote2.csv'), '--estado', state_dir, '-o', output, '--no-ai'])
+with open(os.path.join(output, 'resultados.json'), encoding='utf-8') as handle:
+    report = json.load(handle)
+ages = pd.concat([frame['Edad'] for frame in frames], ignore_index=True)
+column = next(c for c in report['columnas'] if c['columna'] == 'Edad')
+check("Ejecuciones exitosas", code == 0)
+check("Acumula las filas de las tres ejecuciones", column['n'] == 1200 and column['lotes'] == 3)
+check("Media acumulada correcta", abs(column['estadisticas']['tendencia_central']['media'] - ages.mean()) < 1e-9)
+check("Un estado por columna", sorted(os.listdir(state_dir)) == ['Color.json', 'Edad.json'])
+check("Rechaza --graficos en modo incremental",
+      main([os.path.join(work, 'lote0.csv'), '--estado', state_dir, '-o', output, '--graficos']) == 1)
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DEL ANÁLISIS INCREMENTAL PASARON EXITOSAMENTE")
+print("=" * 60)
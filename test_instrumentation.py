@@ -0,0 +1,83 @@
+import contextvars
+import json
+import threading
+import numpy as np
+import pandas as pd
+from instrumentation import Recorder, recording, span, instrumented, call_recorded, current_recorder
+from result_cache import ResultCache
+from stats_utils import calculate_all_statistics
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DE LA INSTRUMENTACIÓN POR ETAPAS")
+print("=" * 60)
+
+@instrumented
+def allocate(n: int) -> int:
+    return int(np.ones(n).sum())
+
+print("\n⏸️ Sin Recorder activo...")
+check("El decorador no cambia el resultado", allocate(10) == 10)
+check("No hay Recorder activo", current_recorder() is None)
+
+print("\n🧭 Intervalos anidados...")
+recorder = Recorder(track_memory=True)
+with recording(recorder):
+    with span('externo'):
+        allocate(1_000_000)
+        with span('interno'):
+            pass
+by_name = {s['etapa']: s for s in recorder.spans}
+check("Se registran los tres intervalos", set(by_name) == {'externo', 'interno', 'test_instrumentation.allocate'})
+check("Los hijos registran a su padre",
+      by_name['interno']['padre'] == 'externo' and by_name['interno']['nivel'] == 1)
+allocation = next(s for s in recorder.spans if s['etapa'].endswith('allocate'))
+check("La memoria de la función cuenta su arreglo de 8 MB", allocation['bytes'] >= 8_000_000)
+check("El padre incluye la memoria de sus hijos", by_name['externo']['bytes'] >= allocation['bytes'])
+check("El Recorder queda inactivo al salir", current_recorder() is None)
+
+print("\n💾 Aciertos y fallos de caché...")
+cache = ResultCache(max_entries=4)
+recorder = Recorder(caches=[cache])
+with recording(recorder):
+    for _ in range(3):
+        with span('estadisticas'):
+            cache.get_or_compute('clave', lambda: calculate_all_statistics(pd.Series([1.0, 2.0, 3.0])))
+totals = recorder.summary()[0]
+check("Una llamada falla y dos aciertan", (totals['fallos_cache'], totals['aciertos_cache']) == (1, 2))
+check("Se cuentan las tres llamadas", totals['llamadas'] == 3)
+
+print("\n🧵 Hilos con contextvars.copy_context...")
+recorder = Recorder()
+with recording(recorder):
+    with span('padre'):
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(allocate, 5))
+        thread.start()
+        thread.join()
+child = next(s for s in recorder.spans if s['etapa'].endswith('allocate'))
+check("El intervalo del hilo conserva a su padre", child['padre'] == 'padre')
+check("Sin memoria medida fuera del hilo principal", child['bytes'] is None)
+
+print("\n📤 Exportación...")
+result, spans = call_recorded(allocate, 3)
+check("call_recorded retorna resultado e intervalos", result == 3 and len(spans) == 1)
+recorder.merge(spans)
+check("merge agrega los intervalos de otro proceso", len(recorder.spans) == 3)
+exported = json.loads(recorder.to_json())
+check("JSON con intervalos y resumen", len(exported['intervalos']) == 3 and exported['resumen'])
+prometheus = recorder.to_prometheus()
+check("Prometheus declara los tipos", "# TYPE estad_etapa_segundos summary" in prometheus)
+check("Prometheus cuenta las llamadas por etapa",
+      any(line.startswith('estad_etapa_segundos_count{etapa="') and line.endswith(' 2')
+          for line in prometheus.splitlines()))
+odd = Recorder()
+with recording(odd):
+    with span('a"b'):
+        pass
+check("Comillas escapadas en las etiquetas", 'etapa="a\\"b"' in odd.to_prometheus())
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE LA INSTRUMENTACIÓN PASARON EXITOSAMENTE")
+print("=" * 60)
@@ -20,6 +20,16 @@ print(f"   Tipo: {data_type_info.get('tipo')}")
 print(f"   Subtipo: {data_type_info.get('subtipo')}")
 print(f"   Razón: {data_type_info.get('razon')}")
 
+print("\n🔍 Probando detección vectorizada sobre una serie grande (sin convertir a lista)...")
+import numpy as np
+import pandas as pd
+large_series = pd.Series(np.random.default_rng(0).integers(18, 60, 1_000_000))
+data_type_info = detect_data_type(large_series)
+print(f"   Tipo: {data_type_info.get('tipo')} | Subtipo: {data_type_info.get('subtipo')}")
+if data_type_info.get('tipo') != 'cuantitativo' or data_type_info.get('subtipo') != 'discreto':
+    print("   ❌ ERROR: se esperaba cuantitativo discreto")
+    sys.exit(1)
+
 stats_data = {
     'tendencia_central': {
         'media': None,
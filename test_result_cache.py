@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+from result_cache import ResultCache, fingerprint_series
+from stats_utils import calculate_all_statistics
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DE CACHÉ DE RESULTADOS")
+print("=" * 60)
+
+data = pd.Series([10, 20, 30, 40, 50, 20, 30, 20, 40, 30], dtype=float)
+check("La huella ignora el índice", fingerprint_series(data) == fingerprint_series(data.set_axis(range(100, 110))))
+check("La huella cambia con los valores", fingerprint_series(data) != fingerprint_series(data + 1))
+
+cache = ResultCache()
+calls = []
+key = ('estadisticas', fingerprint_series(data), False)
+first = cache.get_or_compute(key, lambda: calls.append(1) or calculate_all_statistics(data))
+second = cache.get_or_compute(key, lambda: calls.append(1) or calculate_all_statistics(data))
+check("Segunda llamada servida desde caché", len(calls) == 1 and first is second and cache.hits == 1)
+
+small = ResultCache(max_bytes=1000, max_entries=3)
+for i in range(5):
+    small.put(i, np.zeros(10))
+check("Desalojo LRU por número de entradas", list(small._entries) == [2, 3, 4])
+small.get(2)
+small.put('grande', np.zeros(100))
+check("Desalojo LRU por límite de memoria", 2 in small and 3 not in small and small.current_bytes <= 1000)
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE CACHÉ PASARON EXITOSAMENTE")
+print("=" * 60)
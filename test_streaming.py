@@ -0,0 +1,92 @@
+import io
+import numpy as np
+import pandas as pd
+from streaming import analyze_file_streaming, iter_column_chunks
+from stats_accumulator import StatisticsAccumulator
+from stats_utils import calculate_all_statistics
+from data_processor import create_frequency_table
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DE LECTURA POR BLOQUES (STREAMING)")
+print("=" * 60)
+
+rng = np.random.default_rng(42)
+df = pd.DataFrame({
+    'Edad': rng.integers(18, 60, 5000),
+    'Altura': rng.normal(170, 8, 5000),
+    'Color': rng.choice(['Azul', 'Rojo', 'Verde'], 5000)
+})
+csv_bytes = df.to_csv(index=False).encode('utf-8')
+
+def same_stats(a: dict, b: dict) -> bool:
+    for group in ['tendencia_central', 'dispersion']:
+        for key, expected in a[group].items():
+            value = b[group][key]
+            if expected is None or value is None:
+                if expected is not value:
+                    return False
+            elif abs(expected - value) > 1e-9 * max(1.0, abs(expected)):
+                return False
+    return a['n'] == b['n']
+
+for column in ['Edad', 'Altura']:
+    result = analyze_file_streaming(io.BytesIO(csv_bytes), 'csv', column, chunksize=700)
+    expected_stats = calculate_all_statistics(df[column])
+    expected_table = create_frequency_table(df[column], is_quantitative=True)
+    ok = same_stats(expected_stats, result['statistics']) and result['freq_table'].equals(expected_table)
+    check(f"Columna {column}", ok)
+
+result = analyze_file_streaming(io.BytesIO(csv_bytes), 'csv', 'Color', is_quantitative=False, chunksize=700)
+ok = result['freq_table'].equals(create_frequency_table(df['Color'], is_quantitative=False))
+check("Columna Color (cualitativa)", ok)
+
+with_nulls = pd.DataFrame({'Color': ['Azul', None, 'Rojo', 'Azul', None]})
+result = analyze_file_streaming(io.BytesIO(with_nulls.to_csv(index=False).encode('utf-8')), 'csv', 'Color',
+                                is_quantitative=False, chunksize=2)
+ok = result['freq_table'].equals(create_frequency_table(with_nulls['Color'], is_quantitative=False))
+check("Columna cualitativa con nulos (mismas frecuencias relativas)", ok)
+
+print("\n📄 Texto en una sola línea...")
+single_line = ', '.join(f"{x:.3f}" for x in df['Altura']).encode('utf-8')
+chunks = list(iter_column_chunks(io.BytesIO(single_line), 'txt', chunksize=500))
+values_read = np.concatenate([chunk.to_numpy() for chunk in chunks])
+ok = len(chunks) > 1 and max(len(chunk) for chunk in chunks) <= 2 * 500 and np.allclose(values_read, df['Altura'], atol=5e-4)
+check("Se divide en bloques acotados sin partir valores", ok)
+result = analyze_file_streaming(io.BytesIO(single_line), 'txt', chunksize=500)
+ok = same_stats(calculate_all_statistics(values_read), result['statistics'])
+check("Estadísticas iguales a las de todos los valores", ok)
+words = list(iter_column_chunks(io.BytesIO("Rojo oscuro, Azul\nVerde".encode('utf-8')), 'txt', chunksize=2))
+ok = [value for chunk in words for value in chunk] == ['Rojo oscuro', 'Azul', 'Verde']
+check("Corta en saltos de línea y delimitadores antes que en espacios", ok)
+
+print("\n🔍 Fusión de acumuladores...")
+left = StatisticsAccumulator().update(df['Altura'].values[:2000])
+right = StatisticsAccumulator().update(df['Altura'].values[2000:])
+merged = left.merge(right)
+ok = same_stats(calculate_all_statistics(df['Altura']), merged.to_dict())
+check("Acumuladores fusionados (modo exacto)", ok)
+
+print("\n🔍 Sketch de cuantiles con muchos valores distintos...")
+values = rng.normal(50, 10, 200_000)
+partitions = [StatisticsAccumulator(max_distinct=1000, seed=i).update(part) for i, part in enumerate(np.array_split(values, 4))]
+combined = partitions[0]
+for part in partitions[1:]:
+    combined.merge(part)
+approx = combined.to_dict()
+expected = calculate_all_statistics(values)
+ok = (not combined.is_exact
+      and abs(approx['tendencia_central']['media'] - expected['tendencia_central']['media']) < 1e-9
+      and abs(approx['dispersion']['varianza'] - expected['dispersion']['varianza']) < 1e-6)
+check("Media y varianza exactas tras fusionar 4 particiones", ok)
+for key, group in [('mediana', 'tendencia_central'), ('q1', 'dispersion'), ('q3', 'dispersion')]:
+    rank = np.mean(values <= approx[group][key])
+    target = {'mediana': 0.5, 'q1': 0.25, 'q3': 0.75}[key]
+    ok = abs(rank - target) < 0.02
+    check(f"{key}: rango {rank:.4f} (objetivo {target})", ok)
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE STREAMING PASARON EXITOSAMENTE")
+print("=" * 60)
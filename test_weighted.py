@@ -0,0 +1,97 @@
+import time
+import numpy as np
+import pandas as pd
+from stats_utils import calculate_all_statistics, calculate_central_tendency, aggregate_weights, weights_array
+from data_processor import create_frequency_table
+from categorical import CategoricalSummary
+from visualization import create_histogram
+from testing_utils import check, finish
+
+print("=" * 60)
+print("PRUEBA DE DATOS PONDERADOS (VALOR, CONTEO)")
+print("=" * 60)
+
+def same_statistics(a: dict, b: dict) -> bool:
+    for section in ('tendencia_central', 'dispersion'):
+        for key, value in a[section].items():
+            other = b[section][key]
+            if value is None or other is None:
+                if value is not other:
+                    return False
+            elif not np.isclose(value, other, rtol=1e-12):
+                return False
+    return a['n'] == b['n']
+
+rng = np.random.default_rng(24)
+
+print("\n⚖️ Estadísticas ponderadas...")
+values = np.round(rng.normal(100, 15, 400), 1)
+counts = rng.integers(0, 50, 400)
+expanded = pd.Series(np.repeat(values, counts))
+check("Iguales a los datos expandidos (valores continuos)",
+      same_statistics(calculate_all_statistics(values, weights=counts), calculate_all_statistics(expanded)))
+ages = np.array([20, 21, 22, 23, 21, 20])
+age_counts = np.array([5, 9, 9, 2, 1, 0])
+check("Valores repetidos se suman (moda y cuartiles)",
+      same_statistics(calculate_all_statistics(ages, weights=age_counts),
+                      calculate_all_statistics(pd.Series(np.repeat(ages, age_counts)))))
+check("calculate_central_tendency con pesos",
+      calculate_central_tendency(ages, age_counts) == calculate_all_statistics(ages, age_counts)['tendencia_central'])
+check("Nulos, texto y pesos cero se descartan",
+      calculate_all_statistics([1, None, 'x', 3, 5], weights=[2, 4, 4, 2, 0])['n'] == 4)
+
+weights = rng.uniform(0.5, 3.0, 400)
+stats = calculate_all_statistics(values, weights=weights)
+mean = np.average(values, weights=weights)
+check("Pesos no enteros: media ponderada", np.isclose(stats['tendencia_central']['media'], mean))
+check("Pesos no enteros: varianza con n = suma de pesos",
+      np.isclose(stats['dispersion']['varianza'], np.sum(weights * (values - mean) ** 2) / (weights.sum() - 1)))
+
+huge = np.array([10 ** 9, 3 * 10 ** 9, 2 * 10 ** 9], dtype=np.int64)
+start = time.perf_counter()
+big = calculate_all_statistics([1, 2, 3], weights=huge)
+elapsed = time.perf_counter() - start
+check("Miles de millones de observaciones sin expandir", big['n'] == 6 * 10 ** 9 and elapsed < 0.5)
+check("Media y mediana exactas", np.isclose(big['tendencia_central']['media'], 13 / 6) and
+      big['tendencia_central']['mediana'] == 2.0 and big['tendencia_central']['frecuencia_moda'] == 3 * 10 ** 9)
+
+for bad, description in (([1, -1], "Pesos negativos rechazados"), ([1], "Longitudes distintas rechazadas")):
+    try:
+        weights_array(bad, 2)
+        check(description, False)
+    except ValueError:
+        check(description, True)
+check("Pesos enteros leídos como decimales vuelven a int64", weights_array([1.0, 2.0, np.nan], 3).dtype == np.int64)
+distinct, summed = aggregate_weights([3, 1, 3, 2], [1, 1, 2, 5])
+check("aggregate_weights ordena y suma", list(distinct) == [1, 2, 3] and list(summed) == [1, 5, 3])
+
+print("\n📋 Tablas de frecuencias e histogramas...")
+table = create_frequency_table(pd.Series(values), weights=counts)
+reference = create_frequency_table(expanded)
+check("Intervalos iguales a los datos expandidos", table.equals(reference))
+check("Datos discretos: una fila por valor",
+      create_frequency_table(pd.Series(ages), weights=age_counts).equals(create_frequency_table(pd.Series(np.repeat(ages, age_counts)))))
+colors = pd.Series(['Rojo', 'Azul', 'Rojo', 'Verde'])
+color_counts = [10, 4, 6, 0]
+expanded_colors = pd.Series(np.repeat(colors.to_numpy(), color_counts))
+check("Categorías ponderadas", create_frequency_table(colors, False, weights=color_counts).equals(
+      create_frequency_table(expanded_colors, False)))
+summary = CategoricalSummary.from_data(colors, weights=color_counts)
+check("CategoricalSummary ponderado", summary.total == 20 and summary.by_frequency().iloc[0] == 16)
+float_table = create_frequency_table(pd.Series(values), weights=weights)
+check("Pesos no enteros: frecuencias como suma de pesos", np.isclose(float_table['Frecuencia Absoluta'].sum(), weights.sum()))
+figure = create_histogram(pd.Series(values), weights=counts)
+expected_counts = np.histogram(expanded, bins=len(figure.data[0].y))[0]
+check("Histograma ponderado igual al de los datos expandidos", np.array_equal(figure.data[0].y, expected_counts))
+small_weights = [0.3, 0.3]
+small_table = create_frequency_table(pd.Series([1.5, 2.5]), weights=small_weights)
+check("Suma de pesos menor que 1: tabla con al menos un intervalo",
+      len(small_table) >= 1 and np.isclose(small_table['Frecuencia Absoluta'].sum(), 0.6))
+small_figure = create_histogram(pd.Series([1.5, 2.5]), weights=small_weights)
+check("Suma de pesos menor que 1: histograma", np.isclose(np.sum(small_figure.data[0].y), 0.6))
+
+finish()
+
+print("\n" + "=" * 60)
+print("✅ TODAS LAS PRUEBAS DE DATOS PONDERADOS PASARON EXITOSAMENTE")
+print("=" * 60)
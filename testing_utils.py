@@ -0,0 +1,20 @@
+import sys
+
+errors = 0
+
+def check(description: str, ok: bool) -> bool:
+    """
+    Imprime el resultado de una verificación (✓ o ✗) y cuenta las que fallan
+    """
+    global errors
+    print(f"   {description}: {'✓' if ok else '✗'}")
+    errors += not ok
+    return ok
+
+def finish() -> None:
+    """
+    Termina con código 1 si alguna verificación falló
+    """
+    if errors:
+        print(f"\n❌ {errors} prueba(s) fallaron")
+        sys.exit(1)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+from typing import Union, List, Dict
+
+from instrumentation import instrumented
+
+SAMPLE_SIZE = 2000
+NUMERIC_THRESHOLD = 0.8
+DISCRETE_UNIQUE_RATIO = 0.5
+
+def stratified_sample(data: pd.Series, size: int = SAMPLE_SIZE, seed: int = 0) -> pd.Series:
+    """
+    Toma un valor al azar de cada uno de size tramos consecutivos de la serie
+
+    El costo depende de size y no de len(data); cubre el principio, el medio y el final de la columna.
+    """
+    n = len(data)
+    if n <= size:
+        return data
+    rng = np.random.default_rng(seed)
+    starts = np.arange(size) * n // size
+    widths = np.diff(np.append(starts, n))
+    positions = starts + (rng.random(size) * widths).astype(np.int64)
+    return data.iloc[positions]
+
+@instrumented
+def infer_data_type(data: Union[List, pd.Series], sample_size: int = SAMPLE_SIZE) -> Dict:
+    """
+    Detecta el tipo de datos sin IA usando el dtype y una muestra estratificada de tamaño fijo
+
+    Retorna tipo, subtipo y razón (mismo formato que detect_data_type) más la proporción de valores
+    numéricos, si los valores son enteros y la proporción de valores únicos en la muestra.
+    """
+    if isinstance(data, list):
+        data = pd.Series(data)
+
+    sample = stratified_sample(data, sample_size).dropna()
+    if len(sample) == 0:
+        return {
+            "tipo": "cualitativo",
+            "razon": "No se pudo determinar con certeza",
+            "subtipo": "nominal"
+        }
+
+    if pd.api.types.is_numeric_dtype(sample.dtype):
+        numeric = sample.astype(np.float64)
+        numeric_ratio = 1.0
+    else:
+        numeric = pd.to_numeric(sample, errors='coerce')
+        numeric_ratio = float(numeric.notna().mean())
+        numeric = numeric.dropna()
+
+    unique_ratio = float(sample.nunique() / len(sample))
+    result = {
+        "proporcion_numerica": numeric_ratio,
+        "proporcion_unicos": unique_ratio,
+        "n_muestra": int(len(sample))
+    }
+
+    if numeric_ratio > NUMERIC_THRESHOLD:
+        values = numeric.to_numpy(dtype=np.float64)
+        finite = values[np.isfinite(values)]
+        is_integer = bool(len(finite) > 0 and np.all(finite == np.floor(finite)))
+        discrete = is_integer and unique_ratio <= DISCRETE_UNIQUE_RATIO
+        result.update({
+            "tipo": "cuantitativo",
+            "razon": "La mayoría de los valores son numéricos" + (
+                " enteros con pocos valores distintos" if discrete else ""),
+            "subtipo": "discreto" if discrete else "continuo",
+            "es_entero": is_integer
+        })
+    else:
+        result.update({
+            "tipo": "cualitativo",
+            "razon": "La mayoría de los valores son categorías o texto",
+            "subtipo": "nominal",
+            "es_entero": False
+        })
+    return result
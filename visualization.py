@@ -1,32 +1,68 @@
 import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
 import numpy as np
 from typing import Union, List
 
-def create_histogram(data: Union[List, pd.Series], title: str = "Histograma", bins: int = None) -> go.Figure:
+from categorical import CategoricalSummary, DEFAULT_TOP_K, OTHERS_LABEL
+from instrumentation import instrumented
+from stats_utils import aggregate_weights
+from data_processor import sturges_bins
+
+AGGREGATE_THRESHOLD = 5000
+MAX_OUTLIER_POINTS = 1000
+MAX_PLOT_GROUPS = 30
+
+def _use_aggregation(n: int, prebinned: bool = None) -> bool:
+    return n > AGGREGATE_THRESHOLD if prebinned is None else prebinned
+
+@instrumented
+def create_histogram(data: Union[List, pd.Series], title: str = "Histograma", bins: int = None, prebinned: bool = None,
+                     weights: Union[List, pd.Series] = None) -> go.Figure:
     """
     Crea un histograma interactivo
+    
+    Con prebinned (por defecto cuando hay más de AGGREGATE_THRESHOLD valores) los conteos se
+    calculan en el servidor con np.histogram y solo se envían bins barras al navegador. Con weights
+    (tabla valor, conteo) siempre se agrega: np.histogram ponderado sobre los valores distintos.
     """
     if isinstance(data, list):
         data = pd.Series(data)
     
-    try:
-        data_numeric = pd.to_numeric(data, errors='coerce').dropna()
-    except:
-        data_numeric = data
+    if weights is not None:
+        data_numeric, weights = aggregate_weights(data, weights)
+        n = weights.sum()
+        prebinned = True
+    else:
+        try:
+            data_numeric = pd.to_numeric(data, errors='coerce').dropna()
+        except:
+            data_numeric = data
+        n = len(data_numeric)
     
     if bins is None:
-        n = len(data_numeric)
-        bins = min(int(1 + 3.322 * np.log10(n)), 20)
+        bins = sturges_bins(n)
     
-    fig = go.Figure(data=[go.Histogram(
-        x=data_numeric,
-        nbinsx=bins,
-        marker_color='#1f77b4',
-        opacity=0.75,
-        name='Frecuencia'
-    )])
+    if _use_aggregation(len(data_numeric), prebinned):
+        counts, edges = np.histogram(data_numeric, bins=bins, weights=weights)
+        fig = go.Figure(data=[go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            customdata=np.column_stack((edges[:-1], edges[1:])),
+            hovertemplate='[%{customdata[0]:.2f}, %{customdata[1]:.2f}): %{y}<extra></extra>',
+            marker_color='#1f77b4',
+            opacity=0.75,
+            name='Frecuencia'
+        )])
+        fig.update_layout(bargap=0)
+    else:
+        fig = go.Figure(data=[go.Histogram(
+            x=data_numeric,
+            nbinsx=bins,
+            marker_color='#1f77b4',
+            opacity=0.75,
+            name='Frecuencia'
+        )])
     
     fig.update_layout(
         title=title,
@@ -39,14 +75,16 @@ def create_histogram(data: Union[List, pd.Series], title: str = "Histograma", bi
     
     return fig
 
-def create_bar_chart(data: Union[List, pd.Series], title: str = "Gráfico de Barras") -> go.Figure:
+@instrumented
+def create_bar_chart(data: Union[List, pd.Series], title: str = "Gráfico de Barras",
+                     summary: CategoricalSummary = None, top_k: int = DEFAULT_TOP_K) -> go.Figure:
     """
-    Crea un gráfico de barras para datos cualitativos
+    Crea un gráfico de barras para datos cualitativos (top_k categorías más 'Otros')
     """
-    if isinstance(data, list):
-        data = pd.Series(data)
+    if summary is None:
+        summary = CategoricalSummary.from_data(data)
     
-    value_counts = data.value_counts().sort_values(ascending=False)
+    value_counts = summary.top_k(top_k)
     
     fig = go.Figure(data=[go.Bar(
         x=value_counts.index.astype(str),
@@ -66,14 +104,16 @@ def create_bar_chart(data: Union[List, pd.Series], title: str = "Gráfico de Bar
     
     return fig
 
-def create_pie_chart(data: Union[List, pd.Series], title: str = "Gráfico Circular") -> go.Figure:
+@instrumented
+def create_pie_chart(data: Union[List, pd.Series], title: str = "Gráfico Circular",
+                     summary: CategoricalSummary = None, top_k: int = DEFAULT_TOP_K) -> go.Figure:
     """
-    Crea un gráfico circular (pie chart)
+    Crea un gráfico circular (pie chart) con las top_k categorías más 'Otros'
     """
-    if isinstance(data, list):
-        data = pd.Series(data)
+    if summary is None:
+        summary = CategoricalSummary.from_data(data)
     
-    value_counts = data.value_counts()
+    value_counts = summary.top_k(top_k)
     
     fig = go.Figure(data=[go.Pie(
         labels=value_counts.index.astype(str),
@@ -91,9 +131,50 @@ def create_pie_chart(data: Union[List, pd.Series], title: str = "Gráfico Circul
     
     return fig
 
-def create_box_plot(data: Union[List, pd.Series], title: str = "Diagrama de Caja") -> go.Figure:
+def _precomputed_box_traces(data_numeric: pd.Series, name: str = 'Datos', color: str = '#ff7f0e') -> list:
+    """
+    Trazas de un diagrama de caja con cuartiles, bigotes y una muestra acotada de atípicos
+    calculados en el servidor (tamaño de la figura independiente de n)
+    """
+    values = np.asarray(data_numeric, dtype=np.float64)
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    outliers = np.sort(values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)])
+    if len(outliers) > MAX_OUTLIER_POINTS:
+        outliers = outliers[np.linspace(0, len(outliers) - 1, MAX_OUTLIER_POINTS).astype(int)]
+    
+    traces = [go.Box(
+        x=[name],
+        q1=[q1],
+        median=[median],
+        q3=[q3],
+        lowerfence=[inside.min()],
+        upperfence=[inside.max()],
+        mean=[values.mean()],
+        sd=[values.std(ddof=1) if len(values) > 1 else 0.0],
+        name=name,
+        marker_color=color,
+        boxmean='sd'
+    )]
+    if len(outliers) > 0:
+        traces.append(go.Scatter(
+            x=[name] * len(outliers),
+            y=outliers,
+            mode='markers',
+            marker=dict(color=color, size=5),
+            name='Atípicos',
+            hovertemplate='%{y}<extra>Atípico</extra>'
+        ))
+    return traces
+
+@instrumented
+def create_box_plot(data: Union[List, pd.Series], title: str = "Diagrama de Caja", prebinned: bool = None) -> go.Figure:
     """
     Crea un diagrama de caja (box plot)
+    
+    Con prebinned (por defecto cuando hay más de AGGREGATE_THRESHOLD valores) la caja se dibuja
+    con estadísticas precalculadas en lugar de enviar todos los valores al navegador.
     """
     if isinstance(data, list):
         data = pd.Series(data)
@@ -103,12 +184,15 @@ def create_box_plot(data: Union[List, pd.Series], title: str = "Diagrama de Caja
     except:
         data_numeric = data
     
-    fig = go.Figure(data=[go.Box(
-        y=data_numeric,
-        name='Datos',
-        marker_color='#ff7f0e',
-        boxmean='sd'
-    )])
+    if _use_aggregation(len(data_numeric), prebinned):
+        fig = go.Figure(data=_precomputed_box_traces(data_numeric))
+    else:
+        fig = go.Figure(data=[go.Box(
+            y=data_numeric,
+            name='Datos',
+            marker_color='#ff7f0e',
+            boxmean='sd'
+        )])
     
     fig.update_layout(
         title=title,
@@ -119,14 +203,29 @@ def create_box_plot(data: Union[List, pd.Series], title: str = "Diagrama de Caja
     
     return fig
 
-def create_frequency_bar_chart(freq_table: pd.DataFrame, is_quantitative: bool = True) -> go.Figure:
+@instrumented
+def create_frequency_bar_chart(freq_table: pd.DataFrame, is_quantitative: bool = True, top_k: int = DEFAULT_TOP_K) -> go.Figure:
     """
     Crea un gráfico de barras desde una tabla de frecuencias
+    
+    En tablas cualitativas con más de top_k categorías se muestran las más frecuentes
+    (en el orden de la tabla) y el resto se agrupa en 'Otros'.
     """
-    if is_quantitative:
+    if is_quantitative and 'Valor' in freq_table.columns:
+        x_data = freq_table['Valor'].astype(str)
+        title = "Distribución de Frecuencias (Valores)"
+    elif is_quantitative:
         x_data = freq_table['Intervalo']
         title = "Distribución de Frecuencias (Intervalos)"
     else:
+        if top_k is not None and len(freq_table) > top_k:
+            keep = np.zeros(len(freq_table), dtype=bool)
+            keep[np.argsort(-freq_table['Frecuencia Absoluta'].to_numpy(), kind='stable')[:top_k]] = True
+            others = pd.DataFrame({
+                'Categoría': [OTHERS_LABEL],
+                'Frecuencia Absoluta': [freq_table['Frecuencia Absoluta'].to_numpy()[~keep].sum()]
+            })
+            freq_table = pd.concat([freq_table[keep][['Categoría', 'Frecuencia Absoluta']], others], ignore_index=True)
         x_data = freq_table['Categoría'].astype(str)
         title = "Distribución de Frecuencias (Categorías)"
     
@@ -151,9 +250,85 @@ def create_frequency_bar_chart(freq_table: pd.DataFrame, is_quantitative: bool =
     
     return fig
 
-def create_multiple_visualizations(data: Union[List, pd.Series], data_type: str, freq_table: pd.DataFrame = None):
+def _largest_groups(sizes: np.ndarray, max_groups: int) -> tuple:
+    """
+    Índices (en el orden original) de los max_groups grupos con más datos y sufijo del título si se omitieron grupos
+    """
+    if max_groups is None or len(sizes) <= max_groups:
+        return np.arange(len(sizes)), ""
+    keep = np.sort(np.argsort(-np.asarray(sizes), kind='stable')[:max_groups])
+    return keep, f" ({max_groups} de {len(sizes)} grupos con más datos)"
+
+@instrumented
+def create_grouped_box_plot(grouped_stats: pd.DataFrame, title: str = "Diagrama de Caja por Grupo",
+                            max_groups: int = MAX_PLOT_GROUPS) -> go.Figure:
+    """
+    Crea un diagrama de caja por grupo a partir de grouped_statistics
+
+    Las cajas se dibujan con los cuartiles y bigotes ya calculados (una sola traza), sin enviar los
+    datos al navegador; con más de max_groups grupos se muestran los que tienen más datos.
+    """
+    keep, suffix = _largest_groups(grouped_stats['N'].to_numpy(), max_groups)
+    stats = grouped_stats.iloc[keep]
+    fig = go.Figure(data=[go.Box(
+        x=stats['Grupo'].astype(str),
+        q1=stats['Q1'],
+        median=stats['Mediana'],
+        q3=stats['Q3'],
+        lowerfence=stats['Bigote Inferior'],
+        upperfence=stats['Bigote Superior'],
+        mean=stats['Media'],
+        sd=stats['Desv. Estándar'].fillna(0.0),
+        marker_color='#ff7f0e',
+        boxmean='sd',
+        name='Grupos'
+    )])
+    fig.update_layout(
+        title=title + suffix,
+        xaxis_title="Grupo",
+        yaxis_title="Valores",
+        showlegend=False,
+        template="plotly_white"
+    )
+    return fig
+
+@instrumented
+def create_grouped_histogram(grouped_table: pd.DataFrame, title: str = "Distribución por Grupo",
+                             max_groups: int = MAX_PLOT_GROUPS) -> go.Figure:
+    """
+    Crea un gráfico de barras agrupadas (una serie por grupo) a partir de grouped_frequency_table
+
+    Las clases son comunes a todos los grupos; con más de max_groups grupos se muestran los que tienen más datos.
+    """
+    label_column = grouped_table.columns[0]
+    group_columns = [c for c in grouped_table.columns[1:] if c != 'Total']
+    sizes = grouped_table[group_columns].sum().to_numpy()
+    keep, suffix = _largest_groups(sizes, max_groups)
+    x_data = grouped_table[label_column].astype(str)
+
+    fig = go.Figure()
+    for index in keep:
+        group = group_columns[index]
+        fig.add_trace(go.Bar(x=x_data, y=grouped_table[group], name=str(group)))
+
+    fig.update_layout(
+        title=title + suffix,
+        xaxis_title="Categorías" if label_column == 'Categoría' else "Clases",
+        yaxis_title="Frecuencia",
+        barmode='group',
+        bargap=0.1,
+        template="plotly_white",
+        showlegend=True
+    )
+    return fig
+
+@instrumented
+def create_multiple_visualizations(data: Union[List, pd.Series], data_type: str, freq_table: pd.DataFrame = None,
+                                   summary: CategoricalSummary = None):
     """
     Crea múltiples visualizaciones según el tipo de datos
+    
+    Para datos cualitativos el conteo de categorías se calcula una sola vez (o se recibe en summary).
     """
     visualizations = {}
     
@@ -163,8 +338,10 @@ def create_multiple_visualizations(data: Union[List, pd.Series], data_type: str,
         visualizations['histogram'] = create_histogram(data, "Histograma de Distribución")
         visualizations['box_plot'] = create_box_plot(data, "Diagrama de Caja")
     else:
-        visualizations['bar_chart'] = create_bar_chart(data, "Distribución de Categorías")
-        visualizations['pie_chart'] = create_pie_chart(data, "Distribución Porcentual")
+        if summary is None:
+            summary = CategoricalSummary.from_data(data)
+        visualizations['bar_chart'] = create_bar_chart(data, "Distribución de Categorías", summary=summary)
+        visualizations['pie_chart'] = create_pie_chart(data, "Distribución Porcentual", summary=summary)
     
     if freq_table is not None:
         visualizations['freq_chart'] = create_frequency_bar_chart(freq_table, is_quantitative)